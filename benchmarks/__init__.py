@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+Micro-benchmarks for catapi.py. Run them all with
+
+    python -m benchmarks --output results.json
+"""
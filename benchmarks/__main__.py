@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import argparse
+import json
+import sys
+
+# importing the benchmark modules registers their benchmarks
+from . import (bench_json, bench_models, bench_requests,  # noqa: F401
+               bench_serialization)
+from .harness import compare, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="catapi.py benchmarks")
+    parser.add_argument("-k", "--filter", help="only run matching benchmarks")
+    parser.add_argument("-o", "--output", help="write json results here")
+    parser.add_argument("-r", "--repeat", type=int, help="repeats per test")
+    parser.add_argument("-s", "--scale", type=float, default=1.0,
+                        help="multiplier for runs per repeat")
+    parser.add_argument("-c", "--compare",
+                        help="baseline results to check for regressions")
+    parser.add_argument("-t", "--threshold", type=float, default=1.1,
+                        help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.scale)
+    for name, result in results["results"].items():
+        print(f"{name:45} {result['median'] * 1e6:12.2f} us/op",
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        rows, regressions = compare(baseline, results, args.threshold)
+        for name, old, new, ratio in rows:
+            print(f"{name:45} {ratio:6.2f}x", file=sys.stderr)
+
+        if regressions:
+            print("regressions: " + ", ".join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi import codec
+
+from . import payloads
+from .harness import benchmark
+
+
+@benchmark("json.decode_search_images_100", number=500)
+def decode_search_images():
+    body = payloads.search_images_json(100)
+    yield lambda: codec.stdlib_loads(body)
+
+
+@benchmark("json.encode_search_images_100", number=500)
+def encode_search_images():
+    images = payloads.search_images(100)
+    yield lambda: codec.stdlib_dumps(images)
+
+
+if codec.orjson is not None:
+    @benchmark("json.decode_search_images_100.orjson", number=500)
+    def decode_search_images_orjson():
+        body = payloads.search_images_json(100)
+        yield lambda: codec.orjson.loads(body)
+
+    @benchmark("json.encode_search_images_100.orjson", number=500)
+    def encode_search_images_orjson():
+        images = payloads.search_images(100)
+        yield lambda: codec.orjson.dumps(images)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi.models.breed import Breed
+from catapi.models.image import Image
+from catapi.models.lazy import LazyImage
+
+from . import payloads
+from .harness import benchmark
+
+try:
+    from catapi.image_batch import ImageBatch
+except ImportError:
+    ImageBatch = None
+
+
+def run_sync(coroutine):
+    """Drives a coroutine that never suspends without an event loop"""
+
+    try:
+        coroutine.send(None)
+    except StopIteration as result:
+        return result.value
+
+    raise RuntimeError("coroutine suspended")
+
+
+@benchmark("models.breed_from_dict", number=20000)
+def breed_from_dict():
+    breed = payloads.breed()
+    yield lambda: Breed.from_dict(breed)
+
+
+@benchmark("models.image_init_nested", number=20000)
+def image_init_nested():
+    image = payloads.image()
+    yield lambda: Image(**image)
+
+
+@benchmark("models.search_images_page", number=200)
+def search_images_page():
+    images = payloads.search_images(100)
+    yield lambda: [Image(**image) for image in images]
+
+
+@benchmark("models.search_images_page.lazy", number=200)
+def search_images_page_lazy():
+    images = payloads.search_images(100)
+    yield lambda: [LazyImage(image) for image in images]
+
+
+if ImageBatch is not None:
+    @benchmark("models.search_images_page.batch", number=200)
+    def search_images_page_batch():
+        images = payloads.search_images(100)
+        yield lambda: ImageBatch(images)
+
+
+@benchmark("models.search_images_page.url_only", number=200)
+def search_images_page_url_only():
+    images = payloads.search_images(100)
+    yield lambda: [Image(**image).url for image in images]
+
+
+@benchmark("models.search_images_page.lazy.url_only", number=200)
+def search_images_page_lazy_url_only():
+    images = payloads.search_images(100)
+    yield lambda: [LazyImage(image).url for image in images]
+
+
+@benchmark("models.to_dict", number=20000)
+def to_dict():
+    breed = Breed.from_dict(payloads.breed())
+    yield lambda: run_sync(breed.to_dict())
+
+
+@benchmark("models.to_json", number=20000)
+def to_json():
+    image = Image.from_dict(payloads.image())
+    yield image.to_json
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi import CatApi, codec
+from catapi.testing import MockCatApiServer
+
+from .harness import benchmark
+
+
+@benchmark("requests.api_get_session_overhead", number=200)
+async def api_get_session_overhead():
+    async with MockCatApiServer(image_count=0) as server:
+        async with CatApi(api_key="bench", base_url=server.url) as api:
+            url = f"{server.url}/categories"
+            yield lambda: api.api_get_session(url, {"limit": 1})
+
+
+@benchmark("requests.search_images_100", number=50)
+async def search_images_100():
+    async with MockCatApiServer(image_count=200) as server:
+        async with CatApi(api_key="bench", base_url=server.url) as api:
+            yield lambda: api.search_images(limit=100, order="ASC")
+
+
+@benchmark("requests.search_images_100.stdlib_json", number=50)
+async def search_images_100_stdlib_json():
+    async with MockCatApiServer(image_count=200) as server:
+        async with CatApi(api_key="bench", base_url=server.url,
+                          json_loads=codec.stdlib_loads) as api:
+            yield lambda: api.search_images(limit=100, order="ASC")
+
+
+@benchmark("requests.search_images_100.no_metrics", number=50)
+async def search_images_100_no_metrics():
+    async with MockCatApiServer(image_count=200) as server:
+        async with CatApi(api_key="bench", base_url=server.url,
+                          metrics=False) as api:
+            yield lambda: api.search_images(limit=100, order="ASC")
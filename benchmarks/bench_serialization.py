@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import io
+
+from catapi import codec, serialization
+from catapi.models.image import Image
+
+from . import payloads
+from .bench_models import run_sync
+from .harness import benchmark
+
+
+def _images():
+    return [Image.from_dict(image) for image in payloads.search_images(100)]
+
+
+@benchmark("serialization.to_dict_100", number=500)
+def to_dict():
+    images = _images()
+    yield lambda: [run_sync(image.to_dict()) for image in images]
+
+
+@benchmark("serialization.as_dict_100", number=500)
+def as_dict():
+    images = _images()
+    yield lambda: [image.as_dict() for image in images]
+
+
+@benchmark("serialization.write_ndjson_100", number=500)
+def write_ndjson():
+    images = _images()
+    yield lambda: serialization.write_ndjson(images, io.BytesIO())
+
+
+@benchmark("serialization.write_ndjson_100.stdlib_json", number=500)
+def write_ndjson_stdlib():
+    images = _images()
+    yield lambda: serialization.write_ndjson(images, io.BytesIO(),
+                                             codec.stdlib_dumps)
+
+
+@benchmark("serialization.read_ndjson_100", number=500)
+def read_ndjson():
+    file = io.BytesIO()
+    serialization.write_ndjson(_images(), file)
+    body = file.getvalue()
+    yield lambda: list(serialization.read_ndjson(io.BytesIO(body), Image))
+
+
+if serialization.msgpack is not None:
+    @benchmark("serialization.write_msgpack_100", number=500)
+    def write_msgpack():
+        images = _images()
+        yield lambda: serialization.write_msgpack(images, io.BytesIO())
+
+    @benchmark("serialization.read_msgpack_100", number=500)
+    def read_msgpack():
+        file = io.BytesIO()
+        serialization.write_msgpack(_images(), file)
+        body = file.getvalue()
+        yield lambda: list(serialization.read_msgpack(io.BytesIO(body),
+                                                      Image))
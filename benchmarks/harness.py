@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import inspect
+import platform
+import statistics
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import catapi
+
+
+__all__ = ("BENCHMARKS", "benchmark", "compare", "run")
+
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name, number=1000, repeat=5):
+    """Registers a benchmark.
+
+    The decorated function is a generator (or async generator) that performs
+    any setup, yields a zero argument callable to time and then tears down.
+    If it is an async generator, the yielded callable must return an
+    awaitable.
+
+    Parameters
+    ----------
+
+    name: :class:`string`
+        Dotted name the results are reported under
+
+    number: :class:`int`
+        How many times the callable is run per repeat
+
+    repeat: :class:`int`
+        How many timed repeats are made
+    """
+
+    def register(func):
+        BENCHMARKS[name] = (func, number, repeat)
+        return func
+
+    return register
+
+
+def _summarize(timings, number):
+    per_op = [timing / number for timing in timings]
+    median = statistics.median(per_op)
+    return {
+        "number": number,
+        "repeat": len(timings),
+        "min": min(per_op),
+        "median": median,
+        "mean": statistics.mean(per_op),
+        "ops_per_sec": 1 / median if median else None,
+    }
+
+
+def _time_sync(func, number, repeat):
+    steps = func()
+    op = next(steps)
+    op()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        timings.append(time.perf_counter() - start)
+
+    steps.close()
+    return timings
+
+
+async def _time_async(func, number, repeat):
+    steps = func()
+    op = await steps.__anext__()
+    await op()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await op()
+        timings.append(time.perf_counter() - start)
+
+    await steps.aclose()
+    return timings
+
+
+def run(pattern=None, repeat=None, scale=1.0):
+    """Runs every registered benchmark whose name contains pattern and
+    returns the results as a json serializable dict.
+
+    Parameters
+    ----------
+
+    pattern: :class:`string`
+        Only run benchmarks with this substring in their name
+
+    repeat: :class:`int`
+        Overrides the repeat count of every benchmark
+
+    scale: :class:`float`
+        Multiplies the number of runs per repeat of every benchmark
+    """
+
+    results = OrderedDict()
+    for name, (func, number, default_repeat) in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+
+        number = max(1, int(number * scale))
+        repeats = repeat or default_repeat
+        if inspect.isasyncgenfunction(func):
+            loop = asyncio.new_event_loop()
+            try:
+                timings = loop.run_until_complete(
+                    _time_async(func, number, repeats))
+            finally:
+                loop.close()
+        else:
+            timings = _time_sync(func, number, repeats)
+
+        results[name] = _summarize(timings, number)
+
+    return {
+        "meta": {
+            "catapi": catapi.__version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=1.1):
+    """Compares the median timings of two result sets.
+
+    Returns a list of (name, baseline median, current median, ratio) tuples
+    for every benchmark present in both, and a list of the names whose ratio
+    exceeds threshold.
+    """
+
+    rows = []
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or not old["median"]:
+            continue
+
+        ratio = result["median"] / old["median"]
+        rows.append((name, old["median"], result["median"], ratio))
+        if ratio > threshold:
+            regressions.append(name)
+
+    return rows, regressions
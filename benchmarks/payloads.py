@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+Realistic response payloads, taken from the seeded mock server data.
+"""
+
+import json
+
+from catapi.testing import MockCatApiServer
+
+
+__all__ = ("breed", "image", "search_images", "search_images_json")
+
+
+_SERVER = MockCatApiServer(seed=0, image_count=1000)
+
+
+def breed():
+    """A single breed dict as returned by /breeds"""
+
+    return dict(_SERVER.breeds[0])
+
+
+def image():
+    """An image dict with an embedded breed and a category"""
+
+    for candidate in _SERVER.images.values():
+        if candidate["breeds"] and candidate.get("categories"):
+            return json.loads(json.dumps(candidate))
+
+
+def search_images(limit=100):
+    """A page of images as returned by /images/search"""
+
+    return json.loads(search_images_json(limit))
+
+
+def search_images_json(limit=100):
+    """The raw bytes of a page of images as returned by /images/search"""
+
+    images = list(_SERVER.images.values())[:limit]
+    return json.dumps(images).encode("utf-8")
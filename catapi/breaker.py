@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import aiohttp
+from .errors import CircuitOpen, HTTPException, RateLimited
+
+
+__all__ = ("CircuitBreaker",)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit():
+    """State of the breaker for one endpoint"""
+
+    __slots__ = ("state", "outcomes", "opened_at", "probing", "successes")
+
+    def __init__(self, window):
+        self.state = CLOSED
+        # (failed, slow) for each of the last calls
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probing = False
+        self.successes = 0
+
+    def rates(self):
+        """Returns the share of the last calls that failed and that were
+        slow.
+        """
+
+        calls = len(self.outcomes)
+        if not calls:
+            return 0.0, 0.0
+        failed = sum(outcome[0] for outcome in self.outcomes)
+        slow = sum(outcome[1] for outcome in self.outcomes)
+        return failed / calls, slow / calls
+
+
+class _Call():
+    """Handle of a call let through by the breaker"""
+
+    __slots__ = ("started",)
+
+    def __init__(self):
+        self.started = time.monotonic()
+
+    def start(self):
+        """Starts timing the call again, leaving out the time spent waiting
+        before it was sent.
+        """
+
+        self.started = time.monotonic()
+
+
+class CircuitBreaker():
+    """Stops calling an endpoint that keeps failing or answering slowly, so
+    that callers fail at once instead of each waiting out a timeout.
+
+    Every endpoint has its own circuit. A closed circuit lets calls through
+    and keeps the outcome of the last window of them. Once min_calls are
+    known and the share that failed reaches error_rate, or the share slower
+    than slow_call reaches slow_rate, the circuit opens. An open circuit
+    raises :class:`catapi.errors.CircuitOpen` for open_for seconds, then
+    becomes half open and lets one trial call through at a time. trials
+    calls in a row that succeed in time close it, and one that does not
+    opens it again.
+
+    Server errors (5xx), timeouts and connection errors are failures. Other
+    error statuses, such as 404 or 429, mean the server is answering, and
+    cancelled calls are not counted at all.
+
+    The breaker also keeps the last good response of the cacheable reads,
+    such as breeds, categories and images. :class:`catapi.CatApi` returns
+    them, as models with stale set, while the circuit is open or when a
+    read fails.
+
+    Pass breaker=True, or a CircuitBreaker, to :class:`catapi.CatApi`.
+
+    Keyword Arguments
+    -----------------
+
+    window: :class:`int`
+        Calls to an endpoint the rates are taken over. Defaults to 20
+
+    min_calls: :class:`int`
+        Calls that must be known before the circuit may open. Defaults to
+        10
+
+    error_rate: :class:`float`
+        Share of failed calls that opens the circuit, 0-1. Defaults to 0.5
+
+    slow_call: :class:`float`
+        Seconds after which a call counts as slow. Defaults to None, which
+        only counts failures.
+
+    slow_rate: :class:`float`
+        Share of slow calls that opens the circuit, 0-1. Defaults to 0.5
+
+    open_for: :class:`float`
+        Seconds an open circuit fails calls before it tries again. Defaults
+        to 30
+
+    trials: :class:`int`
+        Trial calls that must succeed to close a half open circuit.
+        Defaults to 3
+
+    max_stale: :class:`int`
+        Responses kept to be served stale. The least recently used are
+        dropped first. Defaults to 1000
+
+    Attributes
+    ----------
+
+    opened: :class:`int`
+        Times a circuit opened
+
+    rejected: :class:`int`
+        Calls failed at once because their circuit was open
+
+    served_stale: :class:`int`
+        Stale responses returned instead of an error
+    """
+
+    __slots__ = ("window", "min_calls", "error_rate", "slow_call",
+                 "slow_rate", "open_for", "trials", "max_stale", "opened",
+                 "rejected", "served_stale", "_circuits", "_stale")
+
+    def __init__(self, **kwargs):
+        self.window = kwargs.pop("window", 20)
+        self.min_calls = kwargs.pop("min_calls", 10)
+        self.error_rate = kwargs.pop("error_rate", 0.5)
+        self.slow_call = kwargs.pop("slow_call", None)
+        self.slow_rate = kwargs.pop("slow_rate", 0.5)
+        self.open_for = kwargs.pop("open_for", 30.0)
+        self.trials = kwargs.pop("trials", 3)
+        self.max_stale = kwargs.pop("max_stale", 1000)
+        if not 0 < self.min_calls <= self.window:
+            raise ValueError("min_calls must be between 1 and window")
+        self.opened = 0
+        self.rejected = 0
+        self.served_stale = 0
+        self._circuits = {}
+        self._stale = OrderedDict()
+
+    @staticmethod
+    def is_failure(error):
+        """Whether error counts against the circuit of the endpoint"""
+
+        if isinstance(error, HTTPException):
+            return error.status >= 500 and not isinstance(error, RateLimited)
+        return isinstance(error, (aiohttp.ClientConnectionError,
+                                  asyncio.TimeoutError))
+
+    def state(self, key):
+        """Returns "closed", "open" or "half_open" for endpoint key"""
+
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CLOSED
+        if circuit.state == OPEN and \
+                time.monotonic() - circuit.opened_at >= self.open_for:
+            return HALF_OPEN
+        return circuit.state
+
+    @contextmanager
+    def call(self, key):
+        """Lets a call to endpoint key through, or raises CircuitOpen, and
+        records how the block ends. The call is timed from the start of the
+        block, or from the last call to start() on the handle it yields.
+        """
+
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window)
+
+        if circuit.state == OPEN:
+            waited = time.monotonic() - circuit.opened_at
+            if waited < self.open_for:
+                self.rejected += 1
+                raise CircuitOpen(key, self.open_for - waited)
+            circuit.state = HALF_OPEN
+            circuit.successes = 0
+            circuit.probing = False
+
+        trial = circuit.state == HALF_OPEN
+        if trial:
+            if circuit.probing:
+                self.rejected += 1
+                raise CircuitOpen(key, 0.0)
+            circuit.probing = True
+
+        handle = _Call()
+        try:
+            yield handle
+        except asyncio.CancelledError:
+            if trial:
+                circuit.probing = False
+            raise
+        except BaseException as error:
+            if trial:
+                circuit.probing = False
+            self._record(circuit, trial, self.is_failure(error),
+                         time.monotonic() - handle.started)
+            raise
+
+        if trial:
+            circuit.probing = False
+        self._record(circuit, trial, False, time.monotonic() - handle.started)
+
+    def _record(self, circuit, trial, failed, seconds):
+        slow = self.slow_call is not None and seconds >= self.slow_call
+
+        if trial:
+            if failed or slow:
+                self._open(circuit)
+                return
+            circuit.successes += 1
+            if circuit.successes >= self.trials:
+                circuit.state = CLOSED
+            return
+
+        # Calls that were sent before the circuit opened are not counted
+        if circuit.state != CLOSED:
+            return
+
+        circuit.outcomes.append((failed, slow))
+        if len(circuit.outcomes) < self.min_calls:
+            return
+
+        error_rate, slow_rate = circuit.rates()
+        if error_rate >= self.error_rate or slow_rate >= self.slow_rate:
+            self._open(circuit)
+
+    def _open(self, circuit):
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.outcomes.clear()
+        self.opened += 1
+
+    def remember(self, key, value):
+        """Keeps value as the last good response for key"""
+
+        stale = self._stale
+        stale[key] = value
+        stale.move_to_end(key)
+        while len(stale) > self.max_stale:
+            stale.popitem(last=False)
+
+    def stale(self, key):
+        """Returns the last good response for key, or None"""
+
+        value = self._stale.get(key)
+        if value is not None:
+            self._stale.move_to_end(key)
+            self.served_stale += 1
+        return value
+
+    def stats(self):
+        """Returns a dict of the breaker counters and, for every endpoint,
+        the state of its circuit and the rates over its last calls.
+        """
+
+        circuits = {}
+        for key, circuit in self._circuits.items():
+            error_rate, slow_rate = circuit.rates()
+            circuits[key] = {
+                "state": self.state(key),
+                "calls": len(circuit.outcomes),
+                "error_rate": error_rate,
+                "slow_rate": slow_rate,
+            }
+
+        return {
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "served_stale": self.served_stale,
+            "stale_responses": len(self._stale),
+            "circuits": circuits,
+        }
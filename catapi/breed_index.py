@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import re
+import unicodedata
+from collections import defaultdict
+
+
+__all__ = ("BreedIndex",)
+
+
+EXACT_SCORE = 100
+NAME_PREFIX_SCORE = 80
+WORD_PREFIX_SCORE = 60
+FUZZY_SCORE = 50
+FUZZY_PENALTY = 15
+TOKEN_SCORE = 20
+
+# Most typos fuzzy matching can ever tolerate
+MAX_DISTANCE = 2
+
+
+def normalize(text):
+    """Lowercases text, strips accents and turns punctuation into spaces"""
+
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.split(r"[^a-z0-9]+", text.lower())).strip()
+
+
+def deletes(word, depth=MAX_DISTANCE):
+    """Returns word along with every string made by deleting up to depth of
+    its characters.
+    """
+
+    results = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {variant[:index] + variant[index + 1:]
+                    for variant in frontier for index in range(len(variant))}
+        results |= frontier
+
+    return results
+
+
+def edit_distance(first, second):
+    """Returns the number of insertions, deletions, substitutions and
+    adjacent transpositions needed to turn first into second.
+    """
+
+    previous2 = None
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, 1):
+        current = [row]
+        for column, second_char in enumerate(second, 1):
+            cost = first_char != second_char
+            best = min(previous[column] + 1, current[column - 1] + 1,
+                       previous[column - 1] + cost)
+            if (previous2 is not None and row > 1 and column > 1
+                    and first_char == second[column - 2]
+                    and first[row - 2] == second_char):
+                best = min(best, previous2[column - 2] + 1)
+            current.append(best)
+        previous2, previous = previous, current
+
+    return previous[-1]
+
+
+class _Node():
+    __slots__ = ("children", "ids", "terms")
+
+    def __init__(self):
+        self.children = {}
+        # breed id: number of terms passing through this node
+        self.ids = defaultdict(int)
+        # breed id: number of terms ending at this node
+        self.terms = defaultdict(int)
+
+
+class _Trie():
+    """Prefix tree whose nodes know every breed id beneath them"""
+
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, term, breed_id):
+        node = self.root
+        node.ids[breed_id] += 1
+        for char in term:
+            node = node.children.setdefault(char, _Node())
+            node.ids[breed_id] += 1
+        node.terms[breed_id] += 1
+
+    def remove(self, term, breed_id):
+        path = [self.root]
+        for char in term:
+            path.append(path[-1].children[char])
+        path[-1].terms[breed_id] -= 1
+        if not path[-1].terms[breed_id]:
+            del path[-1].terms[breed_id]
+
+        for parent, char, node in zip(path, term, path[1:]):
+            node.ids[breed_id] -= 1
+            if not node.ids[breed_id]:
+                del node.ids[breed_id]
+            if not node.ids:
+                del parent.children[char]
+                break
+        self.root.ids[breed_id] -= 1
+        if not self.root.ids[breed_id]:
+            del self.root.ids[breed_id]
+
+    def prefix(self, prefix):
+        """Returns the ids of every breed with a term starting with prefix"""
+
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return ()
+        return node.ids.keys()
+
+    def exact(self, term):
+        """Returns the ids of every breed with exactly this term"""
+
+        node = self.root
+        for char in term:
+            node = node.children.get(char)
+            if node is None:
+                return ()
+        return node.terms.keys()
+
+
+class BreedIndex():
+    """Local search over the breed catalog, so that lookups such as an
+    autocomplete do not need a request to /breeds/search.
+
+    Names and alternate names are kept in a trie for prefix search. Every
+    word of a name is also indexed under all of its variants with up to two
+    letters deleted, so a misspelled word is matched by looking up its own
+    deletions instead of comparing it to every name. Temperament and origin
+    are searched by token. Results are ranked, best match first.
+
+    .. code:: python
+
+        index = await BreedIndex.from_api(api)
+        index.search("main co")     # [<Maine Coon>, ...]
+        index.search("siamse")      # [<Siamese>, ...]
+        index.search("playful")     # breeds with a playful temperament
+
+    Parameters
+    ----------
+
+    breeds: [:class:`catapi.models.breed.Breed`]
+        Breeds to index
+    """
+
+    __slots__ = ("_breeds", "_signatures", "_names", "_words", "_variants",
+                 "_tokens")
+
+    def __init__(self, breeds=()):
+        self._breeds = {}
+        self._signatures = {}
+        self._names = _Trie()
+        self._words = _Trie()
+        self._variants = defaultdict(set)
+        self._tokens = defaultdict(set)
+        for breed in breeds:
+            self.add(breed)
+
+    def __len__(self):
+        return len(self._breeds)
+
+    def __contains__(self, breed_id):
+        return breed_id in self._breeds
+
+    @classmethod
+    async def from_api(cls, api):
+        """Builds an index from every breed available through api"""
+
+        index = cls()
+        await index.refresh(api)
+        return index
+
+    async def refresh(self, api):
+        """Downloads the breed catalog again and updates the index with any
+        changes. Returns the number of breeds that changed.
+        """
+
+        breeds = [breed async for breed in api.iter_breeds(limit=100)]
+        return self.update(breeds)
+
+    @staticmethod
+    def _signature(breed):
+        return (breed.name, breed.alt_names, breed.temperment, breed.origin)
+
+    @staticmethod
+    def _terms(breed):
+        """Returns the (full names, words, tokens) a breed is found by"""
+
+        names = {normalize(breed.name)}
+        for alt_name in (breed.alt_names or "").split(","):
+            names.add(normalize(alt_name))
+        names.discard("")
+
+        words = {word for name in names for word in name.split()}
+
+        tokens = set()
+        for text in (breed.temperment, breed.origin):
+            for phrase in (text or "").split(","):
+                phrase = normalize(phrase)
+                if phrase:
+                    tokens.add(phrase)
+                    tokens.update(phrase.split())
+
+        return names, words, tokens
+
+    def add(self, breed):
+        """Adds a breed, replacing any indexed breed with the same id"""
+
+        if breed.id in self._breeds:
+            self.remove(breed.id)
+
+        names, words, tokens = self._terms(breed)
+        for name in names:
+            self._names.add(name, breed.id)
+        for word in words:
+            if not self._words.exact(word):
+                for variant in deletes(word):
+                    self._variants[variant].add(word)
+            self._words.add(word, breed.id)
+        for token in tokens:
+            self._tokens[token].add(breed.id)
+
+        self._breeds[breed.id] = breed
+        self._signatures[breed.id] = self._signature(breed)
+
+    def remove(self, breed_id):
+        """Removes the breed with breed_id from the index"""
+
+        breed = self._breeds.pop(breed_id)
+        del self._signatures[breed_id]
+
+        names, words, tokens = self._terms(breed)
+        for name in names:
+            self._names.remove(name, breed_id)
+        for word in words:
+            self._words.remove(word, breed_id)
+            if self._words.exact(word):
+                continue
+            for variant in deletes(word):
+                self._variants[variant].discard(word)
+                if not self._variants[variant]:
+                    del self._variants[variant]
+        for token in tokens:
+            self._tokens[token].discard(breed_id)
+            if not self._tokens[token]:
+                del self._tokens[token]
+
+    def update(self, breeds):
+        """Brings the index in line with a full breed catalog. Only breeds
+        that were added, changed or removed are re-indexed. Returns the
+        number of breeds that changed.
+        """
+
+        changed = 0
+        seen = set()
+        for breed in breeds:
+            seen.add(breed.id)
+            if self._signatures.get(breed.id) == self._signature(breed):
+                self._breeds[breed.id] = breed
+                continue
+
+            self.add(breed)
+            changed += 1
+
+        for breed_id in set(self._breeds) - seen:
+            self.remove(breed_id)
+            changed += 1
+
+        return changed
+
+    def get(self, breed_id):
+        """Returns the indexed breed with breed_id, or None"""
+
+        return self._breeds.get(breed_id)
+
+    def prefix(self, query):
+        """Returns the breeds with a name, alternate name or word in one
+        starting with query.
+        """
+
+        query = normalize(query)
+        ids = set(self._names.prefix(query)) | set(self._words.prefix(query))
+        return [self._breeds[breed_id] for breed_id in sorted(ids)]
+
+    def _fuzzy(self, word, max_distance=None):
+        """Yields (indexed word, edits) for every indexed word within
+        max_distance edits of word.
+        """
+
+        if max_distance is None:
+            max_distance = 1 if len(word) <= 5 else 2
+        max_distance = min(max_distance, MAX_DISTANCE)
+
+        candidates = set()
+        for variant in deletes(word, max_distance):
+            candidates.update(self._variants.get(variant, ()))
+
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            edits = edit_distance(word, candidate)
+            if edits <= max_distance:
+                yield candidate, edits
+
+    def search(self, query, limit=10, max_distance=None):
+        """Returns up to limit breeds matching query, best match first.
+
+        Parameters
+        ----------
+
+        query: :class:`string`
+            Part or all of a breed name, possibly misspelled, or temperament
+            and origin words
+
+        limit: :class:`int`
+            Most breeds to return
+
+        max_distance: :class:`int`
+            Most typos tolerated in a word, at most 2. Defaults to 1 for words
+            of up to five letters and 2 for longer ones.
+        """
+
+        query = normalize(query)
+        if not query:
+            return []
+
+        scores = defaultdict(int)
+        for breed_id in self._names.prefix(query):
+            scores[breed_id] = NAME_PREFIX_SCORE
+        for breed_id in self._names.exact(query):
+            scores[breed_id] = EXACT_SCORE
+
+        # Every query word adds the score of its best match in a breed's name
+        query_words = query.split()
+        words = defaultdict(int)
+        for word in query_words:
+            best = defaultdict(int)
+            for breed_id in self._words.prefix(word):
+                best[breed_id] = WORD_PREFIX_SCORE
+
+            if len(word) >= 3:
+                for match, edits in self._fuzzy(word, max_distance):
+                    points = FUZZY_SCORE - FUZZY_PENALTY * edits
+                    for breed_id in self._words.exact(match):
+                        best[breed_id] = max(best[breed_id], points)
+
+            for breed_id, points in best.items():
+                words[breed_id] += points
+
+        for breed_id, points in words.items():
+            scores[breed_id] = max(scores[breed_id], points)
+
+        for token in set(query_words) | {query}:
+            for breed_id in self._tokens.get(token, ()):
+                scores[breed_id] += TOKEN_SCORE
+
+        # Breeds may have no name, which sorts first among equal scores
+        ranked = sorted((-points, self._breeds[breed_id].name or "", breed_id)
+                        for breed_id, points in scores.items() if points > 0)
+        return [self._breeds[breed_id] for _, _, breed_id in ranked[:limit]]
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("BreedTable requires numpy. Install it with "
+                      "pip install catapi.py[numpy]") from None
+
+
+__all__ = ("BreedTable", "TRAITS")
+
+
+# Integer traits of a breed, in column order
+TRAITS = ("adaptability", "affection_level", "child_friendly", "dog_friendly",
+          "energy_level", "experimental", "grooming", "hairless",
+          "health_issues", "hypoallergenic", "intelligence", "natural",
+          "shedding_level", "rare", "rex", "short_legs", "social_needs",
+          "stranger_friendly", "suppress_tail", "vocalisation")
+
+COLUMNS = {trait: column for column, trait in enumerate(TRAITS)}
+
+
+def _trait(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class BreedTable():
+    """Breed traits packed into a 2-D NumPy array, one row per breed and one
+    column per trait in :data:`TRAITS`, for filtering and ranking breeds
+    without looping over Python objects. Unknown traits are stored as 0.
+
+    .. code:: python
+
+        table = await BreedTable.from_api(api)
+        calm = table.filter(energy_level=(1, 2), hypoallergenic=1)
+        best = table.rank({"affection_level": 2, "grooming": -1}, k=5)
+        like_siamese = table.similar("siam", k=3)
+
+    Parameters
+    ----------
+
+    breeds: [:class:`catapi.models.breed.Breed`]
+        Breeds to put in the table
+
+    Attributes
+    ----------
+
+    ids: :class:`numpy.ndarray`
+        Breed ids, one per row
+
+    names: :class:`numpy.ndarray`
+        Breed names, one per row
+
+    traits: :class:`numpy.ndarray`
+        int8 array of shape (breeds, traits)
+    """
+
+    __slots__ = ("ids", "names", "traits", "_breeds")
+
+    def __init__(self, breeds=()):
+        breeds = list(breeds)
+        self._breeds = np.empty(len(breeds), dtype=object)
+        self._breeds[:] = breeds
+        self.ids = np.array([breed.id for breed in breeds], dtype=object)
+        self.names = np.array([breed.name for breed in breeds], dtype=object)
+        self.traits = np.array(
+            [[_trait(getattr(breed, trait)) for trait in TRAITS]
+             for breed in breeds], dtype=np.int8).reshape(len(breeds),
+                                                         len(TRAITS))
+
+    @classmethod
+    async def from_api(cls, api):
+        """Builds a table from every breed available through api"""
+
+        return cls([breed async for breed in api.iter_breeds(limit=100)])
+
+    @classmethod
+    def _from_rows(cls, table, rows):
+        subset = cls.__new__(cls)
+        subset.ids = table.ids[rows]
+        subset.names = table.names[rows]
+        subset.traits = table.traits[rows]
+        subset._breeds = table._breeds[rows]
+        return subset
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self._breeds)
+
+    def __getitem__(self, rows):
+        """table[3] returns a :class:`catapi.models.breed.Breed`. A slice,
+        boolean mask or array of row numbers returns a new BreedTable.
+        """
+
+        if isinstance(rows, (int, np.integer)):
+            return self._breeds[rows]
+
+        return self._from_rows(self, rows)
+
+    def column(self, trait):
+        """Returns the column of values for trait"""
+
+        return self.traits[:, COLUMNS[trait]]
+
+    def row(self, breed_id):
+        """Returns the row number of the breed with breed_id"""
+
+        rows = np.flatnonzero(self.ids == breed_id)
+        if not len(rows):
+            raise KeyError(breed_id)
+        return int(rows[0])
+
+    def to_breeds(self):
+        """Returns the rows as a list of :class:`catapi.models.breed.Breed`"""
+
+        return list(self._breeds)
+
+    def mask(self, **conditions):
+        """Returns a boolean array marking the rows meeting every condition.
+
+        Each keyword is a trait. A number must be matched exactly, a
+        (low, high) tuple is an inclusive range and a list is a set of
+        allowed values.
+        """
+
+        mask = np.ones(len(self), dtype=bool)
+        for trait, condition in conditions.items():
+            column = self.column(trait)
+            if isinstance(condition, tuple):
+                low, high = condition
+                mask &= (column >= low) & (column <= high)
+            elif isinstance(condition, (list, set, frozenset)):
+                mask &= np.isin(column, list(condition))
+            else:
+                mask &= column == condition
+
+        return mask
+
+    def filter(self, **conditions):
+        """Returns a BreedTable of the rows meeting every condition. Takes
+        the same conditions as mask().
+        """
+
+        return self[self.mask(**conditions)]
+
+    def _weights(self, weights):
+        vector = np.zeros(len(TRAITS), dtype=np.float32)
+        for trait, weight in weights.items():
+            vector[COLUMNS[trait]] = weight
+        return vector
+
+    def scores(self, weights):
+        """Returns the weighted sum of the traits of every row.
+
+        Parameters
+        ----------
+
+        weights: :class:`dict`
+            Weight per trait. Traits left out count for nothing, negative
+            weights penalise a trait.
+        """
+
+        return self.traits @ self._weights(weights)
+
+    def rank(self, weights, k=None):
+        """Returns a BreedTable sorted by scores(weights), highest first,
+        holding at most k rows.
+        """
+
+        order = np.argsort(-self.scores(weights), kind="stable")
+        return self[order[:k]]
+
+    def distances(self, breed_id, weights=None):
+        """Returns the euclidean distance between the traits of breed_id and
+        the traits of every row. weights scales each trait, and defaults to
+        1 for every trait.
+        """
+
+        traits = self.traits.astype(np.float32)
+        if weights is not None:
+            traits *= self._weights(weights)
+
+        difference = traits - traits[self.row(breed_id)]
+        return np.sqrt(np.einsum("ij,ij->i", difference, difference))
+
+    def similar(self, breed_id, k=5, weights=None):
+        """Returns a BreedTable of the k breeds nearest to breed_id, closest
+        first. The breed itself is left out.
+        """
+
+        distances = self.distances(breed_id, weights)
+        distances[self.row(breed_id)] = np.inf
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return self[np.array([], dtype=int)]
+
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return self[nearest]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+
+
+__all__ = ("BulkResult", "run_bulk")
+
+
+class BulkResult(dict):
+    """Result of a bulk operation. Maps every item that was worked on to the
+    value it produced, or to the exception it raised. Items keep the order
+    they were given in.
+    """
+
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """Dict of the items that completed and their results"""
+
+        return {item: result for item, result in self.items()
+                if not isinstance(result, Exception)}
+
+    @property
+    def failed(self):
+        """Dict of the items that raised and their exceptions"""
+
+        return {item: result for item, result in self.items()
+                if isinstance(result, Exception)}
+
+    @property
+    def ok(self):
+        """True if no item failed"""
+
+        return not any(isinstance(result, Exception)
+                       for result in self.values())
+
+
+async def run_bulk(func, items, concurrency=10):
+    """Calls the coroutine function func once for every unique item, running
+    no more than concurrency calls at a time. A failing call does not stop
+    the others.
+
+    Parameters
+    ----------
+
+    func: :class:`callable`
+        Coroutine function taking a single item
+
+    items: iterable
+        Hashable items to pass to func
+
+    concurrency: :class:`int`
+        Maximum number of calls in flight at once
+
+    Returns a :class:`BulkResult`
+    """
+
+    items = list(dict.fromkeys(items))
+    results = {}
+    pending = iter(items)
+
+    async def worker():
+        for item in pending:
+            try:
+                results[item] = await func(item)
+            except Exception as error:
+                results[item] = error
+
+    workers = min(max(concurrency, 1), len(items))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return BulkResult((item, results[item]) for item in items)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+
+__all__ = ("ResponseCache",)
+
+
+class ResponseCache():
+    """In-memory cache of decoded responses from read-only endpoints.
+
+    Entries expire after the TTL of their endpoint. Once max_entries or
+    max_bytes is exceeded, the least recently used entries are evicted.
+    Cached values are shared between callers and must not be modified.
+
+    Keyword Arguments
+    -----------------
+
+    ttls: :class:`dict`
+        Seconds to keep responses for, keyed by endpoint. Merged over
+        ResponseCache.DEFAULT_TTLS. An endpoint with a TTL of 0 is not cached.
+
+    max_entries: :class:`int`
+        Most responses to keep. Defaults to 1024
+
+    max_bytes: :class:`int`
+        Most bytes of (json encoded) responses to keep. Defaults to None,
+        which does not limit the size.
+
+    Attributes
+    ----------
+
+    hits: :class:`int`
+        Lookups answered from the cache
+
+    misses: :class:`int`
+        Lookups that were not in the cache, or had expired
+
+    evictions: :class:`int`
+        Entries dropped to stay under max_entries or max_bytes
+    """
+
+    DEFAULT_TTLS = {
+        "breeds": 24 * 60 * 60,
+        "breeds/search": 24 * 60 * 60,
+        "categories": 24 * 60 * 60,
+        "images/{id}": 60 * 60,
+        "images/{id}/analysis": 60 * 60,
+    }
+
+    __slots__ = ("ttls", "max_entries", "max_bytes", "hits", "misses",
+                 "evictions", "_entries", "_bytes")
+
+    def __init__(self, **kwargs):
+        self.ttls = dict(self.DEFAULT_TTLS, **kwargs.pop("ttls", {}))
+        self.max_entries = kwargs.pop("max_entries", 1024)
+        self.max_bytes = kwargs.pop("max_bytes", None)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key: (expires, size, value)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(url, params=None):
+        """Normalizes a url and its parameters into a cache key. Parameters
+        are sorted and empty ones dropped, so equivalent requests share a key.
+        """
+
+        if not params:
+            return url
+
+        params = sorted((name, str(value)) for name, value in params.items()
+                        if value is not None and value != "")
+        if not params:
+            return url
+
+        return f"{url}?{urlencode(params)}"
+
+    def ttl(self, endpoint):
+        """Seconds responses from endpoint are cached for, 0 if never"""
+
+        return self.ttls.get(endpoint, 0)
+
+    def get(self, key):
+        """Returns the cached value for key, or None if it is missing or
+        expired.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, size, value = entry
+        if expires <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        """Stores value under key for ttl seconds"""
+
+        if ttl <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        size = 0
+        if self.max_bytes:
+            size = len(json.dumps(value, separators=(",", ":")))
+            if size > self.max_bytes:
+                return
+
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+
+        while (len(self._entries) > self.max_entries
+               or (self.max_bytes and self._bytes > self.max_bytes)):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, prefix=None):
+        """Removes the entry for prefix along with every entry beneath it,
+        such as its analysis or query variants. Clears the whole cache if
+        prefix is None.
+
+        Returns the number of entries removed.
+        """
+
+        if prefix is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return removed
+
+        doomed = [key for key in self._entries
+                  if key == prefix or key.startswith((prefix + "/",
+                                                      prefix + "?"))]
+        for key in doomed:
+            self._remove(key)
+
+        return len(doomed)
+
+    def stats(self):
+        """Returns a dict of the cache counters and current size"""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key):
+        expires, size, value = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .cache import ResponseCache
+
+
+__all__ = ("CatalogCache", "CatalogEntry")
+
+
+CatalogEntry = namedtuple("CatalogEntry",
+                          "body etag last_modified fetched_at")
+
+
+class CatalogCache():
+    """Persistent SQLite cache for the breed and category catalogs.
+
+    Responses survive restarts and can be shared by several processes, since
+    the database runs in WAL mode. Stored responses are revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged catalog costs a
+    single 304 instead of a full download.
+
+    Parameters
+    ----------
+
+    path: :class:`string`
+        Location of the database file
+
+    Keyword Arguments
+    -----------------
+
+    max_age: :class:`float`
+        Seconds a stored response is used without revalidating it. Defaults
+        to 0, which revalidates on every read.
+
+    endpoints: [:class:`string`]
+        Endpoints that are stored. Defaults to "breeds" and "categories"
+    """
+
+    __slots__ = ("path", "max_age", "endpoints", "_connection", "_lock")
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        self.max_age = kwargs.pop("max_age", 0)
+        self.endpoints = frozenset(kwargs.pop("endpoints",
+                                              ("breeds", "categories")))
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30,
+                                           check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, "
+            "last_modified TEXT, fetched_at REAL NOT NULL)")
+
+    key = staticmethod(ResponseCache.key)
+
+    def close(self):
+        """Closes the database connection"""
+
+        with self._lock:
+            self._connection.close()
+
+    def fresh(self, entry):
+        """Whether entry may be used without revalidating it"""
+
+        return entry.fetched_at + self.max_age > time.time()
+
+    def load(self, key):
+        """Returns the :class:`CatalogEntry` stored for key, or None"""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses "
+                "WHERE key = ?", (key,)).fetchone()
+
+        return CatalogEntry(*row) if row else None
+
+    def store(self, key, body, etag=None, last_modified=None):
+        """Stores the raw body of a response along with its validators"""
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, time.time()))
+
+    def touch(self, key):
+        """Marks the response stored for key as just revalidated"""
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET fetched_at = ? WHERE key = ?",
+                (time.time(), key))
+
+    def invalidate(self, key=None):
+        """Removes the response stored for key, or all of them if None"""
+
+        with self._lock:
+            if key is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,))
+
+    async def run(self, method, *args):
+        """Runs one of the blocking methods above in the default executor"""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, method, *args)
@@ -7,13 +7,34 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 """
 
 
+import asyncio
+import os
+import posixpath
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
 import aiohttp
+from . import codec
+from .breaker import CircuitBreaker
+from .bulk import run_bulk
+from .cache import ResponseCache
+from .catalog import CatalogCache
+from .coalesce import SingleFlight
+from .errors import CircuitOpen, DownloadError, HTTPException, RateLimited
+from .hedging import Hedger
+from .metrics import Metrics, endpoint as endpoint_name, trace_event
 from .models.analysis import Analysis
 from .models.breed import Breed
 from .models.category import Category
 from .models.favorite import Favorite
 from .models.image import Image
+from .models.lazy import LAZY_MODELS
 from .models.vote import Vote
+from .pagination import paginate
+from .ratelimit import RetryPolicy, get_bucket
+from .scheduler import Scheduler, priority
+from .uploads import UploadFile
 
 __all__ = ("CatApi",)
 
@@ -33,12 +54,447 @@ class CatApi():
 
     api_key: :class:`int`
         authentication key for thecatapi.com
+
+    base_url: :class:`string`
+        Root url requests are sent to. Defaults to thecatapi.com, but may
+        point at any compatible server such as
+        :class:`catapi.testing.MockCatApiServer`
+
+    A single :class:`aiohttp.ClientSession` is shared by every request made
+    through an instance, so connections are kept alive and reused. The
+    session is created on first use, or explicitly by :meth:`start` /
+    ``async with CatApi(...) as api:``. Call :meth:`close` when you are done
+    with an instance that was not used as a context manager.
+
+    Keyword Arguments
+    -----------------
+
+    limit: :class:`int`
+        Total number of simultaneous connections. Defaults to 100
+
+    limit_per_host: :class:`int`
+        Simultaneous connections to a single host. Defaults to 10
+
+    ttl_dns_cache: :class:`int`
+        Seconds to cache DNS lookups for. Defaults to 300
+
+    keepalive_timeout: :class:`float`
+        Seconds an idle connection is kept open. Defaults to 30
+
+    timeout: :class:`float`
+        Total timeout in seconds for a single request. Defaults to None
+
+    warm_up: :class:`int`
+        Number of connections to open when the session starts. Defaults to 0
+
+    rate_limit: :class:`float`
+        Requests per second allowed for api_key. Every client using the same
+        key shares this budget. Defaults to None, which only pauses when the
+        server asks us to.
+
+    rate_burst: :class:`int`
+        Requests that may be sent at once before rate_limit applies
+
+    retry_policy: :class:`catapi.ratelimit.RetryPolicy`
+        Decides which failed requests are retried and how long to wait
+        between tries. Defaults to 3 retries with jittered backoff.
+
+    cache: :class:`catapi.cache.ResponseCache`
+        Cache for breeds, breed searches, categories, images and analyses.
+        Pass True for a cache with the default settings. Defaults to None,
+        which caches nothing.
+
+    catalog: :class:`catapi.catalog.CatalogCache`
+        Persistent cache for the breed and category catalogs, or the path of
+        its database file. Defaults to None
+
+    coalesce: :class:`bool`
+        Whether identical GET requests made at the same time share a single
+        request. Random image searches are always sent on their own, since
+        each should get different images. Defaults to True. The counters are
+        kept on CatApi.coalescer.
+
+    json_loads: :class:`callable`
+        Decodes response bodies (bytes) into python objects. Defaults to
+        orjson.loads when orjson is installed, json.loads otherwise.
+
+    json_dumps: :class:`callable`
+        Encodes json request bodies, returning bytes or str. Defaults to
+        orjson.dumps when orjson is installed, json.dumps otherwise.
+
+    lazy: :class:`bool`
+        Return lazy models (see :mod:`catapi.models.lazy`), which keep the
+        decoded response and only build an attribute the first time it is
+        read. Defaults to False
+
+    metrics: :class:`catapi.metrics.Metrics`
+        Collects a trace of every request, with latency histograms and byte
+        counters per endpoint. Defaults to True, which creates one. Pass
+        False to keep no metrics. A Metrics may be shared by several
+        clients. See :meth:`stats`.
+
+    scheduler: :class:`catapi.scheduler.Scheduler`
+        Orders requests by priority once more are waiting than can be sent
+        at once, so that calls made inside :meth:`priority` blocks for
+        "interactive" work go ahead of "bulk" ones. Defaults to True, which
+        creates one sending limit_per_host requests at once, or limit when
+        limit_per_host is 0. Pass False to send requests in the order they
+        are made.
+
+    hedge: :class:`catapi.hedging.Hedger`
+        Sends a second copy of a GET request that is slower than usual and
+        uses whichever answers first. Pass True for the default settings.
+        Defaults to None, which never hedges.
+
+    breaker: :class:`catapi.breaker.CircuitBreaker`
+        Fails requests to an endpoint at once while its recent calls keep
+        failing or answering slowly, instead of letting each wait out its
+        timeout. Breeds, breed searches, categories, images and analyses
+        are then answered with their last good response, as models whose
+        stale attribute is True. Pass True for the default settings.
+        Defaults to None, which sends every request.
     """
 
-    __slots__ = ("api_key",)
+    __slots__ = ("api_key", "base_url", "breaker", "cache", "catalog",
+                 "coalescer", "hedger", "json_dumps", "json_loads", "lazy",
+                 "metrics", "retry_policy", "scheduler", "timeout", "warm_up",
+                 "_connector_options", "_session", "_loop", "_closing",
+                 "_in_flight", "_idle")
 
     def __init__(self, **kwargs):
         self.api_key = kwargs.pop("api_key", None)
+        self.base_url = kwargs.pop("base_url", BASE_URL).rstrip("/")
+        self.timeout = kwargs.pop("timeout", None)
+        self.warm_up = kwargs.pop("warm_up", 0)
+        self.retry_policy = kwargs.pop("retry_policy", None) or RetryPolicy()
+        self.cache = kwargs.pop("cache", None)
+        if self.cache is True:
+            self.cache = ResponseCache()
+        self.catalog = kwargs.pop("catalog", None)
+        if isinstance(self.catalog, str):
+            self.catalog = CatalogCache(self.catalog)
+        self.coalescer = SingleFlight() if kwargs.pop("coalesce", True) \
+            else None
+        self.hedger = kwargs.pop("hedge", None)
+        if self.hedger is True:
+            self.hedger = Hedger()
+        self.breaker = kwargs.pop("breaker", None)
+        if self.breaker is True:
+            self.breaker = CircuitBreaker()
+        self.json_loads = kwargs.pop("json_loads", codec.loads)
+        self.json_dumps = kwargs.pop("json_dumps", codec.dumps)
+        self.lazy = kwargs.pop("lazy", False)
+        self.metrics = kwargs.pop("metrics", True)
+        if self.metrics is True:
+            self.metrics = Metrics()
+        elif self.metrics is False:
+            self.metrics = None
+        self._connector_options = {
+            "limit": kwargs.pop("limit", 100),
+            "limit_per_host": kwargs.pop("limit_per_host", 10),
+            "ttl_dns_cache": kwargs.pop("ttl_dns_cache", 300),
+            "keepalive_timeout": kwargs.pop("keepalive_timeout", 30),
+        }
+        self.scheduler = kwargs.pop("scheduler", True)
+        if self.scheduler is True:
+            self.scheduler = self._default_scheduler()
+        elif self.scheduler is False:
+            self.scheduler = None
+
+        rate_limit = kwargs.pop("rate_limit", None)
+        rate_burst = kwargs.pop("rate_burst", None)
+        if rate_limit is not None or rate_burst is not None:
+            get_bucket(self.api_key, rate_limit, rate_burst)
+
+        self._session = None
+        self._loop = None
+        self._closing = False
+        self._in_flight = 0
+        self._idle = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    def _default_scheduler(self):
+        """Returns a scheduler sending as many requests at once as the
+        connector opens connections to the api host, or None when neither
+        limit is set.
+        """
+
+        # 0 means no limit to aiohttp
+        options = self._connector_options
+        concurrency = options["limit_per_host"] or options["limit"]
+        if not concurrency:
+            return None
+        return Scheduler(concurrency=concurrency,
+                         reserved=1 if concurrency > 1 else 0)
+
+    @property
+    def closed(self):
+        """Whether or not the shared session is currently closed"""
+
+        return self._session is None or self._session.closed
+
+    def model(self, model):
+        """Returns the class responses are turned into for model, which is
+        its lazy variant when CatApi.lazy is set.
+        """
+
+        return LAZY_MODELS[model] if self.lazy else model
+
+    def _build(self, model, data, stale=False):
+        """Turns decoded json into model, or a list of models for a list,
+        timing it for metrics. With stale, the models are built as the stale
+        variant of model.
+        """
+
+        model_class = self.model(model)
+        if stale:
+            model_class = model_class.stale_variant()
+
+        from_dict = model_class.from_dict
+        started = time.perf_counter()
+        if isinstance(data, list):
+            built = [from_dict(item) for item in data]
+        else:
+            built = from_dict(data)
+
+        if self.metrics is not None:
+            self.metrics.record_model(model.__name__,
+                                      time.perf_counter() - started)
+        return built
+
+    def stats(self):
+        """Returns a snapshot of the metrics of this client as a dict of
+        plain values, ready to be exported. See
+        :meth:`catapi.metrics.Metrics.stats` for what it holds. The
+        counters of the cache, coalescer, scheduler, hedger and breaker are
+        added under their names when they are used.
+        """
+
+        stats = self.metrics.stats() if self.metrics is not None else {}
+        stats["in_flight"] = self._in_flight
+        if self.coalescer is not None:
+            stats["coalescer"] = self.coalescer.stats()
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.scheduler is not None:
+            stats["scheduler"] = self.scheduler.stats()
+        if self.hedger is not None:
+            stats["hedging"] = self.hedger.stats()
+        if self.breaker is not None:
+            stats["breaker"] = self.breaker.stats()
+        return stats
+
+    def priority(self, name):
+        """Returns a context manager making every request started inside it,
+        including by tasks created inside it, use priority class name.
+
+        .. code:: python
+
+            with api.priority("bulk"):
+                await api.delete_favorites(favorite_ids)
+
+            with api.priority("interactive"):
+                images = await api.search_images(limit=10)
+
+        The classes are "interactive", "normal" (the default) and "bulk",
+        unless the scheduler was given other weights.
+        """
+
+        if self.scheduler is not None:
+            self.scheduler.check(name)
+        return priority(name)
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Holds a scheduler slot, when there is a scheduler, for the block"""
+
+        if self.scheduler is None:
+            yield
+            return
+
+        async with self.scheduler.slot():
+            yield
+
+    @contextmanager
+    def _traced(self):
+        """Follows the request made inside the block with a trace"""
+
+        metrics = self.metrics
+        if metrics is None:
+            yield
+            return
+
+        trace = metrics.start()
+        try:
+            yield
+        except BaseException as error:
+            metrics.finish(trace, error)
+            raise
+        metrics.finish(trace)
+
+    @contextmanager
+    def _circuit(self, key):
+        """Lets a request to endpoint key through the breaker, when there is
+        one, and records how it went. Yields a handle whose start() is
+        called when the request is sent.
+        """
+
+        if key is None:
+            yield _UNGUARDED
+            return
+
+        with self.breaker.call(key) as call:
+            yield call
+
+    @staticmethod
+    def _image_batch(images):
+        # numpy is optional, so ImageBatch is only imported when asked for
+        from .image_batch import ImageBatch
+        return ImageBatch(images)
+
+    @property
+    def rate_limiter(self):
+        """The :class:`catapi.ratelimit.TokenBucket` shared by every client
+        using this api_key.
+        """
+
+        return get_bucket(self.api_key)
+
+    async def start(self):
+        """Creates the shared session if it is not already open and returns
+        it. Opens ``warm_up`` connections ahead of time if requested.
+
+        The session belongs to the event loop it was created on. Starting
+        on another loop, such as in a second asyncio.run() call, replaces a
+        session left behind by a loop that has stopped. Raises RuntimeError
+        while the loop of the session is still running elsewhere.
+        """
+
+        loop = asyncio.get_running_loop()
+        if not self.closed:
+            if self._loop is loop:
+                self._closing = False
+                return self._session
+            await self._drop_session()
+
+        self._closing = False
+        connector = aiohttp.TCPConnector(**self._connector_options)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        if self.metrics is not None:
+            Metrics.add_signals(trace)
+        self._session = aiohttp.ClientSession(connector=connector,
+                                              timeout=timeout,
+                                              trace_configs=[trace])
+        self._loop = loop
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        if self.warm_up:
+            await self._warm_up(self._session, self.warm_up)
+
+        return self._session
+
+    async def close(self, timeout=None):
+        """Waits for in-flight requests to finish, then closes the shared
+        session and all of its connections.
+
+        Parameters
+        ----------
+
+        timeout: :class:`float`
+            Maximum seconds to wait for in-flight requests. Waits until they
+            are all done if None.
+
+        Requests made after close() raise RuntimeError until start() is
+        called again.
+        """
+
+        self._closing = True
+        if self.closed:
+            return
+
+        if self._loop is not asyncio.get_running_loop():
+            await self._drop_session()
+            return
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await self._session.close()
+            self._session = None
+
+    async def _drop_session(self):
+        """Closes a session made on another event loop, which must not be
+        running any more. Its connections died with their loop, so closing
+        only marks it closed.
+        """
+
+        if self._loop.is_running():
+            raise RuntimeError("CatApi is in use on another event loop. Use "
+                               "one CatApi per loop, or SyncCatApi to share "
+                               "one between threads.")
+
+        session, self._session = self._session, None
+        try:
+            await session.close()
+        except RuntimeError:
+            # The connections can not be closed once their loop is closed
+            pass
+
+    async def _warm_up(self, session, connections):
+        """Opens connections to the api host concurrently so that they sit in
+        the keep-alive pool before the first real request.
+        """
+
+        async def touch():
+            try:
+                async with session.head(self.base_url) as response:
+                    await response.release()
+            except aiohttp.ClientError:
+                pass
+
+        await asyncio.gather(*(touch() for _ in range(connections)))
+
+    @staticmethod
+    async def _on_request_end(session, context, params):
+        """Feeds the rate limit headers of every response to the bucket of
+        the key that made the request.
+        """
+
+        api_key = params.headers.get("x-api-key")
+        if api_key is not None:
+            get_bucket(api_key).update(params.response.headers)
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Hands out the shared session, keeping count of in-flight requests
+        so that close() can drain them.
+        """
+
+        if self._closing:
+            raise RuntimeError("CatApi is closed, no new requests allowed "
+                               "until start() is called")
+
+        session = await self.start()
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield session
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
 
     async def get_analysis(self, image_id):
         """Get the analysis results of an image.
@@ -46,9 +502,10 @@ class CatApi():
         image_id: :class:`string`
         """
 
-        url = f"{BASE_URL}/images/{image_id}/analysis"
-        analysis = await self.api_get_session(url)
-        return Analysis(**analysis[0])
+        url = f"{self.base_url}/images/{image_id}/analysis"
+        analysis, stale = await self._get(url,
+                                          endpoint="images/{id}/analysis")
+        return self._build(Analysis, analysis[0], stale)
 
     async def get_breeds(self, page=0, limit=5, attach_breed=""):
         """Requests breeds from thecatapi. Without any parameters passed in,
@@ -69,12 +526,39 @@ class CatApi():
 
         params = {"attach_breed": attach_breed, "limit": limit, "page": page}
 
-        url = f"{BASE_URL}/breeds"
+        url = f"{self.base_url}/breeds"
 
-        breeds = await self.api_get_session(url, params)
-        breeds = [Breed.from_dict(breed) for breed in breeds]
+        breeds, stale = await self._get(url, params, endpoint="breeds")
+        breeds = self._build(Breed, breeds, stale)
         return breeds
 
+    def iter_breeds(self, limit=25, page=0, prefetch=1):
+        """Async iterator over every breed, starting at page. The next pages
+        are requested while the current one is being consumed.
+
+        .. code:: python
+
+            async for breed in api.iter_breeds():
+                print(breed.name)
+
+        Parameters
+        -----------
+
+        limit: :class:`int`
+            How many breeds are requested at a time
+
+        page: :class:`int`
+            Which page to start from
+
+        prefetch: :class:`int`
+            How many pages to request ahead of the one being consumed
+        """
+
+        async def fetch(page):
+            return await self.get_breeds(page=page, limit=limit)
+
+        return paginate(fetch, page, limit, prefetch)
+
     async def get_categories(self, limit=7, page=0):
         """Gets the categories available through the api. By default, returns
         the current total of 7 categories.
@@ -91,9 +575,10 @@ class CatApi():
 
         params = {"limit": limit, "page": page}
 
-        url = f"{BASE_URL}/categories"
-        categories = await self.api_get_session(url, params)
-        categories = [Category(**category) for category in categories]
+        url = f"{self.base_url}/categories"
+        categories, stale = await self._get(url, params,
+                                            endpoint="categories")
+        categories = self._build(Category, categories, stale)
         return categories
 
     async def delete_favorite(self, favorite_id):
@@ -108,7 +593,7 @@ class CatApi():
             ID of the image to delete a favorite from
         """
 
-        url = f"{BASE_URL}/favourites/{favorite_id}"
+        url = f"{self.base_url}/favourites/{favorite_id}"
         message = await self.api_delete_session(url)
         return message
 
@@ -126,6 +611,35 @@ class CatApi():
 
         return await self.delete_favorite(favourite_id)
 
+    async def delete_favorites(self, favorite_ids, concurrency=10):
+        """Removes many items from your favorites at once.
+
+        Also mapped to CatApi.delete_favourites()
+
+        Parameters
+        ----------
+
+        favorite_ids: [:class:`string`]
+            IDs of the favorites to delete
+
+        concurrency: :class:`int`
+            Maximum number of deletes in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every id to the
+        delete response or to the exception raised while deleting it.
+        """
+
+        return await run_bulk(self.delete_favorite, favorite_ids,
+                              concurrency)
+
+    async def delete_favourites(self, favourite_ids, concurrency=10):
+        """Removes many items from your favourites at once.
+
+        Also mapped to CatApi.delete_favorites()
+        """
+
+        return await self.delete_favorites(favourite_ids, concurrency)
+
     async def favorite(self, image_id, sub_id):
         """Favorite an image.
 
@@ -144,7 +658,7 @@ class CatApi():
         """
 
         data = {"image_id": image_id, "sub_id": sub_id}
-        url = f"{BASE_URL}/favourites"
+        url = f"{self.base_url}/favourites"
         message = await self.api_post_session(url, data, json=True)
         if message["message"] == "SUCCESS":
             return message["id"]
@@ -168,7 +682,38 @@ class CatApi():
             Note: testing shows sub_id is required although thecatapi says not
         """
 
-        return self.favorite(image_id, sub_id)
+        return await self.favorite(image_id, sub_id)
+
+    async def favorite_many(self, pairs, concurrency=10):
+        """Favorites many images at once.
+
+        Also mapped to CatApi.favourite_many()
+
+        Parameters
+        ----------
+
+        pairs: [(:class:`string`, :class:`string`)]
+            (image_id, sub_id) tuples to favorite
+
+        concurrency: :class:`int`
+            Maximum number of requests in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every pair to the
+        new favorite id or to the exception raised.
+        """
+
+        async def favorite(pair):
+            return await self.favorite(*pair)
+
+        return await run_bulk(favorite, pairs, concurrency)
+
+    async def favourite_many(self, pairs, concurrency=10):
+        """Favourites many images at once.
+
+        Also mapped to CatApi.favorite_many()
+        """
+
+        return await self.favorite_many(pairs, concurrency)
 
     async def get_favorites(self, limit=100, page=0, sub_id=""):
         """Gets all of your favorites.
@@ -189,13 +734,48 @@ class CatApi():
         """
 
         params = {"limit": limit, "page": page, "sub_id": sub_id}
-        url = f"{BASE_URL}/favourites"
+        url = f"{self.base_url}/favourites"
 
         favorites = await self.api_get_session(url, params)
-        favorites = [Favorite(**favorite) for favorite in favorites]
+        favorites = self._build(Favorite, favorites)
         return favorites
 
-    async def get_favourites(self, limit=100, page=0, sub_id=None):
+    def iter_favorites(self, limit=100, page=0, sub_id="", prefetch=1):
+        """Async iterator over all of your favorites, starting at page. The
+        next pages are requested while the current one is being consumed.
+
+        Also mapped to CatApi.iter_favourites()
+
+        Parameters
+        ----------
+
+        limit: :class:`int`
+            Amount of items per page
+
+        page: :class:`int`
+            Which page to start from
+
+        sub_id: :class:`string`
+            Custom content placed when favoriting the image
+
+        prefetch: :class:`int`
+            How many pages to request ahead of the one being consumed
+        """
+
+        async def fetch(page):
+            return await self.get_favorites(limit, page, sub_id)
+
+        return paginate(fetch, page, limit, prefetch)
+
+    def iter_favourites(self, limit=100, page=0, sub_id="", prefetch=1):
+        """Async iterator over all of your favourites.
+
+        Also mapped to CatApi.iter_favorites()
+        """
+
+        return self.iter_favorites(limit, page, sub_id, prefetch)
+
+    async def get_favourites(self, limit=100, page=0, sub_id=""):
         """Gets all of your favourites.
 
         Also mapped to CatApi.favorites()
@@ -212,7 +792,7 @@ class CatApi():
         sub_id: :class:`string`
             Custom content placed when favouriting the image
         """
-        return await self.favorites(limit, page, sub_id)
+        return await self.get_favorites(limit, page, sub_id)
 
     async def get_favorite(self, favorite_id):
         """Get a favorite specified by favorite id
@@ -225,9 +805,9 @@ class CatApi():
         favorite_id: :class:`string`
         """
 
-        url = f"{BASE_URL}/favourites/{favorite_id}"
+        url = f"{self.base_url}/favourites/{favorite_id}"
         favorite = await self.api_get_session(url)
-        favorite = Favorite(**favorite)
+        favorite = self._build(Favorite, favorite)
         return favorite
 
     async def get_favourite(self, favourite_id):
@@ -241,7 +821,7 @@ class CatApi():
         favourite_id: :class:`string`
         """
 
-        return self.get_favorite(favourite_id)
+        return await self.get_favorite(favourite_id)
 
     async def delete_image(self, image_id):
         """Deletes an image specified by the image_id
@@ -253,10 +833,30 @@ class CatApi():
             ID of the image to delete
         """
 
-        url = f"{BASE_URL}/images/{image_id}"
+        url = f"{self.base_url}/images/{image_id}"
         message = await self.api_delete_session(url)
+        if self.cache is not None:
+            self.cache.invalidate(url)
         return message
 
+    async def delete_images(self, image_ids, concurrency=10):
+        """Deletes many images at once.
+
+        Parameters
+        ----------
+
+        image_ids: [:class:`string`]
+            IDs of the images to delete
+
+        concurrency: :class:`int`
+            Maximum number of deletes in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every id to the
+        delete response or to the exception raised while deleting it.
+        """
+
+        return await run_bulk(self.delete_image, image_ids, concurrency)
+
     async def get_image(self, image_id):
         """Gets a specific image by id from the api.
 
@@ -267,9 +867,107 @@ class CatApi():
             ID of the image to get
         """
 
-        url = f"{BASE_URL}/images/{image_id}"
-        image = await self.api_get_session(url)
-        return Image(**image)
+        url = f"{self.base_url}/images/{image_id}"
+        image, stale = await self._get(url, endpoint="images/{id}")
+        return self._build(Image, image, stale)
+
+    async def get_images(self, image_ids, concurrency=10):
+        """Gets many images by id at once.
+
+        Parameters
+        ----------
+
+        image_ids: [:class:`string`]
+            IDs of the images to get
+
+        concurrency: :class:`int`
+            Maximum number of requests in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every id to its
+        :class:`Image` or to the exception raised while getting it.
+        """
+
+        return await run_bulk(self.get_image, image_ids, concurrency)
+
+    async def download(self, image, dest, chunk_size=65536, progress=None,
+                       overwrite=False):
+        """Downloads the file of an image, streaming it to disk a chunk at a
+        time over the shared session.
+
+        An interrupted download leaves dest + ".part" behind, and the next
+        try only asks for the missing bytes. Failed tries are retried
+        according to retry_policy, each one resuming where the last stopped.
+
+        Parameters
+        ----------
+
+        image: :class:`Image` | :class:`string`
+            Image, or url of the file, to download
+
+        dest: :class:`string`
+            Path to save the file at. If it is a directory, the file keeps
+            the name it has in its url.
+
+        chunk_size: :class:`int`
+            Bytes read and written at a time
+
+        progress: :class:`callable`
+            Called as progress(url, received, total) after every chunk.
+            total is None when the server does not say.
+
+        overwrite: :class:`bool`
+            Whether to download the file again when dest already exists.
+            Defaults to False, which returns the existing path right away.
+
+        Returns the path the file was saved at
+        """
+
+        url = image if isinstance(image, str) else image.url
+        if not url:
+            raise ValueError("The image has no url to download")
+
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, posixpath.basename(urlsplit(url).path))
+        if not overwrite and os.path.exists(dest):
+            return dest
+
+        attempt = 0
+        while True:
+            try:
+                with self._traced():
+                    async with self._session_scope() as session:
+                        return await self.fetch_file(session, url, dest,
+                                                     chunk_size, progress)
+            except (HTTPException, DownloadError,
+                    aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                    asyncio.TimeoutError) as error:
+                if not self.retry_policy.should_retry(error, attempt):
+                    raise
+
+                delay = self.retry_policy.delay(
+                    attempt, getattr(error, "retry_after", None))
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def download_many(self, images, directory, concurrency=10,
+                            chunk_size=65536, progress=None, overwrite=False):
+        """Downloads the files of many images into directory, with no more
+        than concurrency downloads in flight at once. Takes the same
+        arguments as CatApi.download().
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every image to the
+        path it was saved at, or to the exception raised while downloading
+        it.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        async def download(image):
+            return await self.download(image, directory, chunk_size,
+                                       progress, overwrite)
+
+        return await run_bulk(download, images, concurrency)
 
     async def search_images(self, **kwargs):
         """search_images may take up to 8 args. By default, this returns a
@@ -302,8 +1000,14 @@ class CatApi():
 
         page: class`int`
             Which page to pull images from. Minimum value of 0
+
+        batch: :class:`bool`
+            Return a :class:`catapi.image_batch.ImageBatch` instead of a
+            list of images. Requires numpy.
         """
 
+        batch = kwargs.pop("batch", False)
+
         params = {
             'breed_id': kwargs.pop("breed_id", ""),
             'category_ids': kwargs.pop("category_ids", ""),
@@ -315,12 +1019,37 @@ class CatApi():
             'page': kwargs.pop("page", 0),
         }
 
-        url = f'{BASE_URL}/images/search'
+        url = f'{self.base_url}/images/search'
 
         images = await self.api_get_session(url, params)
-        images = [Image(**image) for image in images]
+        if batch:
+            return self._image_batch(images)
+
+        images = self._build(Image, images)
         return images
 
+    def iter_images(self, prefetch=1, **kwargs):
+        """Async iterator over every image matching a search. Takes the same
+        keyword arguments as CatApi.search_images(), except that limit
+        defaults to 100 and order defaults to "ASC" so that pages do not
+        overlap.
+
+        Parameters
+        ----------
+
+        prefetch: :class:`int`
+            How many pages to request ahead of the one being consumed
+        """
+
+        kwargs.setdefault("limit", 100)
+        kwargs.setdefault("order", "ASC")
+        first_page = kwargs.pop("page", 0)
+
+        async def fetch(page):
+            return await self.search_images(page=page, **kwargs)
+
+        return paginate(fetch, first_page, kwargs["limit"], prefetch)
+
     async def search_breeds(self, breed=None):
         """Requests breeds from the cat API. If breed is None, it requests all
         breeds by default.
@@ -333,30 +1062,85 @@ class CatApi():
         """
 
         params = {"q": breed}
-        url = f"{BASE_URL}/breeds/search"
-        breeds = await self.api_get_session(url, params)
-        breeds = [Breed.from_dict(breed) for breed in breeds]
+        url = f"{self.base_url}/breeds/search"
+        breeds, stale = await self._get(url, params,
+                                        endpoint="breeds/search")
+        breeds = self._build(Breed, breeds, stale)
         return breeds
 
-    async def upload(self, filepath, sub_id=""):
-        """Uploads a file to thecatapi.com
+    async def upload(self, file, sub_id="", filename=None,
+                     content_type=None):
+        """Uploads a file to thecatapi.com, streaming it rather than reading
+        it into memory first.
+
+        Uploads of paths, bytes and seekable file objects are retried
+        according to retry_policy. A retry after a dropped connection may
+        upload the file twice, if the server had already received it.
 
         Parameters
         ----------
 
-        filepath: :class:`string`
-            Path to the jpg, png, gif, etc to upload
+        file: :class:`string` | :class:`bytes` | file | async iterator
+            Path of the jpg, png, gif, etc to upload, its content, a file
+            object opened in binary mode or an async iterator of bytes
 
         sub_id: :class:`string`
             Custom value you may add to be stored with the file
+
+        filename: :class:`string`
+            Name to upload the file under. Defaults to the name of the path
+            or file object, or "upload"
+
+        content_type: :class:`string`
+            Defaults to a guess from the filename
+
+        Returns the uploaded :class:`Image`
         """
 
+        if not self.api_key:
+            raise AttributeError("You must set api_key to use the API")
+
+        if not isinstance(file, UploadFile):
+            file = UploadFile(file, filename, content_type)
         params = {"sub_id": sub_id}
-        url = f"{BASE_URL}/images/upload"
-        with open(filepath, 'rb') as data:
-            success_status = await self.api_post_session(url, {"file": data},
-                                                         params)
-        return success_status
+        url = f"{self.base_url}/images/upload"
+        headers = {"x-api-key": self.api_key}
+
+        async def request(session):
+            async with file.open() as body:
+                return await self.post(session, url, file.form(body),
+                                       headers, params)
+
+        image = await self._send(request, idempotent=file.reusable,
+                                 method="POST", url=url)
+        return self._build(Image, self.json_loads(image))
+
+    async def upload_many(self, files, sub_id="", concurrency=4):
+        """Uploads many files at once. Takes the same kinds of files as
+        CatApi.upload(), or :class:`catapi.uploads.UploadFile` objects to
+        set their filename or content type.
+
+        Parameters
+        ----------
+
+        files: iterable
+            Files to upload. The same file is only uploaded once.
+
+        sub_id: :class:`string`
+            Custom value stored with every file
+
+        concurrency: :class:`int`
+            Maximum number of uploads in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every file to its
+        uploaded :class:`Image` or to the exception raised while uploading
+        it.
+        """
+
+        async def upload(file):
+            return await self.upload(file, sub_id)
+
+        return await run_bulk(upload, files, concurrency)
 
     async def get_uploads(self, **kwargs):
         """Allows you to get images you have uploaded to thecatapi. Can accept
@@ -396,8 +1180,14 @@ class CatApi():
         sub_id: :class:`string`
             - min length: 0
             - max length: 255
+
+        batch: :class:`bool`
+            Return a :class:`catapi.image_batch.ImageBatch` instead of a
+            list of images. Requires numpy.
         """
 
+        batch = kwargs.pop("batch", False)
+
         params = {
             'breed_ids': kwargs.pop('breed_ids', ''),
             'category_ids': kwargs.pop('category_ids', ''),
@@ -411,11 +1201,34 @@ class CatApi():
             'sub_id': kwargs.pop('sub_id', ''),
         }
 
-        url = f"{BASE_URL}/images/"
+        url = f"{self.base_url}/images/"
         images = await self.api_get_session(url, params)
-        images = [Image(**image) for image in images]
+        if batch:
+            return self._image_batch(images)
+
+        images = self._build(Image, images)
         return images
 
+    def iter_uploads(self, prefetch=1, **kwargs):
+        """Async iterator over every image you have uploaded. Takes the same
+        keyword arguments as CatApi.get_uploads(), except that limit defaults
+        to 100.
+
+        Parameters
+        ----------
+
+        prefetch: :class:`int`
+            How many pages to request ahead of the one being consumed
+        """
+
+        kwargs.setdefault("limit", 100)
+        first_page = kwargs.pop("page", 1)
+
+        async def fetch(page):
+            return await self.get_uploads(page=page, **kwargs)
+
+        return paginate(fetch, first_page, kwargs["limit"], prefetch)
+
     async def delete_vote(self, vote_id):
         """Deletes a particular vote.
 
@@ -426,10 +1239,28 @@ class CatApi():
             The string id of the vote to delete
         """
 
-        url = f"{BASE_URL}/votes/{vote_id}"
+        url = f"{self.base_url}/votes/{vote_id}"
         message = await self.api_delete_session(url)
         return message
 
+    async def delete_votes(self, vote_ids, concurrency=10):
+        """Deletes many votes at once.
+
+        Parameters
+        ----------
+
+        vote_ids: [:class:`string`]
+            The string ids of the votes to delete
+
+        concurrency: :class:`int`
+            Maximum number of deletes in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every id to the
+        delete response or to the exception raised while deleting it.
+        """
+
+        return await run_bulk(self.delete_vote, vote_ids, concurrency)
+
     async def get_vote(self, vote_id):
         """Gets a particular vote.
 
@@ -440,9 +1271,9 @@ class CatApi():
             The string id of the vote to get
         """
 
-        url = f"{BASE_URL}/votes/{vote_id}"
+        url = f"{self.base_url}/votes/{vote_id}"
         vote = await self.api_get_session(url)
-        return Vote(**vote)
+        return self._build(Vote, vote)
 
     async def vote(self, image_id, value, sub_id):
         """
@@ -462,18 +1293,30 @@ class CatApi():
         """
 
         data = {"image_id": image_id, "sub_id": sub_id, "value": value}
-        url = f"{BASE_URL}/votes"
+        url = f"{self.base_url}/votes"
         success_status = await self.api_post_session(url, data, json=True)
+        return self._build(Vote, success_status)
 
-        # if successful, success_status should be able to be a Vote object
-        try:
-            success_status = Vote(**success_status)
-        except TypeError:
-            # Unsuccessful at creating a vote. I will raise errors here in the
-            # future. For now... pass and return the error message.
-            pass
+    async def vote_many(self, votes, concurrency=10):
+        """Casts many votes at once.
 
-        return success_status
+        Parameters
+        ----------
+
+        votes: [(:class:`string`, :class:`int`, :class:`string`)]
+            (image_id, value, sub_id) tuples, as taken by CatApi.vote()
+
+        concurrency: :class:`int`
+            Maximum number of requests in flight at once
+
+        Returns a :class:`catapi.bulk.BulkResult` mapping every tuple to its
+        :class:`Vote` or to the exception raised.
+        """
+
+        async def vote(args):
+            return await self.vote(*args)
+
+        return await run_bulk(vote, votes, concurrency)
 
     async def get_votes(self, limit=100, page=0, sub_id=""):
         """Gets a list of all votes you have created. By default, with no
@@ -493,35 +1336,197 @@ class CatApi():
         """
 
         params = {"limit": limit, "page": page, "sub_id": sub_id}
-        url = f"{BASE_URL}/votes"
+        url = f"{self.base_url}/votes"
         votes = await self.api_get_session(url, params)
-        votes = [Vote(**vote) for vote in votes]
+        votes = self._build(Vote, votes)
         return votes
 
+    def iter_votes(self, limit=100, page=0, sub_id="", prefetch=1):
+        """Async iterator over every vote you have cast, starting at page. The
+        next pages are requested while the current one is being consumed.
+
+        Parameters
+        ----------
+
+        limit: :class:`int`
+            How many votes to have per page
+
+        page: :class:`int`
+            Which page to start from
+
+        sub_id: :class:`string`
+            Custom string stored with votes
+
+        prefetch: :class:`int`
+            How many pages to request ahead of the one being consumed
+        """
+
+        async def fetch(page):
+            return await self.get_votes(limit, page, sub_id)
+
+        return paginate(fetch, page, limit, prefetch)
+
+    async def _send(self, request, idempotent=True, method="GET", url=None,
+                    retry=True):
+        """Runs request(session) over the shared session once the rate
+        limiter allows it, retrying failures according to retry_policy
+        unless retry is False.
+
+        With a breaker, every attempt to send method to url goes through the
+        circuit of its endpoint, and CircuitOpen is raised without retrying
+        once it opens.
+        """
+
+        limiter = self.rate_limiter
+        key = None
+        if self.breaker is not None and url is not None:
+            key = endpoint_name(method, urlsplit(url).path)
+
+        attempt = 0
+        while True:
+            try:
+                with self._traced(), self._circuit(key) as call:
+                    async with self._slot():
+                        await limiter.acquire()
+                        async with self._session_scope() as session:
+                            call.start()
+                            return await request(session)
+            except HTTPException as error:
+                if not retry or not self.retry_policy.should_retry(
+                        error, attempt, idempotent):
+                    raise
+
+                retry_after = error.retry_after
+                if retry_after is not None:
+                    limiter.block(retry_after)
+                delay = self.retry_policy.delay(attempt, retry_after)
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as error:
+                if not retry or not self.retry_policy.should_retry(
+                        error, attempt, idempotent):
+                    raise
+
+                delay = self.retry_policy.delay(attempt)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
     async def api_delete_session(self, url, params=None):
-        """Starts an aiohttp session to send a delete request"""
+        """Sends a delete request over the shared session"""
 
         if not self.api_key:
             raise AttributeError("You must set api_key to use the API")
 
         headers = {"x-api-key": self.api_key}
 
-        async with aiohttp.ClientSession() as session:
+        async def request(session):
             return await self.delete(session, url, headers, params)
 
-    async def api_get_session(self, url, params=None):
-        """Starts an aiohttp client session and returns the result of fetching
-        data.
+        return await self._send(request, method="DELETE", url=url)
+
+    async def api_get_session(self, url, params=None, endpoint=None):
+        """Returns the result of fetching data over the shared session.
 
         If api_key is not set, this will raise an error.
+
+        endpoint names the api endpoint being fetched, such as "images/{id}".
+        Responses from endpoints with a TTL in the cache are cached. With a
+        breaker, the last good response of a named endpoint is returned when
+        its circuit is open or the request fails.
+        """
+
+        result, _ = await self._get(url, params, endpoint)
+        return result
+
+    async def _get(self, url, params=None, endpoint=None):
+        """Does the work of api_get_session, returning the result and whether
+        it is a stale copy served by the breaker.
         """
+
         if not self.api_key:
             raise AttributeError("You must set api_key to use the API")
 
+        cache = self.cache
+        ttl = cache.ttl(endpoint) if cache is not None and endpoint else 0
+        if ttl:
+            key = cache.key(url, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached, False
+
         headers = {"x-api-key": self.api_key}
 
-        async with aiohttp.ClientSession() as session:
-            return await self.fetch(session, url, headers, params)
+        async def request(session):
+            return await self.fetch(session, url, headers, params,
+                                    self.json_loads)
+
+        async def get():
+            catalog = self.catalog
+            if catalog is not None and endpoint in catalog.endpoints:
+                return await self._revalidate(catalog, url, headers, params)
+
+            if self.hedger is not None:
+                return await self.hedger.run(
+                    endpoint_name("GET", urlsplit(url).path),
+                    lambda: self._send(request, url=url))
+
+            return await self._send(request, url=url)
+
+        breaker = self.breaker
+        try:
+            if self.coalescer is not None and _repeatable(url, params):
+                flight = (self.api_key, ResponseCache.key(url, params))
+                result = await self.coalescer.run(flight, get)
+            else:
+                result = await get()
+        except (CircuitOpen, HTTPException, aiohttp.ClientConnectionError,
+                asyncio.TimeoutError) as error:
+            if breaker is None or endpoint is None or not (
+                    isinstance(error, CircuitOpen)
+                    or breaker.is_failure(error)):
+                raise
+
+            stale = breaker.stale(ResponseCache.key(url, params))
+            if stale is None:
+                raise
+            return stale, True
+
+        if breaker is not None and endpoint is not None:
+            breaker.remember(ResponseCache.key(url, params), result)
+
+        if ttl:
+            cache.set(key, result, ttl)
+
+        return result, False
+
+    async def _revalidate(self, catalog, url, headers, params):
+        """Returns the catalog's copy of a response if the server confirms it
+        is current, downloading and storing a new copy otherwise.
+        """
+
+        key = catalog.key(url, params)
+        entry = await catalog.run(catalog.load, key)
+        if entry is not None and catalog.fresh(entry):
+            return self.json_loads(entry.body)
+
+        headers = dict(headers)
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        async def request(session):
+            return await self.fetch_raw(session, url, headers, params)
+
+        status, response_headers, body = await self._send(request, url=url)
+        if status == 304 and entry is not None:
+            await catalog.run(catalog.touch, key)
+            return self.json_loads(entry.body)
+
+        await catalog.run(catalog.store, key, body,
+                          response_headers.get("ETag"),
+                          response_headers.get("Last-Modified"))
+        return self.json_loads(body)
 
     async def api_post_session(self, url, data, params=None, json=False):
         """Uploads data to the url via post.
@@ -540,44 +1545,204 @@ class CatApi():
 
         json: :class:`boolean`
             Whether or not to post the data as json
+
+        Posts are not idempotent, so they are only retried when the server
+        rejected them with a 429. Posts carrying file objects are never
+        retried, as the file is closed once it has been sent. Use
+        :meth:`upload` with an :class:`catapi.uploads.UploadFile` for
+        uploads that can be retried.
         """
 
         if not self.api_key:
             raise AttributeError("You must set api_key to use the API")
 
         headers = {"x-api-key": self.api_key}
+        files = isinstance(data, dict) and any(
+            hasattr(value, "read") for value in data.values())
 
-        async with aiohttp.ClientSession() as session:
-            return await self.post(session, url, data, headers, params, json)
+        async def request(session):
+            return await self.post(session, url, data, headers, params, json,
+                                   self.json_loads, self.json_dumps)
+
+        return await self._send(request, idempotent=False, method="POST",
+                                url=url, retry=not files)
+
+    @classmethod
+    async def raise_for_status(self, response):
+        """Raises :class:`catapi.errors.HTTPException`, or
+        :class:`catapi.errors.RateLimited` for a 429, if the response has an
+        error status.
+        """
+
+        if response.status < 400:
+            return
+
+        body = await response.text()
+        error = RateLimited if response.status == 429 else HTTPException
+        raise error(response.status, body, response.headers)
 
     @classmethod
     async def delete(self, session, url, headers, params):
         """Sends an http delete request to the url"""
         async with session.delete(url, headers=headers, params=params) as html:
+            await self.raise_for_status(html)
             html = await html.text()
 
         return html
 
     @classmethod
-    async def fetch(self, session, url, headers, params=None):
+    async def fetch(self, session, url, headers, params=None, loads=None):
+        """Sends a get request and returns the decoded json response. loads
+        decodes the raw body, and defaults to codec.loads.
+        """
+
         async with session.get(url, headers=headers, params=params) as html:
-            html = await html.json()
+            await self.raise_for_status(html)
+            html = await html.read()
 
+        html = (loads or codec.loads)(html)
+        trace_event("decoded")
         return html
 
     @classmethod
-    async def post(self, session, url, data, headers, params=None, json=False):
+    async def fetch_raw(self, session, url, headers, params=None):
+        """Sends a get request and returns the status, headers and raw body
+        of the response. Unlike fetch(), a 304 Not Modified is returned
+        rather than decoded.
+        """
+
+        async with session.get(url, headers=headers, params=params) as html:
+            await self.raise_for_status(html)
+            return html.status, html.headers, await html.read()
+
+    @classmethod
+    async def fetch_file(self, session, url, path, chunk_size=65536,
+                         progress=None):
+        """Streams the file at url to path, chunk_size bytes at a time.
+
+        The file is written to path + ".part" and only moved to path once
+        complete. If a partial file is already there, only the rest is
+        requested with a Range header. Raises
+        :class:`catapi.errors.DownloadError` if the size does not match what
+        the server announced.
+        """
+
+        loop = asyncio.get_running_loop()
+        part = f"{path}.part"
+        offset = await loop.run_in_executor(None, _part_size, part)
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        async with session.get(url, headers=headers) as response:
+            start, total = _content_range(response.headers)
+            if response.status == 416 and offset:
+                # The partial file already holds every byte, or is corrupt
+                if total == offset:
+                    await loop.run_in_executor(None, os.replace, part, path)
+                    return path
+                await loop.run_in_executor(None, os.remove, part)
+                raise DownloadError(url, offset, total)
+
+            await self.raise_for_status(response)
+            if response.status == 206:
+                if start != offset:
+                    await loop.run_in_executor(None, os.remove, part)
+                    raise DownloadError(url, offset, total)
+            else:
+                # The server sent the whole file
+                offset = 0
+                total = response.content_length
+
+            # Disk access runs in the executor so that many downloads at
+            # once do not hold up the event loop
+            received = offset
+            file = await loop.run_in_executor(None, open, part,
+                                              "ab" if offset else "wb")
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await loop.run_in_executor(None, file.write, chunk)
+                    received += len(chunk)
+                    if progress is not None:
+                        progress(url, received, total)
+            finally:
+                await loop.run_in_executor(None, file.close)
+
+        trace_event("body", received - offset)
+        if total is not None and received != total:
+            raise DownloadError(url, received, total)
+
+        await loop.run_in_executor(None, os.replace, part, path)
+        return path
+
+    @classmethod
+    async def post(self, session, url, data, headers, params=None, json=False,
+                   loads=None, dumps=None):
+        """Sends a post request. With json, data is encoded by dumps and the
+        response decoded by loads, both defaulting to the codec functions.
+        Otherwise data is sent as a form and the response text returned.
+        """
+
         if not json:
             async with session.post(url, headers=headers, params=params,
                                     data=data) as status:
+                await self.raise_for_status(status)
                 status = await status.text()
         else:
-            async with session.post(url, headers=headers, json=data) as status:
-                status = await status.json()
+            headers = dict(headers, **{"Content-Type": "application/json"})
+            data = (dumps or codec.dumps)(data)
+            async with session.post(url, headers=headers,
+                                    data=data) as status:
+                await self.raise_for_status(status)
+                status = (loads or codec.loads)(await status.read())
+                trace_event("decoded")
 
         return status
 
 
+class _Unguarded():
+    """Stands in for a breaker call when there is no breaker"""
+
+    __slots__ = ()
+
+    def start(self):
+        pass
+
+
+_UNGUARDED = _Unguarded()
+
+
+def _repeatable(url, params):
+    """Whether identical GET requests get the same data, so that requests
+    made at the same time may share one. Random image searches do not.
+    """
+
+    order = params.get("order") if params else None
+    if order is None:
+        # thecatapi orders searches randomly by default
+        return not urlsplit(url).path.endswith("/images/search")
+    return str(order).upper() != "RANDOM"
+
+
+def _part_size(part):
+    """Returns the size of a partial download, 0 if there is none"""
+
+    return os.path.getsize(part) if os.path.exists(part) else 0
+
+
+def _content_range(headers):
+    """Returns the (start, total) of a Content-Range header. Either is None
+    when unknown.
+    """
+
+    value = headers.get("Content-Range", "")
+    if not value.startswith("bytes "):
+        return None, None
+
+    span, _, total = value[len("bytes "):].partition("/")
+    start = span.partition("-")[0]
+    return (int(start) if start.isdigit() else None,
+            int(total) if total.isdigit() else None)
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+
+
+__all__ = ("SingleFlight",)
+
+
+class SingleFlight():
+    """Lets concurrent identical calls share one execution.
+
+    The first caller for a key starts the call. Anyone asking for the same
+    key before it finishes waits for that call and receives the same result
+    or exception. Cancelling one waiter does not cancel the shared call.
+
+    Attributes
+    ----------
+
+    executed: :class:`int`
+        Calls that were actually made
+
+    coalesced: :class:`int`
+        Calls that were answered by another caller's call
+    """
+
+    __slots__ = ("executed", "coalesced", "_pending")
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    async def run(self, key, func):
+        """Returns the result of awaiting func(), sharing it with every
+        other caller that passes the same key while it runs.
+        """
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+
+        # Mark the exception as retrieved, in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        """Returns a dict of the coalescing counters"""
+
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._pending),
+        }
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+JSON functions used on the request path. orjson is used when it is
+installed, and the standard library otherwise.
+"""
+
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+__all__ = ("dumps", "loads", "stdlib_dumps", "stdlib_loads")
+
+
+def stdlib_loads(data):
+    """Decodes json from bytes or str with the standard library"""
+
+    return json.loads(data)
+
+
+def stdlib_dumps(obj):
+    """Encodes obj as compact json bytes with the standard library"""
+
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+    loads = orjson.loads
+    dumps = orjson.dumps
+else:
+    loads = stdlib_loads
+    dumps = stdlib_dumps
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+__all__ = ("CatApiException", "CircuitOpen", "DownloadError",
+           "HTTPException", "RateLimited", "parse_retry_after")
+
+
+def parse_retry_after(headers):
+    """Returns the number of seconds a Retry-After header asks to wait, or
+    None if there is no usable header. Both delta-seconds and HTTP-date
+    forms are understood.
+    """
+
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CatApiException(Exception):
+    """Base exception for every error raised by catapi.py"""
+
+
+class HTTPException(CatApiException):
+    """Raised when thecatapi answers with an error status.
+
+    Attributes
+    ----------
+
+    status: :class:`int`
+        HTTP status code of the response
+
+    message: :class:`string`
+        Error message sent by the api, or the raw response body
+
+    headers: :class:`dict`
+        Headers of the response
+    """
+
+    def __init__(self, status, body="", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.message = body
+        try:
+            self.message = json.loads(body).get("message", body)
+        except (AttributeError, TypeError, ValueError):
+            pass
+
+        super().__init__(f"{status}: {self.message}")
+
+    @property
+    def retry_after(self):
+        """Seconds the server asked us to wait before retrying, or None"""
+
+        return parse_retry_after(self.headers)
+
+
+class RateLimited(HTTPException):
+    """Raised when thecatapi answers with 429 Too Many Requests"""
+
+
+class DownloadError(CatApiException):
+    """Raised when a download ends with a different number of bytes than the
+    server announced. The partial file is kept so the download can resume.
+
+    Attributes
+    ----------
+
+    url: :class:`string`
+        Url that was being downloaded
+
+    received: :class:`int`
+        Bytes on disk
+
+    expected: :class:`int`
+        Bytes the server announced
+    """
+
+    def __init__(self, url, received, expected):
+        self.url = url
+        self.received = received
+        self.expected = expected
+        super().__init__(f"{url}: received {received} of {expected} bytes")
+
+
+class CircuitOpen(CatApiException):
+    """Raised instead of sending a request to an endpoint whose circuit
+    breaker is open, because its recent calls failed or were too slow.
+
+    Attributes
+    ----------
+
+    endpoint: :class:`string`
+        Endpoint the request was for, such as "GET /v1/images/{id}"
+
+    retry_in: :class:`float`
+        Seconds until the breaker lets a trial request through
+    """
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(f"{endpoint}: circuit open, retry in "
+                         f"{retry_in:.1f}s")
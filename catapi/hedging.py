@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import time
+
+from .metrics import LatencyHistogram
+
+
+__all__ = ("Hedger",)
+
+
+class _Window():
+    """Latencies of the last size calls to one endpoint, kept as the
+    histogram being filled and the last full one.
+    """
+
+    __slots__ = ("size", "current", "previous")
+
+    def __init__(self, size):
+        self.size = size
+        self.current = LatencyHistogram()
+        self.previous = None
+
+    def record(self, seconds):
+        self.current.record(seconds)
+        if self.current.count >= self.size:
+            self.previous = self.current
+            self.current = LatencyHistogram()
+
+    def percentile(self, percent, min_samples):
+        for histogram in (self.current, self.previous):
+            if histogram is not None and histogram.count >= min_samples:
+                return histogram.percentile(percent)
+        return None
+
+
+class Hedger():
+    """Cuts the tail latency of idempotent calls by hedging: when a call has
+    not answered after a delay, the same call is made a second time, the
+    first of the two to succeed is used and the other is cancelled.
+
+    The delay is either fixed or, by default, the percentile latency seen
+    for the endpoint, so that only the slowest few calls are hedged. Hedges
+    are paid for from a budget that grows by budget for every call, which
+    keeps them to that share of the traffic however slow the server gets.
+
+    Pass hedge=True, or a Hedger, to :class:`catapi.CatApi` to hedge its GET
+    requests.
+
+    Keyword Arguments
+    -----------------
+
+    delay: :class:`float`
+        Seconds to wait before hedging. Defaults to None, which waits for
+        the percentile latency of the endpoint.
+
+    percentile: :class:`float`
+        Percentile of the latencies seen that is used as the delay. Defaults
+        to 95
+
+    min_samples: :class:`int`
+        Calls to an endpoint that must have succeeded before their
+        percentile is trusted. max_delay is used until then. Defaults to 20
+
+    max_delay: :class:`float`
+        Longest delay in seconds. Defaults to 1
+
+    window: :class:`int`
+        Percentiles are taken from about this many of the latest calls to
+        an endpoint. Defaults to 1000
+
+    budget: :class:`float`
+        Largest share of calls that may be hedged, 0-1. Defaults to 0.05
+
+    burst: :class:`float`
+        Hedges that may be saved up for a burst of slow calls. Defaults to
+        10
+
+    Attributes
+    ----------
+
+    calls: :class:`int`
+        Calls made through the hedger
+
+    sent: :class:`int`
+        Hedges sent
+
+    won: :class:`int`
+        Hedges that answered before the call they hedged
+
+    throttled: :class:`int`
+        Hedges not sent because the budget was spent
+    """
+
+    __slots__ = ("delay", "percentile", "min_samples", "max_delay", "window",
+                 "budget", "burst", "calls", "sent", "won", "throttled",
+                 "_tokens", "_latencies")
+
+    def __init__(self, **kwargs):
+        self.delay = kwargs.pop("delay", None)
+        self.percentile = kwargs.pop("percentile", 95)
+        self.min_samples = kwargs.pop("min_samples", 20)
+        self.max_delay = kwargs.pop("max_delay", 1.0)
+        self.window = kwargs.pop("window", 1000)
+        self.budget = kwargs.pop("budget", 0.05)
+        self.burst = kwargs.pop("burst", 10.0)
+        self.calls = 0
+        self.sent = 0
+        self.won = 0
+        self.throttled = 0
+        self._tokens = 0.0
+        self._latencies = {}
+
+    def delay_for(self, key):
+        """Returns the seconds a call to endpoint key waits before it is
+        hedged.
+        """
+
+        if self.delay is not None:
+            return self.delay
+
+        window = self._latencies.get(key)
+        delay = window.percentile(self.percentile, self.min_samples) \
+            if window is not None else None
+        return self.max_delay if delay is None else min(delay,
+                                                        self.max_delay)
+
+    def _record(self, key, seconds):
+        window = self._latencies.get(key)
+        if window is None:
+            window = self._latencies[key] = _Window(self.window)
+        window.record(seconds)
+
+    async def run(self, key, func):
+        """Returns the result of awaiting func(), calling it a second time if
+        the first call to endpoint key is slow. Raises the exception of the
+        first call if both fail.
+        """
+
+        self.calls += 1
+        self._tokens = min(self.burst, self._tokens + self.budget)
+
+        started = time.monotonic()
+        tasks = [_start(func)]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay_for(key))
+            if not done:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.sent += 1
+                    hedge_started = time.monotonic()
+                    tasks.append(_start(func))
+                else:
+                    self.throttled += 1
+
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        if task is tasks[0]:
+                            self._record(key, time.monotonic() - started)
+                        else:
+                            self.won += 1
+                            self._record(key,
+                                         time.monotonic() - hedge_started)
+                        return task.result()
+
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self):
+        """Returns a dict of the hedging counters and the current delay of
+        every endpoint.
+        """
+
+        return {
+            "calls": self.calls,
+            "sent": self.sent,
+            "won": self.won,
+            "throttled": self.throttled,
+            "delays": {key: self.delay_for(key) for key in self._latencies},
+        }
+
+
+def _start(func):
+    task = asyncio.ensure_future(func())
+    task.add_done_callback(_retrieve)
+    return task
+
+
+def _retrieve(task):
+    # Marks the exception of a loser as retrieved
+    if not task.cancelled():
+        task.exception()
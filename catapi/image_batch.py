@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("ImageBatch requires numpy. Install it with "
+                      "pip install catapi.py[numpy]") from None
+
+from .models.breed import Breed
+from .models.category import Category
+from .models.image import Image
+
+
+__all__ = ("ImageBatch",)
+
+
+# Marks a row without a breed in ImageBatch.breed_codes
+NO_BREED = -1
+
+
+def _objects(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _timestamp(value):
+    # numpy does not accept the trailing Z of thecatapi's UTC timestamps
+    return value[:-1] if value and value.endswith("Z") else value or "NaT"
+
+
+class _Interner():
+    """Gives each distinct id a small integer code, keeping the first model
+    seen for it.
+    """
+
+    __slots__ = ("codes", "models", "model")
+
+    def __init__(self, model):
+        self.model = model
+        self.models = []
+        self.codes = {}
+
+    def code(self, data):
+        is_dict = isinstance(data, dict)
+        key = data.get("id") if is_dict else data.id
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.models)
+            self.models.append(self.model.from_dict(data) if is_dict
+                               else data)
+        return code
+
+
+class ImageBatch():
+    """Images stored column by column in NumPy arrays rather than as one
+    :class:`catapi.models.image.Image` per image. Breeds and categories are
+    interned, so each distinct breed is kept once however many images show
+    it. Rows are turned back into Image objects only when they are read.
+
+    Pass batch=True to :meth:`catapi.CatApi.search_images` or
+    :meth:`catapi.CatApi.get_uploads` to get one instead of a list.
+
+    .. code:: python
+
+        batches = [await api.search_images(limit=100, page=page,
+                                           order="ASC", batch=True)
+                   for page in range(100)]
+        images = ImageBatch.concat(batches)
+        wide = images.filter(aspect=(1.5, None), min_width=800)
+        siamese = images.filter(breed_id="siam")
+        first = wide[0]     # an Image
+
+    Parameters
+    ----------
+
+    images: [:class:`dict` | :class:`catapi.models.image.Image`]
+        Images as decoded from the api, or Image objects
+
+    Attributes
+    ----------
+
+    ids: :class:`numpy.ndarray`
+        Image ids
+
+    urls: :class:`numpy.ndarray`
+        Image urls
+
+    widths: :class:`numpy.ndarray`
+        int32 widths in pixels, 0 when unknown
+
+    heights: :class:`numpy.ndarray`
+        int32 heights in pixels, 0 when unknown
+
+    created_at: :class:`numpy.ndarray`
+        datetime64[ms] upload times in UTC, NaT when unknown
+
+    sub_ids: :class:`numpy.ndarray`
+        Custom strings stored with the images
+
+    original_filenames: :class:`numpy.ndarray`
+        Original filenames of uploads
+
+    breed_codes: :class:`numpy.ndarray`
+        int16 index into breeds for every row, -1 for no breed
+
+    breeds: [:class:`catapi.models.breed.Breed`]
+        Each distinct breed, in order of first appearance
+
+    category_codes: :class:`numpy.ndarray`
+        int16 indexes into categories for every row, one after another
+
+    category_offsets: :class:`numpy.ndarray`
+        Where the category codes of each row start in category_codes. The
+        codes of row i are category_codes[offsets[i]:offsets[i + 1]].
+
+    categories: [:class:`catapi.models.category.Category`]
+        Each distinct category, in order of first appearance
+    """
+
+    __slots__ = ("ids", "urls", "widths", "heights", "created_at", "sub_ids",
+                 "original_filenames", "breed_codes", "breeds",
+                 "category_codes", "category_offsets", "categories")
+
+    def __init__(self, images=()):
+        images = [image if isinstance(image, dict) else image.as_dict()
+                  for image in images]
+        breeds = _Interner(Breed)
+        categories = _Interner(Category)
+
+        breed_codes = []
+        category_codes = []
+        category_offsets = [0]
+        for image in images:
+            breed = image.get("breed")
+            if not breed and image.get("breeds"):
+                breed = image["breeds"][0]
+            breed_codes.append(breeds.code(breed) if breed else NO_BREED)
+
+            for category in image.get("categories") or ():
+                category_codes.append(categories.code(category))
+            category_offsets.append(len(category_codes))
+
+        self.ids = _objects([image.get("id") for image in images])
+        self.urls = _objects([image.get("url") for image in images])
+        self.widths = np.array([image.get("width") or 0 for image in images],
+                               dtype=np.int32)
+        self.heights = np.array([image.get("height") or 0
+                                 for image in images], dtype=np.int32)
+        self.created_at = np.array([_timestamp(image.get("created_at"))
+                                    for image in images],
+                                   dtype="datetime64[ms]")
+        self.sub_ids = _objects([image.get("sub_id") for image in images])
+        self.original_filenames = _objects([image.get("original_filename")
+                                            for image in images])
+        self.breed_codes = np.array(breed_codes, dtype=np.int16)
+        self.breeds = breeds.models
+        self.category_codes = np.array(category_codes, dtype=np.int16)
+        self.category_offsets = np.array(category_offsets, dtype=np.int32)
+        self.categories = categories.models
+
+    @classmethod
+    def concat(cls, batches):
+        """Returns a single ImageBatch holding the rows of every batch in
+        order. Breeds and categories are interned again across batches.
+        """
+
+        batches = list(batches)
+        combined = cls()
+        if not batches:
+            return combined
+
+        for column in ("ids", "urls", "widths", "heights", "created_at",
+                       "sub_ids", "original_filenames"):
+            setattr(combined, column, np.concatenate(
+                [getattr(batch, column) for batch in batches]))
+
+        breeds = _Interner(Breed)
+        categories = _Interner(Category)
+        breed_codes = []
+        category_codes = []
+        category_offsets = [np.zeros(1, dtype=np.int32)]
+        start = 0
+        for batch in batches:
+            # Maps the codes of this batch to codes in the combined batch
+            recode = np.array([breeds.code(breed) for breed in batch.breeds]
+                              + [NO_BREED], dtype=np.int16)
+            breed_codes.append(recode[batch.breed_codes])
+
+            recode = np.array([categories.code(category)
+                               for category in batch.categories],
+                              dtype=np.int16)
+            category_codes.append(recode[batch.category_codes])
+            category_offsets.append(batch.category_offsets[1:] + start)
+            start += len(batch.category_codes)
+
+        combined.breed_codes = np.concatenate(breed_codes)
+        combined.breeds = breeds.models
+        combined.category_codes = np.concatenate(category_codes)
+        combined.category_offsets = np.concatenate(category_offsets)
+        combined.categories = categories.models
+        return combined
+
+    def _take(self, rows):
+        subset = self.__class__.__new__(self.__class__)
+        for column in ("ids", "urls", "widths", "heights", "created_at",
+                       "sub_ids", "original_filenames", "breed_codes"):
+            setattr(subset, column, getattr(self, column)[rows])
+        subset.breeds = self.breeds
+        subset.categories = self.categories
+
+        starts = self.category_offsets[:-1][rows]
+        ends = self.category_offsets[1:][rows]
+        counts = ends - starts
+        subset.category_offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=subset.category_offsets[1:])
+        # Position of every kept code in category_codes
+        positions = (np.arange(counts.sum())
+                     - np.repeat(subset.category_offsets[:-1], counts)
+                     + np.repeat(starts, counts))
+        subset.category_codes = self.category_codes[positions]
+        return subset
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getitem__(self, rows):
+        """batch[3] returns a :class:`catapi.models.image.Image`. A slice,
+        boolean mask or array of row numbers returns a new ImageBatch.
+        """
+
+        if not isinstance(rows, (int, np.integer)):
+            return self._take(np.arange(len(self))[rows])
+
+        if rows < 0:
+            rows += len(self)
+        if not 0 <= rows < len(self):
+            raise IndexError("ImageBatch index out of range")
+
+        code = self.breed_codes[rows]
+        start, end = self.category_offsets[rows:rows + 2]
+        categories = [self.categories[code]
+                      for code in self.category_codes[start:end]]
+        created_at = self.created_at[rows]
+
+        image = Image.from_dict({
+            "id": self.ids[rows],
+            "url": self.urls[rows],
+            "width": int(self.widths[rows]) or None,
+            "height": int(self.heights[rows]) or None,
+            "created_at": None if np.isnat(created_at)
+            else f"{np.datetime_as_string(created_at, unit='ms')}Z",
+            "sub_id": self.sub_ids[rows],
+            "original_filename": self.original_filenames[rows],
+            "categories": categories or None,
+        })
+        image.breed = self.breeds[code] if code != NO_BREED else None
+        return image
+
+    def to_images(self):
+        """Returns every row as a :class:`catapi.models.image.Image`"""
+
+        return list(self)
+
+    @property
+    def aspect_ratios(self):
+        """width / height of every row, NaN when either is unknown"""
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = self.widths / self.heights
+        ratios[(self.widths == 0) | (self.heights == 0)] = np.nan
+        return ratios
+
+    def breed_ids(self):
+        """Returns the breed id of every row, None for no breed"""
+
+        ids = _objects([breed.id for breed in self.breeds] + [None])
+        return ids[self.breed_codes]
+
+    def _breed_code(self, breed_id):
+        for code, breed in enumerate(self.breeds):
+            if breed.id == breed_id:
+                return code
+        # Matches no row
+        return len(self.breeds)
+
+    def mask(self, **conditions):
+        """Returns a boolean array marking the rows meeting every condition.
+
+        Keyword Arguments
+        -----------------
+
+        min_width, max_width, min_height, max_height: :class:`int`
+            Inclusive size bounds in pixels
+
+        aspect: :class:`tuple`
+            Inclusive (low, high) bounds on width / height. Either may be
+            None for no bound.
+
+        breed_id: :class:`string` | [:class:`string`]
+            Breed id, or list of breed ids, the image must show. None keeps
+            only images without a breed.
+
+        category_id: :class:`int`
+            Category the image must belong to
+        """
+
+        mask = np.ones(len(self), dtype=bool)
+        for bound, column, compare in (
+                ("min_width", self.widths, np.greater_equal),
+                ("max_width", self.widths, np.less_equal),
+                ("min_height", self.heights, np.greater_equal),
+                ("max_height", self.heights, np.less_equal)):
+            if bound in conditions:
+                mask &= compare(column, conditions.pop(bound))
+
+        if "aspect" in conditions:
+            low, high = conditions.pop("aspect")
+            ratios = self.aspect_ratios
+            mask &= ~np.isnan(ratios)
+            if low is not None:
+                mask &= ratios >= low
+            if high is not None:
+                mask &= ratios <= high
+
+        if "breed_id" in conditions:
+            breed_id = conditions.pop("breed_id")
+            if breed_id is None:
+                mask &= self.breed_codes == NO_BREED
+            elif isinstance(breed_id, str):
+                mask &= self.breed_codes == self._breed_code(breed_id)
+            else:
+                codes = [self._breed_code(breed) for breed in breed_id]
+                mask &= np.isin(self.breed_codes, codes)
+
+        if "category_id" in conditions:
+            category_id = conditions.pop("category_id")
+            codes = [code for code, category in enumerate(self.categories)
+                     if category.id == category_id]
+            # The row every category code belongs to
+            rows = np.repeat(np.arange(len(self)),
+                             np.diff(self.category_offsets))
+            found = np.zeros(len(self), dtype=bool)
+            found[rows[np.isin(self.category_codes, codes)]] = True
+            mask &= found
+
+        if conditions:
+            raise TypeError(f"Unknown conditions: {', '.join(conditions)}")
+
+        return mask
+
+    def filter(self, **conditions):
+        """Returns an ImageBatch of the rows meeting every condition. Takes
+        the same conditions as mask().
+        """
+
+        return self[self.mask(**conditions)]
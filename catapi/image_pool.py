@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+from collections import deque
+
+
+__all__ = ("RandomImagePool",)
+
+
+# search_images() arguments an image buffer can be keyed by
+FILTERS = ("breed_id", "category_ids", "mime_types", "size")
+
+
+class RandomImagePool():
+    """Keeps random images fetched ahead of time, so that handing one out is
+    a pop from memory instead of a request.
+
+    Images are buffered separately for every combination of filters. When a
+    buffer falls below low_water, a background request for batch_size
+    random images tops it up. Only a caller finding its buffer empty has to
+    wait, and callers waiting on the same filters share one request.
+
+    .. code:: python
+
+        pool = RandomImagePool(api)
+        await pool.fill(breed_id="beng")        # optional
+        image = await pool.get()
+        bengal = await pool.get(breed_id="beng")
+
+    Parameters
+    ----------
+
+    api: :class:`catapi.CatApi`
+        Client the images are requested through
+
+    Keyword Arguments
+    -----------------
+
+    batch_size: :class:`int`
+        Images requested at once, 1-100. Defaults to 100
+
+    low_water: :class:`int`
+        A refill starts once a buffer holds fewer images than this. Defaults
+        to 20
+
+    Attributes
+    ----------
+
+    served: :class:`int`
+        Images handed out straight from a buffer
+
+    waited: :class:`int`
+        Images whose caller had to wait for a request
+
+    fetches: :class:`int`
+        Requests made to fill buffers
+    """
+
+    __slots__ = ("api", "batch_size", "low_water", "served", "waited",
+                 "fetches", "_buffers", "_refills")
+
+    def __init__(self, api, **kwargs):
+        self.api = api
+        self.batch_size = kwargs.pop("batch_size", 100)
+        self.low_water = kwargs.pop("low_water", 20)
+        self.served = 0
+        self.waited = 0
+        self.fetches = 0
+        self._buffers = {}
+        self._refills = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    @staticmethod
+    def key(**filters):
+        """Returns the buffer key for a set of filters"""
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise TypeError(f"Unknown filters: {', '.join(sorted(unknown))}")
+
+        key = []
+        for name in FILTERS:
+            value = filters.get(name)
+            if isinstance(value, (list, tuple, set)):
+                value = ",".join(str(item) for item in value)
+            key.append(value or "")
+        return tuple(key)
+
+    def __len__(self):
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def available(self, **filters):
+        """Returns how many images are buffered for filters"""
+
+        return len(self._buffers.get(self.key(**filters), ()))
+
+    async def get(self, **filters):
+        """Returns a random :class:`catapi.models.image.Image` matching
+        filters, waiting for a request only if none is buffered. Returns None
+        if the api has no image matching filters.
+
+        Takes the breed_id, category_ids, mime_types and size arguments of
+        :meth:`catapi.CatApi.search_images`.
+        """
+
+        key = self.key(**filters)
+        buffer = self._buffers.setdefault(key, deque())
+        if buffer:
+            self.served += 1
+        else:
+            self.waited += 1
+            while not buffer:
+                if not await asyncio.shield(self._refill(key)):
+                    return None
+
+        image = buffer.popleft()
+        if len(buffer) < self.low_water:
+            self._refill(key)
+        return image
+
+    def get_nowait(self, **filters):
+        """Returns a buffered image matching filters, or None if there is
+        none yet. Starts a refill either way if the buffer is running low.
+        """
+
+        key = self.key(**filters)
+        buffer = self._buffers.setdefault(key, deque())
+        image = None
+        if buffer:
+            image = buffer.popleft()
+            self.served += 1
+        if len(buffer) < self.low_water:
+            self._refill(key)
+        return image
+
+    async def fill(self, **filters):
+        """Requests images for filters now, unless enough are buffered.
+        Returns the number of images buffered for filters.
+        """
+
+        key = self.key(**filters)
+        buffer = self._buffers.setdefault(key, deque())
+        if len(buffer) < self.low_water:
+            await asyncio.shield(self._refill(key))
+        return len(buffer)
+
+    def _refill(self, key):
+        """Returns the task topping up the buffer for key, starting one if
+        none is running.
+        """
+
+        task = self._refills.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._refills[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def _fetch(self, key):
+        """Adds a batch of random images to the buffer for key. Returns the
+        number of images added.
+        """
+
+        filters = {name: value for name, value in zip(FILTERS, key) if value}
+        filters.setdefault("size", "med")
+        self.fetches += 1
+        images = await self.api.search_images(limit=self.batch_size,
+                                              order="RANDOM", **filters)
+
+        buffer = self._buffers.setdefault(key, deque())
+        # Random pages can repeat images, which are only buffered once
+        buffered = {image.id for image in buffer}
+        added = 0
+        for image in images:
+            if image.id not in buffered:
+                buffered.add(image.id)
+                buffer.append(image)
+                added += 1
+        return added
+
+    def _finish(self, key, task):
+        if self._refills.get(key) is task:
+            del self._refills[key]
+
+        # Mark the exception as retrieved. A failed background refill is
+        # tried again the next time an image is taken.
+        if not task.cancelled():
+            task.exception()
+
+    async def close(self):
+        """Cancels any refills in progress and empties every buffer"""
+
+        tasks = list(self._refills.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._buffers.clear()
+
+    def stats(self):
+        """Returns a dict of the pool counters"""
+
+        return {
+            "buffered": len(self),
+            "served": self.served,
+            "waited": self.waited,
+            "fetches": self.fetches,
+            "refilling": len(self._refills),
+        }
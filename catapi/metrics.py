@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+Request tracing and latency histograms for :class:`catapi.CatApi`.
+
+Every HTTP request made by a CatApi is followed by a :class:`RequestTrace`,
+which collects the time of each step of the request from aiohttp's
+:class:`aiohttp.TraceConfig` signals and the client's own timers. Finished
+traces are added up per endpoint by :class:`Metrics`, kept as
+CatApi.metrics.
+
+.. code:: python
+
+    api = CatApi(api_key="...")
+    await api.search_images(limit=10)
+    stats = api.stats()
+    stats["endpoints"]["GET /v1/images/search"]["latency"]["p99"]
+
+    def log(event, trace):
+        if event == "end":
+            print(trace.endpoint, trace.durations())
+
+    api.metrics.add_listener(log)
+"""
+
+
+import asyncio
+import contextvars
+import time
+from collections import defaultdict
+
+
+__all__ = ("LatencyHistogram", "Metrics", "RequestTrace", "trace_event")
+
+
+# The trace of the request being made by the running task
+_CURRENT = contextvars.ContextVar("catapi_trace", default=None)
+
+# Path segments followed by an id, which endpoint names replace with {id}
+COLLECTIONS = frozenset(("images", "favourites", "votes", "files"))
+
+# Path segments that follow a collection without being an id
+ROUTES = frozenset(("search", "upload", ""))
+
+# (phase, first event, last event) of RequestTrace.durations()
+PHASES = (
+    ("queue", "queued", "request_start"),
+    ("pool", "connection_queued_start", "connection_queued_end"),
+    ("dns", "dns_start", "dns_end"),
+    ("connect", "connect_start", "connect_end"),
+    ("first_byte", "request_start", "headers"),
+    ("body", "headers", "body"),
+    ("decode", "body", "decoded"),
+    ("total", "queued", "end"),
+)
+
+# Percentiles reported by LatencyHistogram.summary()
+PERCENTILES = (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9))
+
+# Bits of precision kept by LatencyHistogram. 5 bits keeps every value to
+# within 1/32 (about 3%) of what was recorded.
+PRECISION = 5
+
+
+def trace_event(name, received=0):
+    """Marks event name on the trace of the request being made, if any,
+    adding received to the bytes it received.
+    """
+
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.bytes_received += received
+        trace.mark(name)
+
+
+def endpoint(method, path):
+    """Returns the name of the endpoint a request went to, with ids in its
+    path replaced by {id}: "GET /v1/images/{id}".
+    """
+
+    segments = path.split("/")
+    for index in range(1, len(segments)):
+        if segments[index - 1] in COLLECTIONS and \
+                segments[index] not in ROUTES:
+            segments[index] = "{id}"
+    return f"{method} {'/'.join(segments)}"
+
+
+class LatencyHistogram():
+    """Counts durations in buckets whose width grows with the value, in the
+    manner of an HDR histogram. Any duration from a microsecond to hours is
+    kept to within about 3%, in a few hundred buckets at most, so recording
+    is cheap and memory stays flat however many values are recorded.
+
+    Attributes
+    ----------
+
+    count: :class:`int`
+        Values recorded
+
+    total: :class:`float`
+        Sum of the values recorded, in seconds
+
+    min: :class:`float`
+        Smallest value recorded, in seconds
+
+    max: :class:`float`
+        Largest value recorded, in seconds
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = defaultdict(int)
+
+    @staticmethod
+    def _index(micros):
+        shift = micros.bit_length() - PRECISION
+        if shift <= 0:
+            return micros
+        return (shift << (PRECISION - 1)) + (micros >> shift)
+
+    @staticmethod
+    def _value(index):
+        """Returns the middle of bucket index, in microseconds"""
+
+        if index < 1 << PRECISION:
+            return index
+        shift = (index >> (PRECISION - 1)) - 1
+        low = (index - (shift << (PRECISION - 1))) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, seconds):
+        """Adds a duration in seconds"""
+
+        seconds = max(seconds, 0.0)
+        self._buckets[self._index(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """Returns the duration in seconds that percent of the values are at
+        or below. Returns None if nothing was recorded.
+        """
+
+        if not self.count:
+            return None
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                value = self._value(index) / 1e6
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    @property
+    def mean(self):
+        """Average duration in seconds, or None if nothing was recorded"""
+
+        return self.total / self.count if self.count else None
+
+    def summary(self):
+        """Returns a dict of the count, mean, min, max and p50, p90, p99 and
+        p999 of the durations, in seconds.
+        """
+
+        summary = {"count": self.count, "mean": self.mean, "min": self.min,
+                   "max": self.max}
+        for name, percent in PERCENTILES:
+            summary[name] = self.percentile(percent)
+        return summary
+
+
+class RequestTrace():
+    """The time of each step of one HTTP request.
+
+    events holds (name, time.monotonic()) pairs in the order they happened.
+    The events are queued (the request was asked for), request_start (it
+    passed the rate limiter and is being sent), connection_queued_start and
+    connection_queued_end (it waited for a free connection), dns_start and
+    dns_end, connect_start and connect_end (a new connection was opened,
+    TLS handshake included), headers (the response began), body (the body
+    was read), decoded (the json was decoded) and end. Steps that were not
+    needed, such as dns for a reused connection, have no events.
+
+    Attributes
+    ----------
+
+    endpoint: :class:`string`
+        Method and path of the request, with ids replaced by {id}. None if
+        the request was never sent.
+
+    status: :class:`int`
+        Status of the response, None if there was none
+
+    error: :class:`string`
+        Name of the exception the request failed with, or None
+
+    bytes_sent: :class:`int`
+        Size of the request body
+
+    bytes_received: :class:`int`
+        Size of the response body
+
+    events: [(:class:`string`, :class:`float`)]
+        Steps of the request and when they happened
+    """
+
+    __slots__ = ("endpoint", "status", "error", "bytes_sent",
+                 "bytes_received", "events", "_metrics", "_token")
+
+    def __init__(self, metrics=None):
+        self.endpoint = None
+        self.status = None
+        self.error = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.events = []
+        self._metrics = metrics
+        self._token = None
+        self.mark("queued")
+
+    def mark(self, name):
+        """Records that step name happened now"""
+
+        self.events.append((name, time.monotonic()))
+        metrics = self._metrics
+        if metrics is not None and metrics.listeners:
+            metrics._emit(name, self)
+
+    def durations(self):
+        """Returns a dict of how many seconds each phase of the request took:
+        queue, pool, dns, connect, first_byte, body, decode and total.
+        Phases the request did not go through are left out.
+        """
+
+        times = dict(self.events)
+        durations = {}
+        for phase, first, last in PHASES:
+            if first in times and last in times:
+                durations[phase] = times[last] - times[first]
+        return durations
+
+
+class _Counters():
+    """Latency and byte counters of one endpoint"""
+
+    __slots__ = ("latency", "errors", "cancelled", "bytes_sent",
+                 "bytes_received")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.cancelled = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def summary(self):
+        return {
+            "requests": self.latency.count,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.summary(),
+        }
+
+
+class Metrics():
+    """Adds up the traces of requests per endpoint and per phase, and the
+    time spent turning responses into models.
+
+    Several clients may share one Metrics, by passing it to each of them as
+    metrics.
+
+    Attributes
+    ----------
+
+    listeners: [:class:`callable`]
+        Called as listener(event, trace) for every event of every request
+        as it happens. Model construction is reported as a "model" event
+        with a trace whose endpoint is the name of the model class.
+        Listeners must not block.
+    """
+
+    __slots__ = ("listeners", "_endpoints", "_phases", "_models")
+
+    def __init__(self):
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        """Forgets everything recorded so far"""
+
+        self._endpoints = defaultdict(_Counters)
+        self._phases = defaultdict(LatencyHistogram)
+        self._models = defaultdict(LatencyHistogram)
+
+    def add_listener(self, listener):
+        """Adds a callable to be called as listener(event, trace)"""
+
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Removes a listener added with add_listener()"""
+
+        self.listeners.remove(listener)
+
+    def _emit(self, event, trace):
+        for listener in tuple(self.listeners):
+            listener(event, trace)
+
+    def start(self):
+        """Starts the trace of a request made by the running task"""
+
+        trace = RequestTrace(self)
+        trace._token = _CURRENT.set(trace)
+        return trace
+
+    def finish(self, trace, error=None):
+        """Ends a trace returned by start() and adds it to the counters.
+
+        Requests cancelled by their caller, such as the loser of a hedged
+        call, are only counted as cancelled. They are not errors, and their
+        cut short latency is left out of the histograms.
+        """
+
+        _CURRENT.reset(trace._token)
+        if error is not None:
+            trace.error = type(error).__name__
+        trace.mark("end")
+
+        counters = self._endpoints[trace.endpoint or "unsent"]
+        counters.bytes_sent += trace.bytes_sent
+        counters.bytes_received += trace.bytes_received
+        if isinstance(error, asyncio.CancelledError):
+            counters.cancelled += 1
+            return
+        if trace.error is not None:
+            counters.errors += 1
+        for phase, seconds in trace.durations().items():
+            if phase == "total":
+                counters.latency.record(seconds)
+            else:
+                self._phases[phase].record(seconds)
+
+    def record_model(self, name, seconds):
+        """Adds the time taken to build model name from a response"""
+
+        self._models[name].record(seconds)
+        if self.listeners:
+            now = time.monotonic()
+            trace = RequestTrace()
+            trace.endpoint = name
+            trace.events = [("queued", now - seconds), ("model", now)]
+            self._emit("model", trace)
+
+    def stats(self):
+        """Returns a snapshot of every counter as a dict of plain values.
+
+        requests, errors, cancelled, bytes_sent and bytes_received are
+        totals, where requests counts the requests that were not cancelled.
+        endpoints
+        holds the same counters and a latency summary (see
+        :meth:`LatencyHistogram.summary`) for each endpoint, phases a
+        summary of each phase of a request, and models a summary of the time
+        spent building each model class.
+        """
+
+        endpoints = {name: counters.summary()
+                     for name, counters in self._endpoints.items()}
+        return {
+            "requests": sum(item["requests"] for item in endpoints.values()),
+            "errors": sum(item["errors"] for item in endpoints.values()),
+            "cancelled": sum(item["cancelled"]
+                             for item in endpoints.values()),
+            "bytes_sent": sum(item["bytes_sent"]
+                              for item in endpoints.values()),
+            "bytes_received": sum(item["bytes_received"]
+                                  for item in endpoints.values()),
+            "endpoints": endpoints,
+            "phases": {phase: histogram.summary()
+                       for phase, histogram in self._phases.items()},
+            "models": {name: histogram.summary()
+                       for name, histogram in self._models.items()},
+        }
+
+    @staticmethod
+    def add_signals(trace_config):
+        """Connects the aiohttp signals that fill in traces to trace_config"""
+
+        for signal, handler in (
+                (trace_config.on_request_start, _on_request_start),
+                (trace_config.on_connection_queued_start,
+                 _marker("connection_queued_start")),
+                (trace_config.on_connection_queued_end,
+                 _marker("connection_queued_end")),
+                (trace_config.on_dns_resolvehost_start,
+                 _marker("dns_start")),
+                (trace_config.on_dns_resolvehost_end, _marker("dns_end")),
+                (trace_config.on_connection_create_start,
+                 _marker("connect_start")),
+                (trace_config.on_connection_create_end,
+                 _marker("connect_end")),
+                (trace_config.on_request_chunk_sent, _on_chunk_sent),
+                (trace_config.on_request_end, _on_request_end),
+                (trace_config.on_response_chunk_received,
+                 _on_chunk_received)):
+            signal.append(handler)
+
+
+def _marker(name):
+    async def handler(session, context, params):
+        trace = _CURRENT.get()
+        if trace is not None:
+            trace.mark(name)
+
+    return handler
+
+
+async def _on_request_start(session, context, params):
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.endpoint = endpoint(params.method, params.url.path)
+        trace.mark("request_start")
+
+
+async def _on_request_end(session, context, params):
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.status = params.response.status
+        trace.mark("headers")
+
+
+async def _on_chunk_sent(session, context, params):
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.bytes_sent += len(params.chunk)
+
+
+async def _on_chunk_received(session, context, params):
+    # Sent once, with the whole body, when a response is read
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.bytes_received += len(params.chunk)
+        trace.mark("body")
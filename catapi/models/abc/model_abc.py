@@ -8,24 +8,78 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 
 from abc import ABC
 
+from .. import schema
+from ... import codec
+
 
 class Model(ABC):
     """Abstract class for all database models.
 
     All :ref:`models` extend this abstract base class
 
+    Subclasses list their attributes in __slots__, and may describe how an
+    attribute is found in api json with a :class:`catapi.models.schema.Field`
+    in a schema dict. __init__, from_dict, to_dict and as_dict are generated
+    from these once, when the subclass is created.
+
     Methods
     =======
 
+    from_dict(data)
+        Class method that returns a model created from a dict of api data
+
     to_dict()
         Async method that returns all items in __slots__ formatted as a dict
+
+    as_dict()
+        Returns the items in __slots__ as a dict with nested models turned
+        into dicts too, ready to be encoded. from_dict(model.as_dict())
+        builds an equal model.
+
+    to_json(dumps=None)
+        Returns as_dict() encoded as json bytes
+
+    stale
+        True when the model was built from the last good copy of a
+        response, served because the api was failing
+
+    See :mod:`catapi.serialization` for writing and reading many models at
+    once.
     """
 
     __slots__ = ()
 
+    # Set on models built from a stale copy of a response, see stale_variant
+    stale = False
+
+    def __init_subclass__(cls, generate=True, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Stale variants use the generated code of the model they extend
+        if generate and not cls.__dict__.get("stale"):
+            schema.generate(cls)
+
+    @classmethod
+    def stale_variant(cls):
+        """Returns the subclass of the model whose instances have stale set.
+        :class:`catapi.CatApi` builds responses with it when it serves the
+        last good copy of a response because the api is failing.
+        """
+
+        variant = cls.__dict__.get("_stale_variant")
+        if variant is None:
+            variant = type(cls)(f"Stale{cls.__name__}", (cls,), {
+                "__slots__": (), "__module__": cls.__module__,
+                "__doc__": cls.__doc__, "stale": True})
+            cls._stale_variant = variant
+        return variant
+
     def __init__(self):
         pass
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
     async def to_dict(self):
         attributes = {}
         for attribute in self.__slots__:
@@ -36,3 +90,11 @@ class Model(ABC):
             attributes[attribute] = value
 
         return attributes
+
+    def as_dict(self):
+        return {attribute: getattr(self, attribute)
+                for attribute in self.__slots__
+                if getattr(self, attribute, None) is not None}
+
+    def to_json(self, dumps=None):
+        return (dumps or codec.dumps)(self.as_dict())
@@ -8,6 +8,7 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 
 
 from .abc.model_abc import Model
+from .schema import Field
 
 __all__ = ("Analysis", )
 
@@ -43,11 +44,12 @@ class Analysis(Model):
     __slots__ = ("approved", "created_at", "image_id", "labels",
                  "moderation_labels", "rejected", "vendor")
 
-    def __init__(self, **kwargs):
-        self.approved = kwargs.pop("approved", 0)
-        self.created_at = kwargs.pop("created_at", "")
-        self.image_id = kwargs.pop("image_id", "")
-        self.labels = kwargs.pop("labels", [])
-        self.moderation_labels = kwargs.pop("moderation_labels", [])
-        self.rejected = kwargs.pop("rejected", 0)
-        self.vendor = kwargs.pop("vendor", "")
+    schema = {
+        "approved": Field(default=0),
+        "created_at": Field(default=""),
+        "image_id": Field(default=""),
+        "labels": Field(factory=list),
+        "moderation_labels": Field(factory=list),
+        "rejected": Field(default=0),
+        "vendor": Field(default=""),
+    }
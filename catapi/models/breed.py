@@ -8,6 +8,7 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 
 
 from .abc.model_abc import Model
+from .schema import Field
 
 
 __all__ = ('Breed',)
@@ -120,53 +121,12 @@ class Breed(Model):
                  'short_legs', 'social_needs', 'stranger_friendly',
                  'suppress_tail', 'vocalisation')
 
-    def __init__(self, **kwargs):
-        self.alt_names = kwargs.pop('alt_names', None)
-        self.country_code = kwargs.pop('country_code', None)
-        self.id = kwargs.pop('id', None)
-        self.life_span = kwargs.pop('life_span', None)
-        self.name = kwargs.pop('name', None)
-        self.origin = kwargs.pop('origin', None)
-        self.temperment = kwargs.pop('temperment', None)
-        self.weight_imperial = kwargs.pop('weight_imperial', None)
-        self.weight_metric = kwargs.pop('weight_metric', None)
-        self.wikipedia_url = kwargs.pop('wikipedia_url', None)
-        self.adaptability = kwargs.pop('adaptability', 'None')
-        self.affection_level = kwargs.pop('affection_level', None)
-        self.child_friendly = kwargs.pop('child_friendly', None)
-        self.dog_friendly = kwargs.pop('dog_friendly', None)
-        self.energy_level = kwargs.pop('energy_level', None)
-        self.experimental = kwargs.pop('experimental', None)
-        self.grooming = kwargs.pop('grooming', None)
-        self.hairless = kwargs.pop('hairless', None)
-        self.health_issues = kwargs.pop('health_issues', None)
-        self.hypoallergenic = kwargs.pop('hypoallergenic', None)
-        self.intelligence = kwargs.pop('intelligence', None)
-        self.natural = kwargs.pop('natural', None)
-        self.shedding_level = kwargs.pop('shedding_level', None)
-        self.rare = kwargs.pop('rare', None)
-        self.rex = kwargs.pop('rex', None)
-        self.short_legs = kwargs.pop('short_legs', None)
-        self.social_needs = kwargs.pop('social_needs', None)
-        self.stranger_friendly = kwargs.pop('stranger_friendly', None)
-        self.suppress_tail = kwargs.pop('suppress_tail', None)
-        self.vocalisation = kwargs.pop('vocalisation', None)
-
-    @classmethod
-    def from_dict(self, breed_json):
-        """
-        Returns a Breed object created with the breed_json data.
-
-        breed_json: dict
-        """
-
-        try:
-            weight = breed_json.pop('weight')
-            breed_json['weight_imperial'] = weight['weight_imperial']
-            breed_json['weight_metric'] = weight['weight_metric']
-        except KeyError:
-            pass
-        except TypeError:
-            print(breed_json)
-
-        return Breed(**breed_json)
+    schema = {
+        # thecatapi spells it temperament
+        "temperment": Field(aliases=("temperament",)),
+        # and nests the weights as {"weight": {"imperial": .., "metric": ..}}
+        "weight_imperial": Field(aliases=(("weight", "imperial"),
+                                          ("weight", "weight_imperial"))),
+        "weight_metric": Field(aliases=(("weight", "metric"),
+                                        ("weight", "weight_metric"))),
+    }
@@ -24,7 +24,3 @@ class Category(Model):
     """
 
     __slots__ = ("id", "name")
-
-    def __init__(self, **kwargs):
-        self.id = kwargs.pop("id", None)
-        self.name = kwargs.pop("name", None)
@@ -30,9 +30,3 @@ class Favorite(Model):
     """
 
     __slots__ = ("created_at", "id", "image_id", "sub_id")
-
-    def __init__(self, **kwargs):
-        self.created_at = kwargs.pop("created_at", None)
-        self.id = kwargs.pop("id", None)
-        self.image_id = kwargs.pop("image_id", None)
-        self.sub_id = kwargs.pop("sub_id", None)
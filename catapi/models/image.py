@@ -9,6 +9,7 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 from .abc.model_abc import Model
 from .breed import Breed
 from .category import Category
+from .schema import Field
 
 
 __all__ = ('Image',)
@@ -52,19 +53,8 @@ class Image(Model):
     __slots__ = ("id", "url", "sub_id", "created_at", "original_filename",
                  "width", "height", 'breed', 'categories')
 
-    def __init__(self, **kwargs):
-        self.breed = kwargs.pop('breed', None)
-        self.categories = kwargs.pop('categories', None)
-        self.id = kwargs.pop("id", None)
-        self.url = kwargs.pop("url", None)
-        self.sub_id = kwargs.pop("sub_id", None)
-        self.created_at = kwargs.pop("created_at", None)
-        self.original_filename = kwargs.pop("original_filename", None)
-        self.width = kwargs.pop("width", None)
-        self.height = kwargs.pop("height", None)
-
-        if self.categories:
-            self.categories = [Category(**category) for category in self.categories]
-
-        if self.breed:
-            self.breed = Breed.from_dict(self.breed)
+    schema = {
+        # thecatapi currently sends a list of breeds rather than a single one
+        "breed": Field(aliases=(("breeds", 0),), model=Breed),
+        "categories": Field(model=Category, many=True),
+    }
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+from . import schema
+from .analysis import Analysis
+from .breed import Breed
+from .category import Category
+from .favorite import Favorite
+from .image import Image
+from .vote import Vote
+
+
+__all__ = ("LazyAnalysis", "LazyBreed", "LazyCategory", "LazyFavorite",
+           "LazyImage", "LazyModel", "LazyVote", "lazy_model")
+
+
+class LazyModel():
+    """Mixin turning a model into a thin view over the decoded json dict.
+
+    Construction only stores the dict. Each attribute, including nested
+    models, is built from the dict the first time it is read, following the
+    schema of the model, and then kept in its slot. Nested models are lazy
+    too. Lazy models are instances of the model they extend, so they can be
+    used anywhere the eager model is.
+
+    The dict is shared, not copied, and must not be modified afterwards.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        # Attributes are read through __getattr__ instead of generated code
+        super().__init_subclass__(generate=False, **kwargs)
+        cls._fields = schema.fields(cls)
+
+    def __init__(self, data):
+        self._data = data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
+
+    def __getattr__(self, name):
+        # Only called for slots that have not been filled yet
+        if name not in self._fields:
+            raise AttributeError(f"{type(self).__name__!r} object has no "
+                                 f"attribute {name!r}")
+
+        value = self._load(name)
+        setattr(self, name, value)
+        return value
+
+    def _load(self, name):
+        field = self._fields[name]
+        value = schema.resolve(self._data, name, field)
+        model = field.model
+        if model is None or not value:
+            return value
+
+        from_dict = LAZY_MODELS.get(model, model).from_dict
+        if field.many:
+            return [from_dict(item) if item.__class__ is dict else item
+                    for item in value]
+        return from_dict(value) if value.__class__ is dict else value
+
+
+class LazyAnalysis(LazyModel, Analysis):
+    """:class:`catapi.models.analysis.Analysis` built on first access"""
+
+    __slots__ = ("_data",)
+
+
+class LazyBreed(LazyModel, Breed):
+    """:class:`catapi.models.breed.Breed` built on first access"""
+
+    __slots__ = ("_data",)
+
+
+class LazyCategory(LazyModel, Category):
+    """:class:`catapi.models.category.Category` built on first access"""
+
+    __slots__ = ("_data",)
+
+
+class LazyFavorite(LazyModel, Favorite):
+    """:class:`catapi.models.favorite.Favorite` built on first access"""
+
+    __slots__ = ("_data",)
+
+
+class LazyImage(LazyModel, Image):
+    """:class:`catapi.models.image.Image` whose breed and categories are only
+    built when they are read.
+    """
+
+    __slots__ = ("_data",)
+
+
+class LazyVote(LazyModel, Vote):
+    """:class:`catapi.models.vote.Vote` built on first access"""
+
+    __slots__ = ("_data",)
+
+
+LAZY_MODELS = {
+    Analysis: LazyAnalysis,
+    Breed: LazyBreed,
+    Category: LazyCategory,
+    Favorite: LazyFavorite,
+    Image: LazyImage,
+    Vote: LazyVote,
+}
+
+
+def lazy_model(model):
+    """Returns the lazy variant of an eager model class"""
+
+    return LAZY_MODELS[model]
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+Declarative model fields, and the code generated from them once per model
+class for __init__, from_dict, to_dict and as_dict.
+"""
+
+
+__all__ = ("Field", "fields", "generate", "resolve")
+
+
+# Defaults that can be written into generated code as literals
+LITERALS = (type(None), bool, int, float, str)
+
+
+class Field():
+    """Describes how a single model attribute is read from and written to
+    api json. Attributes without a Field in a model's schema are read from
+    the key of the same name and default to None.
+
+    Parameters
+    ----------
+
+    default:
+        Value used when the key is missing. Defaults to None
+
+    factory: :class:`callable`
+        Called for a fresh default instead of sharing default, for lists
+
+    aliases: (:class:`string` | :class:`tuple`)
+        Other places the value may be found, tried in order whenever the
+        value found so far is None. A string is another key, a tuple is a
+        path of keys and list indexes into nested json such as
+        ("weight", "metric") or ("breeds", 0).
+
+    model: :class:`catapi.models.abc.model_abc.Model`
+        Model a nested dict is turned into
+
+    many: :class:`bool`
+        Whether the value is a list of model
+    """
+
+    __slots__ = ("aliases", "default", "factory", "many", "model")
+
+    def __init__(self, **kwargs):
+        self.aliases = kwargs.pop("aliases", ())
+        self.default = kwargs.pop("default", None)
+        self.factory = kwargs.pop("factory", None)
+        self.many = kwargs.pop("many", False)
+        self.model = kwargs.pop("model", None)
+
+
+def fields(cls):
+    """Returns a dict of the Field of every attribute of a model class, in
+    the order they are declared, base classes first. Attributes come from
+    the __slots__ of the class and of the models it extends, and their
+    Field from the nearest schema describing them.
+    """
+
+    slots = {}
+    schemas = {}
+    for base in reversed(cls.__mro__):
+        # Only models, which all have from_dict, hold fields
+        if not hasattr(base, "from_dict"):
+            continue
+        names = base.__dict__.get("__slots__", ())
+        if isinstance(names, str):
+            names = (names,)
+        # Private slots, such as the _data of lazy models, are not fields
+        slots.update(dict.fromkeys(name for name in names
+                                   if not name.startswith("_")))
+        schemas.update(base.__dict__.get("schema", {}))
+
+    return {name: schemas.get(name) or Field() for name in slots}
+
+
+def _follow(data, path):
+    value = data
+    for step in path:
+        if isinstance(step, int):
+            value = value[step] if value.__class__ is list and \
+                len(value) > step else None
+        else:
+            value = value.get(step) if value.__class__ is dict else None
+    return value
+
+
+def resolve(data, name, field):
+    """Returns the value of attribute name in a dict of api data, following
+    the aliases and default of its field as the generated from_dict does,
+    before any nested model is built.
+    """
+
+    value = data.get(name)
+    for alias in field.aliases:
+        if value is not None:
+            break
+        value = _follow(data, (alias,) if isinstance(alias, str) else alias)
+
+    if value is None and name not in data:
+        if field.factory is not None:
+            return field.factory()
+        return field.default
+    return value
+
+
+def _path(path):
+    lines = []
+    for step in path[1:]:
+        if isinstance(step, int):
+            lines.append(f"value = value[{step}] if value.__class__ is list "
+                         f"and len(value) > {step} else None")
+        else:
+            lines.append(f"value = value.get({step!r}) "
+                         f"if value.__class__ is dict else None")
+    return [f"value = get({path[0]!r})"] + lines
+
+
+def _fill(schema, namespace):
+    """Returns the lines that set every field of an instance named self from
+    a dict named data.
+    """
+
+    lines = ["get = data.get"]
+    for name, field in schema.items():
+        default = repr(field.default)
+        if not isinstance(field.default, LITERALS):
+            default = f"_{name}_default"
+            namespace[default] = field.default
+
+        if not (field.aliases or field.factory or field.model):
+            lines.append(f"self.{name} = get({name!r}, {default})")
+            continue
+
+        lines.append(f"value = get({name!r})")
+        for alias in field.aliases:
+            if isinstance(alias, str):
+                alias = (alias,)
+            lines.append("if value is None:")
+            lines.extend(f"    {line}" for line in _path(alias))
+
+        if field.factory is not None:
+            namespace[f"_{name}_factory"] = field.factory
+            lines.append(f"if value is None and {name!r} not in data:")
+            lines.append(f"    value = _{name}_factory()")
+        elif field.default is not None:
+            lines.append(f"if value is None and {name!r} not in data:")
+            lines.append(f"    value = {default}")
+
+        if field.model is not None:
+            namespace[f"_{name}_model"] = field.model.from_dict
+            if field.many:
+                lines.append("if value:")
+                lines.append(f"    value = [_{name}_model(item) "
+                             f"if item.__class__ is dict else item "
+                             f"for item in value]")
+            else:
+                lines.append("if value.__class__ is dict:")
+                lines.append(f"    value = _{name}_model(value)")
+
+        lines.append(f"self.{name} = value")
+
+    return lines
+
+
+def _to_dict(schema, nested):
+    """Returns the lines of a function building the dict returned by
+    to_dict, or the json ready dict when nested is True.
+    """
+
+    lines = ["result = {}"]
+    for name, field in schema.items():
+        lines.append(f"value = self.{name}")
+        lines.append("if value is not None:")
+        if nested and field.model is not None:
+            if field.many:
+                lines.append(f"    result[{name!r}] = [item.as_dict() "
+                             f"for item in value]")
+            else:
+                lines.append(f"    result[{name!r}] = value.as_dict()")
+        else:
+            lines.append(f"    result[{name!r}] = value")
+
+    lines.append("return result")
+    return lines
+
+
+def _compile(header, lines, namespace, name):
+    source = header + "\n" + "\n".join(f"    {line}" for line in lines)
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+
+
+def generate(cls):
+    """Sets __init__, from_dict, to_dict and as_dict on cls, generated from
+    its fields (see fields()). Methods defined by cls itself are kept.
+    """
+
+    schema = fields(cls)
+    name = cls.__qualname__
+    namespace = {"_new": object.__new__}
+    fill = _fill(schema, namespace)
+
+    _compile("def __init__(self, **data):", fill, namespace,
+             f"{name}.__init__")
+    _compile("def from_dict(cls, data):",
+             ["self = _new(cls)"] + fill + ["return self"], namespace,
+             f"{name}.from_dict")
+    _compile("async def to_dict(self):", _to_dict(schema, False),
+             namespace, f"{name}.to_dict")
+    _compile("def as_dict(self):", _to_dict(schema, True), namespace,
+             f"{name}.as_dict")
+
+    namespace["from_dict"] = classmethod(namespace["from_dict"])
+    for method in ("__init__", "from_dict", "to_dict", "as_dict"):
+        if method not in cls.__dict__:
+            setattr(cls, method, namespace[method])
@@ -7,6 +7,7 @@ view the license at https://github.com/ephreal/catapi/LICENSE.
 """
 
 from .abc.model_abc import Model
+from .schema import Field
 
 __all__ = ("Vote",)
 
@@ -36,11 +37,10 @@ class Vote(Model):
     __slots__ = ("image_id", "value", "sub_id", "created_at", "id",
                  "country_code", )
 
-    def __init__(self, **kwargs):
-        self.image_id = kwargs.pop('image_id', "")
-        self.value = kwargs.pop('value', None)
-
-        self.country_code = kwargs.pop("country_code", "")
-        self.created_at = kwargs.pop("created_at", "")
-        self.id = kwargs.pop("id", "")
-        self.sub_id = kwargs.pop("sub_id", "")
+    schema = {
+        "image_id": Field(default=""),
+        "country_code": Field(default=""),
+        "created_at": Field(default=""),
+        "id": Field(default=""),
+        "sub_id": Field(default=""),
+    }
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+from collections import deque
+
+
+__all__ = ("paginate",)
+
+
+async def paginate(fetch_page, page=0, limit=100, prefetch=1):
+    """Yields every item from consecutive pages until a short page is found.
+
+    While the caller consumes one page, up to ``prefetch`` of the following
+    pages are already being requested. No more pages than that are ever
+    fetched ahead, so a slow consumer holds back the requests.
+
+    Parameters
+    ----------
+
+    fetch_page: :class:`callable`
+        Coroutine function taking a page number and returning a list
+
+    page: :class:`int`
+        Number of the first page to fetch
+
+    limit: :class:`int`
+        Number of items per page. A page with fewer items is the last one.
+
+    prefetch: :class:`int`
+        How many pages to request ahead of the one being consumed
+    """
+
+    pending = deque()
+    next_page = page
+
+    try:
+        while True:
+            while len(pending) <= prefetch:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+
+            items = await pending.popleft()
+            for item in items:
+                yield item
+
+            if len(items) < limit:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
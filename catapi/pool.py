@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import functools
+import inspect
+from collections import Counter
+
+from .cache import ResponseCache
+from .catalog import CatalogCache
+from .catapi import CatApi
+from .metrics import Metrics
+
+
+__all__ = ("CatApiPool",)
+
+
+# Arguments naming a resource that belongs to one key, in the order they are
+# looked up when routing a call, and the kind of resource they name
+OWNED_ARGUMENTS = (("favorite_id", "favorite"), ("favourite_id", "favorite"),
+                   ("vote_id", "vote"), ("sub_id", "sub_id"),
+                   ("image_id", "image"))
+
+# Methods that create a resource, and the kind of resource they return
+CREATES = {"favorite": "favorite", "vote": "vote", "upload": "image"}
+
+# Methods that delete a resource, and the kind of resource they delete
+DELETES = {"delete_favorite": "favorite", "delete_vote": "vote",
+           "delete_image": "image"}
+
+# Methods of CatApi that only call other methods on self. The pool runs them
+# as they are, so every request they make is routed on its own.
+SHARED = ("delete_favourite", "delete_favorites", "delete_favourites",
+          "favourite", "favorite_many", "favourite_many", "get_favourite",
+          "get_favourites", "iter_favourites", "delete_images", "get_images",
+          "delete_votes", "vote_many", "upload_many", "download_many")
+
+# Coroutines of CatApi that work on a session rather than make a call
+LOW_LEVEL = frozenset(("start", "close", "api_delete_session",
+                       "api_get_session", "api_post_session",
+                       "raise_for_status", "delete", "fetch", "fetch_raw",
+                       "fetch_file", "post"))
+
+
+class CatApiPool():
+    """Spreads calls over several api keys, each with its own
+    :class:`catapi.CatApi`.
+
+    Every call goes to the key with the most quota left, as last reported
+    by the X-RateLimit-* headers of its responses, less the calls it already
+    has in flight. Uploads, favorites and votes belong to the key that made
+    them, so the pool remembers who made what: later calls naming one of
+    them (a favorite_id, vote_id or uploaded image_id) go to its owner, and
+    so do writes and listings for a sub_id first used by that key.
+
+    .. code:: python
+
+        async with CatApiPool(["key-1", "key-2", "key-3"]) as pool:
+            images = await pool.search_images(limit=100)
+            favorite_id = await pool.favorite(images[0].id, "user-1")
+            await pool.delete_favorite(favorite_id)     # same key
+            print(pool.stats())
+
+    The pool has every api method of CatApi, with the same arguments. The
+    owners of resources made before the pool was created can be given with
+    :meth:`set_owner`.
+
+    Parameters
+    ----------
+
+    api_keys: [:class:`string`]
+        Keys to spread calls over
+
+    Keyword Arguments
+    -----------------
+
+    Any keyword argument of :class:`catapi.CatApi` except api_key, used for
+    every client. rate_limit and rate_burst apply to each key on its own. A
+    cache, catalog or metrics is shared by all clients, so
+    pool.clients[0].stats() covers the traffic of every key.
+
+    Attributes
+    ----------
+
+    clients: [:class:`catapi.CatApi`]
+        One client per key, in the order the keys were given
+    """
+
+    __slots__ = ("clients", "_clients", "_owners", "_pending", "_calls")
+
+    def __init__(self, api_keys, **kwargs):
+        if "api_key" in kwargs:
+            raise TypeError("CatApiPool takes api_keys, not api_key")
+        if isinstance(api_keys, str):
+            api_keys = [api_keys]
+        api_keys = list(dict.fromkeys(api_keys))
+        if not api_keys:
+            raise ValueError("CatApiPool needs at least one api key")
+
+        if kwargs.get("cache") is True:
+            kwargs["cache"] = ResponseCache()
+        if isinstance(kwargs.get("catalog"), str):
+            kwargs["catalog"] = CatalogCache(kwargs["catalog"])
+        if kwargs.get("metrics", True) is True:
+            kwargs["metrics"] = Metrics()
+
+        self.clients = [CatApi(api_key=api_key, **kwargs)
+                        for api_key in api_keys]
+        self._clients = {client.api_key: client for client in self.clients}
+        self._owners = {}
+        self._pending = Counter()
+        self._calls = Counter()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    @property
+    def api_keys(self):
+        """The keys of the pool"""
+
+        return list(self._clients)
+
+    @property
+    def closed(self):
+        """Whether every client is closed"""
+
+        return all(client.closed for client in self.clients)
+
+    def client(self, api_key):
+        """Returns the :class:`catapi.CatApi` using api_key"""
+
+        return self._clients[api_key]
+
+    def route(self):
+        """Returns the client with the most quota left after its calls in
+        flight. Ties go to the client that has been given the fewest calls.
+        """
+
+        return max(self.clients, key=lambda client: (
+            client.rate_limiter.budget() - self._pending[client.api_key],
+            -self._calls[client.api_key]))
+
+    def owner(self, kind, resource_id):
+        """Returns the key that owns a resource, or None if it is not known.
+
+        kind is "favorite", "vote", "image" or "sub_id".
+        """
+
+        return self._owners.get((kind, str(resource_id)))
+
+    def set_owner(self, kind, resource_id, api_key):
+        """Records that api_key owns a resource, so that calls naming it are
+        sent with that key. kind is "favorite", "vote", "image" or "sub_id".
+        """
+
+        if api_key not in self._clients:
+            raise KeyError(f"{api_key} is not in the pool")
+        self._owners[(kind, str(resource_id))] = api_key
+
+    def _pick(self, arguments):
+        """Returns the client a call with arguments is sent to"""
+
+        for name, kind in OWNED_ARGUMENTS:
+            value = arguments.get(name)
+            if value is None or value == "":
+                continue
+            api_key = self.owner(kind, value)
+            if api_key is not None:
+                return self._clients[api_key]
+
+        return self.route()
+
+    def _record(self, name, api_key, arguments, result):
+        """Updates the owners table after a call made with api_key"""
+
+        kind = DELETES.get(name)
+        if kind is not None:
+            for argument, owned in OWNED_ARGUMENTS:
+                if owned == kind and argument in arguments:
+                    self._owners.pop((kind, str(arguments[argument])), None)
+            return
+
+        kind = CREATES.get(name)
+        if kind is None:
+            return
+
+        if kind == "favorite":
+            # favorite() returns the new id, or the whole message on failure
+            resource_id = None if isinstance(result, dict) else result
+        else:
+            resource_id = getattr(result, "id", None)
+        if resource_id is not None:
+            self._owners[(kind, str(resource_id))] = api_key
+
+        sub_id = arguments.get("sub_id")
+        if sub_id:
+            self._owners.setdefault(("sub_id", str(sub_id)), api_key)
+
+    async def start(self):
+        """Opens the session of every client"""
+
+        await asyncio.gather(*(client.start() for client in self.clients))
+
+    async def close(self, timeout=None):
+        """Closes every client, waiting for their requests in flight as
+        CatApi.close() does.
+        """
+
+        await asyncio.gather(*(client.close(timeout)
+                               for client in self.clients))
+
+    def stats(self):
+        """Returns a dict of counters and quota for every key"""
+
+        stats = {}
+        for api_key, client in self._clients.items():
+            bucket = client.rate_limiter
+            stats[api_key] = {
+                "calls": self._calls[api_key],
+                "in_flight": self._pending[api_key],
+                "limit": bucket.limit,
+                "remaining": bucket.remaining,
+                "budget": bucket.budget(),
+            }
+        return stats
+
+
+def _arguments(signature, args, kwargs):
+    """Binds a call to a CatApi method, returning its arguments as a flat
+    dict. Arguments gathered by **kwargs are included by name.
+    """
+
+    bound = signature.bind(None, *args, **kwargs)
+    arguments = {}
+    for name, value in bound.arguments.items():
+        if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+            arguments.update(value)
+        else:
+            arguments[name] = value
+    return arguments
+
+
+def _route(name, function):
+    """Returns a CatApiPool method sending CatApi.name to the client picked
+    for its arguments.
+    """
+
+    signature = inspect.signature(function)
+
+    if name.startswith("iter_"):
+        def method(self, *args, **kwargs):
+            client = self._pick(_arguments(signature, args, kwargs))
+            self._calls[client.api_key] += 1
+            return getattr(client, name)(*args, **kwargs)
+    else:
+        async def method(self, *args, **kwargs):
+            arguments = _arguments(signature, args, kwargs)
+            client = self._pick(arguments)
+            api_key = client.api_key
+            self._calls[api_key] += 1
+            self._pending[api_key] += 1
+            try:
+                result = await getattr(client, name)(*args, **kwargs)
+            finally:
+                self._pending[api_key] -= 1
+
+            self._record(name, api_key, arguments, result)
+            return result
+
+    functools.update_wrapper(method, function)
+    method.__qualname__ = f"CatApiPool.{name}"
+    return method
+
+
+for _name, _function in vars(CatApi).items():
+    if _name.startswith("_") or hasattr(CatApiPool, _name) \
+            or _name in LOW_LEVEL or not inspect.isfunction(_function):
+        continue
+
+    if _name in SHARED:
+        setattr(CatApiPool, _name, _function)
+    elif inspect.iscoroutinefunction(_function) or _name.startswith("iter_"):
+        setattr(CatApiPool, _name, _route(_name, _function))
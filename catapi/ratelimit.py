@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import math
+import random
+import time
+
+from .errors import HTTPException, RateLimited
+
+
+__all__ = ("RetryPolicy", "TokenBucket", "get_bucket")
+
+
+_BUCKETS = {}
+
+
+def get_bucket(api_key, rate=None, capacity=None):
+    """Returns the :class:`TokenBucket` shared by every client using api_key,
+    creating it if needed. Passing rate or capacity reconfigures an existing
+    bucket.
+    """
+
+    bucket = _BUCKETS.get(api_key)
+    if bucket is None:
+        bucket = _BUCKETS[api_key] = TokenBucket(rate, capacity)
+    elif rate is not None or capacity is not None:
+        bucket.configure(rate, capacity)
+
+    return bucket
+
+
+class TokenBucket():
+    """Paces requests to a steady rate while allowing short bursts.
+
+    Tokens are handed out in the order they are asked for. When the bucket
+    is empty a caller is given a token from the future and waits until it is
+    due, so a backlog drains at exactly rate requests per second.
+
+    Attributes
+    ----------
+
+    rate: :class:`float`
+        Tokens added per second. None disables pacing, but the bucket still
+        honours pauses asked for by the server.
+
+    capacity: :class:`float`
+        Maximum number of tokens that can be saved up for a burst
+
+    limit: :class:`int`
+        Requests allowed per quota window, from the last X-RateLimit-Limit
+        header seen. None until the server sends one.
+
+    remaining: :class:`int`
+        Requests left in the current quota window, from the last
+        X-RateLimit-Remaining header seen
+    """
+
+    __slots__ = ("rate", "capacity", "limit", "remaining", "_tokens",
+                 "_updated", "_blocked_until", "_reset_at")
+
+    def __init__(self, rate=None, capacity=None):
+        self.rate = None
+        self.capacity = 1.0
+        self.configure(rate, capacity)
+        self.limit = None
+        self.remaining = None
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._reset_at = 0.0
+
+    def configure(self, rate=None, capacity=None):
+        """Changes the rate and burst capacity of the bucket"""
+
+        if rate is not None:
+            self.rate = rate
+        if capacity is not None:
+            self.capacity = float(capacity)
+        elif rate is not None:
+            self.capacity = max(float(rate), 1.0)
+
+    def reserve(self):
+        """Takes a token and returns how many seconds the caller has to wait
+        before using it.
+        """
+
+        now = time.monotonic()
+        wait = max(self._blocked_until - now, 0.0)
+        if not self.rate:
+            return wait
+
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._tokens -= 1
+        if self._tokens < 0:
+            wait = max(wait, -self._tokens / self.rate)
+
+        return wait
+
+    async def acquire(self):
+        """Waits until a token is available"""
+
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def block(self, seconds):
+        """Stops handing out tokens for the next seconds"""
+
+        self._blocked_until = max(self._blocked_until,
+                                  time.monotonic() + seconds)
+
+    def update(self, headers):
+        """Adjusts the bucket to the X-RateLimit-* headers of a response. If
+        the quota is spent, the bucket is blocked until it resets.
+        """
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+
+        # Large values are epoch timestamps, small ones are seconds to wait
+        if reset > 1e9:
+            reset -= time.time()
+
+        try:
+            self.limit = int(headers["X-RateLimit-Limit"])
+        except (KeyError, ValueError):
+            pass
+        self.remaining = max(remaining, 0)
+        self._reset_at = time.monotonic() + reset
+
+        if remaining <= 0 and reset > 0:
+            self.block(reset)
+
+    def budget(self):
+        """Returns how many more requests the quota allows right now. This is
+        0 while the bucket is blocked, and infinite when the server has not
+        reported a quota.
+        """
+
+        now = time.monotonic()
+        if self._blocked_until > now:
+            return 0
+        if self.remaining is not None and now < self._reset_at:
+            return self.remaining
+        if self.limit is not None:
+            return self.limit
+        return math.inf
+
+
+class RetryPolicy():
+    """Decides which failed requests are retried and how long to wait.
+
+    Waits grow exponentially with full jitter, so that many clients that
+    failed together do not retry together. A Retry-After header from the
+    server is always honoured.
+
+    Keyword Arguments
+    -----------------
+
+    attempts: :class:`int`
+        Maximum number of retries after the first try. Defaults to 3
+
+    backoff: :class:`float`
+        Base delay in seconds. Defaults to 0.5
+
+    max_backoff: :class:`float`
+        Longest delay in seconds. Defaults to 30
+
+    statuses: [:class:`int`]
+        Statuses that are retried. 429 is retried for every method, the rest
+        only for idempotent ones. Defaults to 429, 500, 502, 503 and 504
+    """
+
+    __slots__ = ("attempts", "backoff", "max_backoff", "statuses")
+
+    def __init__(self, **kwargs):
+        self.attempts = kwargs.pop("attempts", 3)
+        self.backoff = kwargs.pop("backoff", 0.5)
+        self.max_backoff = kwargs.pop("max_backoff", 30.0)
+        self.statuses = frozenset(kwargs.pop("statuses",
+                                             (429, 500, 502, 503, 504)))
+
+    def should_retry(self, error, attempt, idempotent=True):
+        """Whether a request that raised error on try number attempt (0 for
+        the first try) should be made again.
+        """
+
+        if attempt >= self.attempts:
+            return False
+
+        if isinstance(error, HTTPException):
+            if error.status not in self.statuses:
+                return False
+            return idempotent or isinstance(error, RateLimited)
+
+        return idempotent
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt"""
+
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from .metrics import LatencyHistogram
+
+
+__all__ = ("Scheduler", "current_priority", "priority")
+
+
+# Share of the requests each priority class gets when all of them are busy
+WEIGHTS = {"interactive": 16, "normal": 4, "bulk": 1}
+
+# Priority of requests made outside of a priority() block
+DEFAULT_PRIORITY = "normal"
+
+_PRIORITY = contextvars.ContextVar("catapi_priority", default=None)
+
+
+@contextmanager
+def priority(name):
+    """Makes every request started inside the block, including by tasks
+    created inside it, use priority class name.
+
+    .. code:: python
+
+        with priority("bulk"):
+            await api.delete_favorites(ids)
+
+    :meth:`catapi.CatApi.priority` does the same, checking that name is a
+    class of its scheduler.
+    """
+
+    token = _PRIORITY.set(name)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority():
+    """Returns the priority class set by the innermost priority() block, or
+    None outside of one.
+    """
+
+    return _PRIORITY.get()
+
+
+class Scheduler():
+    """Decides which waiting request is sent next when a client has more
+    requests than connections.
+
+    Requests belong to a priority class. At most concurrency requests are
+    sent at once. The rest wait, and free slots are handed out by weighted
+    fair queuing: while every class has requests waiting, each class gets a
+    share of the slots in proportion to its weight. A class that has been
+    idle gets no credit for it, so a burst of interactive calls goes ahead
+    of a long bulk backlog without being able to starve it.
+
+    The requests waiting on the rate limiter hold their slot, so the rate
+    budget is shared out in the same order.
+
+    Keyword Arguments
+    -----------------
+
+    concurrency: :class:`int`
+        Requests sent at once. Defaults to 10, the connections a CatApi
+        opens to one host.
+
+    weights: :class:`dict`
+        Weight of each priority class. Defaults to interactive 16, normal 4
+        and bulk 1.
+
+    default: :class:`string`
+        Class of requests made outside of a priority() block. Defaults to
+        "normal"
+
+    reserved: :class:`int`
+        Slots that only the class with the highest weight may use, so that
+        it never waits for a slow bulk request to finish. Defaults to 1
+    """
+
+    __slots__ = ("concurrency", "weights", "default", "reserved", "urgent",
+                 "_active", "_queues", "_finish", "_virtual", "_waits")
+
+    def __init__(self, **kwargs):
+        self.concurrency = kwargs.pop("concurrency", 10)
+        self.weights = dict(kwargs.pop("weights", WEIGHTS))
+        self.default = kwargs.pop("default", DEFAULT_PRIORITY)
+        self.reserved = kwargs.pop("reserved", 1)
+        if self.default not in self.weights:
+            raise ValueError(f"The default priority {self.default} has no "
+                             "weight")
+        if not 0 <= self.reserved < self.concurrency:
+            raise ValueError("reserved must leave at least one slot for "
+                             "every priority")
+
+        self.urgent = max(self.weights, key=self.weights.get)
+        self._active = 0
+        self._queues = {name: deque() for name in self.weights}
+        self._finish = dict.fromkeys(self.weights, 0.0)
+        self._virtual = 0.0
+        self._waits = {name: LatencyHistogram() for name in self.weights}
+
+    def check(self, name):
+        """Raises ValueError if name is not a priority class"""
+
+        if name not in self.weights:
+            raise ValueError(f"Unknown priority {name}. Use one of "
+                             f"{', '.join(self.weights)}")
+
+    def _limit(self, name):
+        if name == self.urgent:
+            return self.concurrency
+        return self.concurrency - self.reserved
+
+    @asynccontextmanager
+    async def slot(self, name=None):
+        """Waits for a free slot for a request of class name, which defaults
+        to the class set by priority(), and holds it for the block.
+        """
+
+        name = name or _PRIORITY.get() or self.default
+        self.check(name)
+        started = time.monotonic()
+
+        # Finish tag of the request in virtual time
+        tag = max(self._virtual, self._finish[name]) + 1 / self.weights[name]
+        self._finish[name] = tag
+
+        if self._active < self._limit(name) and \
+                not any(self._queues.values()):
+            self._active += 1
+            self._virtual = tag
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._queues[name].append((tag, future))
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                # The slot may have been handed over as the caller went away
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+
+        self._waits[name].record(time.monotonic() - started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hands free slots to the waiting requests with the lowest tags"""
+
+        while self._active < self.concurrency:
+            best = None
+            for name, queue in self._queues.items():
+                while queue and queue[0][1].done():
+                    queue.popleft()
+                if queue and self._active < self._limit(name) and \
+                        (best is None or queue[0][0] < best[0][0]):
+                    best = queue
+
+            if best is None:
+                return
+
+            tag, future = best.popleft()
+            self._active += 1
+            self._virtual = tag
+            future.set_result(None)
+
+    def stats(self):
+        """Returns a dict of the slots in use and, for each priority class,
+        how many requests are waiting and a summary of how long they waited
+        for a slot (see :meth:`catapi.metrics.LatencyHistogram.summary`).
+        """
+
+        return {
+            "active": self._active,
+            "concurrency": self.concurrency,
+            "classes": {
+                name: {
+                    "weight": self.weights[name],
+                    "waiting": sum(not future.done()
+                                   for _, future in self._queues[name]),
+                    "wait": self._waits[name].summary(),
+                }
+                for name in self.weights
+            },
+        }
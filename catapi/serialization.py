@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+
+Streaming writers and readers for many models at once, as newline delimited
+json or msgpack. Everything here is synchronous.
+
+.. code:: python
+
+    with open("images.ndjson", "wb") as file:
+        write_ndjson(images, file)
+
+    with open("images.ndjson", "rb") as file:
+        for image in read_ndjson(file, Image):
+            ...
+"""
+
+
+from . import codec
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+__all__ = ("read_msgpack", "read_ndjson", "write_msgpack", "write_ndjson")
+
+
+# Encoded models joined into a single write
+CHUNK_SIZE = 1024
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("msgpack serialization requires msgpack. Install "
+                          "it with pip install catapi.py[msgpack]")
+
+
+def _write(encoded, file):
+    """Writes an iterable of bytes to file in chunks. Returns how many items
+    were written.
+    """
+
+    count = 0
+    chunk = []
+    for item in encoded:
+        chunk.append(item)
+        if len(chunk) == CHUNK_SIZE:
+            file.write(b"".join(chunk))
+            count += len(chunk)
+            chunk.clear()
+
+    if chunk:
+        file.write(b"".join(chunk))
+        count += len(chunk)
+
+    return count
+
+
+def _ndjson_encoder(dumps):
+    if dumps is None and codec.orjson is not None:
+        option = codec.orjson.OPT_APPEND_NEWLINE
+        orjson_dumps = codec.orjson.dumps
+        return lambda data: orjson_dumps(data, option=option)
+
+    dumps = dumps or codec.dumps
+
+    def encode(data):
+        line = dumps(data)
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        return line + b"\n"
+
+    return encode
+
+
+def write_ndjson(models, file, dumps=None):
+    """Writes models to a binary file, one json object per line. Returns the
+    number of models written.
+
+    Parameters
+    ----------
+
+    models: [:class:`catapi.models.abc.model_abc.Model`]
+        Any iterable of models, consumed as it is written
+
+    file:
+        File object opened for writing bytes
+
+    dumps: :class:`callable`
+        Encodes a dict as json bytes or str. Defaults to orjson when it is
+        installed, json otherwise.
+    """
+
+    encode = _ndjson_encoder(dumps)
+    return _write((encode(model.as_dict()) for model in models), file)
+
+
+def read_ndjson(file, model, loads=None):
+    """Yields a model for every line of newline delimited json in file.
+    Blank lines are skipped.
+
+    Parameters
+    ----------
+
+    file:
+        File object, or any iterable of lines as bytes or str
+
+    model: :class:`catapi.models.abc.model_abc.Model`
+        Model class every line is turned into
+
+    loads: :class:`callable`
+        Decodes a line of json. Defaults to orjson when it is installed,
+        json otherwise.
+    """
+
+    loads = loads or codec.loads
+    from_dict = model.from_dict
+    for line in file:
+        if line.strip():
+            yield from_dict(loads(line))
+
+
+def write_msgpack(models, file):
+    """Writes models to a binary file as a stream of msgpack maps. Returns
+    the number of models written. Requires msgpack.
+
+    Parameters
+    ----------
+
+    models: [:class:`catapi.models.abc.model_abc.Model`]
+        Any iterable of models, consumed as it is written
+
+    file:
+        File object opened for writing bytes
+    """
+
+    _require_msgpack()
+    pack = msgpack.Packer().pack
+    return _write((pack(model.as_dict()) for model in models), file)
+
+
+def read_msgpack(file, model):
+    """Yields a model for every msgpack map in a binary file. Requires
+    msgpack.
+
+    Parameters
+    ----------
+
+    file:
+        File object opened for reading bytes
+
+    model: :class:`catapi.models.abc.model_abc.Model`
+        Model class every map is turned into
+    """
+
+    _require_msgpack()
+    from_dict = model.from_dict
+    for data in msgpack.Unpacker(file, raw=False):
+        yield from_dict(data)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import functools
+import inspect
+import threading
+
+from .catapi import CatApi
+from .scheduler import current_priority, priority
+
+
+__all__ = ("SyncCatApi",)
+
+
+class SyncCatApi():
+    """Blocking interface to :class:`catapi.CatApi`, for code that is not
+    async.
+
+    Every coroutine method of CatApi is available here as a plain method
+    with the same arguments, and every iter_ method as a plain iterator.
+    Calls are handed to a single event loop running in a background thread,
+    which owns the CatApi and its session. Any number of threads can share
+    one SyncCatApi, and their requests run concurrently over the same
+    connection pool.
+
+    .. code:: python
+
+        api = SyncCatApi(api_key="...")
+        images = api.search_images(limit=10)
+        for breed in api.iter_breeds():
+            ...
+        api.close()
+
+    Takes the same keyword arguments as :class:`catapi.CatApi`. Other
+    attributes, such as cache or rate_limiter, are read from the wrapped
+    CatApi. A ``with api.priority(...)`` block applies to the calls the
+    thread makes inside it.
+
+    Attributes
+    ----------
+
+    api: :class:`catapi.CatApi`
+        The wrapped client. Its coroutines must only be run on loop.
+
+    loop: :class:`asyncio.AbstractEventLoop`
+        Event loop running in the background thread
+    """
+
+    __slots__ = ("api", "loop", "_thread")
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name="catapi-loop", daemon=True)
+        self._thread.start()
+        self.api = self._run(self._create(kwargs))
+
+    @staticmethod
+    async def _create(kwargs):
+        return CatApi(**kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __getattr__(self, name):
+        if name in SyncCatApi.__slots__:
+            raise AttributeError(name)
+        return getattr(self.api, name)
+
+    @property
+    def closed(self):
+        """Whether the background loop has been stopped"""
+
+        return self.loop.is_closed()
+
+    def _run(self, coroutine):
+        """Runs coroutine on the background loop and returns its result"""
+
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("SyncCatApi can not be called from its own "
+                               "event loop. Await SyncCatApi.api instead.")
+        if self.loop.is_closed():
+            coroutine.close()
+            raise RuntimeError("SyncCatApi is closed")
+
+        # The loop thread does not see the priority set in this one
+        name = current_priority()
+        if name is not None:
+            coroutine = _prioritized(name, coroutine)
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def _iterate(self, iterator):
+        """Turns an async iterator living on the background loop into a
+        plain iterator.
+        """
+
+        try:
+            while True:
+                try:
+                    yield self._run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self.loop.is_closed():
+                self._run(iterator.aclose())
+
+    def close(self):
+        """Closes the session, then stops the background loop and its
+        thread.
+        """
+
+        if self.loop.is_closed():
+            return
+
+        try:
+            self._run(self.api.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+
+
+async def _prioritized(name, coroutine):
+    with priority(name):
+        return await coroutine
+
+
+def _mirror(name, function):
+    """Returns a blocking SyncCatApi method calling CatApi.name"""
+
+    if name.startswith("iter_"):
+        def method(self, *args, **kwargs):
+            return self._iterate(getattr(self.api, name)(*args, **kwargs))
+    else:
+        def method(self, *args, **kwargs):
+            return self._run(getattr(self.api, name)(*args, **kwargs))
+
+    functools.update_wrapper(method, function)
+    method.__qualname__ = f"SyncCatApi.{name}"
+    return method
+
+
+for _name, _function in vars(CatApi).items():
+    if _name.startswith("_") or hasattr(SyncCatApi, _name) \
+            or not inspect.isfunction(_function):
+        continue
+
+    if inspect.iscoroutinefunction(_function) or _name.startswith("iter_"):
+        setattr(SyncCatApi, _name, _mirror(_name, _function))
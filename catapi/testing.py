@@ -0,0 +1,769 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import hashlib
+import random
+import re
+import string
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from aiohttp import web
+
+
+__all__ = ("MockCatApiServer",)
+
+
+BREED_NAMES = (
+    "Abyssinian", "Aegean", "American Bobtail", "American Curl",
+    "American Shorthair", "American Wirehair", "Arabian Mau",
+    "Australian Mist", "Balinese", "Bambino", "Bengal", "Birman", "Bombay",
+    "British Longhair", "British Shorthair", "Burmese", "Burmilla",
+    "California Spangled", "Chantilly-Tiffany", "Chartreux", "Chausie",
+    "Cheetoh", "Colorpoint Shorthair", "Cornish Rex", "Cymric", "Cyprus",
+    "Devon Rex", "Donskoy", "Dragon Li", "Egyptian Mau", "European Burmese",
+    "Exotic Shorthair", "Havana Brown", "Himalayan", "Japanese Bobtail",
+    "Javanese", "Khao Manee", "Korat", "Kurilian", "LaPerm", "Maine Coon",
+    "Malayan", "Manx", "Munchkin", "Nebelung", "Norwegian Forest Cat",
+    "Ocicat", "Oriental", "Persian", "Pixie-bob", "Ragamuffin", "Ragdoll",
+    "Russian Blue", "Savannah", "Scottish Fold", "Selkirk Rex", "Siamese",
+    "Siberian", "Singapura", "Snowshoe", "Somali", "Sphynx", "Tonkinese",
+    "Toyger", "Turkish Angora", "Turkish Van", "York Chocolate",
+)
+
+CATEGORIES = ((1, "hats"), (2, "space"), (4, "sunglasses"), (5, "boxes"),
+              (7, "ties"), (14, "sinks"), (15, "clothes"))
+
+ORIGINS = (("Egypt", "EG"), ("Greece", "GR"), ("United States", "US"),
+           ("United Kingdom", "GB"), ("Thailand", "TH"), ("Russia", "RU"),
+           ("France", "FR"), ("China", "CN"), ("Japan", "JP"),
+           ("Canada", "CA"), ("Turkey", "TR"), ("Burma", "MM"))
+
+TEMPERAMENTS = ("Active", "Affectionate", "Agile", "Alert", "Calm", "Clever",
+                "Curious", "Demanding", "Easy Going", "Energetic", "Gentle",
+                "Independent", "Intelligent", "Interactive", "Lively",
+                "Loyal", "Playful", "Quiet", "Sensitive", "Social",
+                "Sweet", "Talkative")
+
+RATING_TRAITS = ("adaptability", "affection_level", "child_friendly",
+                 "dog_friendly", "energy_level", "grooming", "health_issues",
+                 "intelligence", "shedding_level", "social_needs",
+                 "stranger_friendly", "vocalisation")
+
+FLAG_TRAITS = ("experimental", "hairless", "hypoallergenic", "natural",
+               "rare", "rex", "short_legs", "suppress_tail")
+
+EPOCH = datetime(2020, 1, 1)
+
+# Routes answered with validators and 304 Not Modified when unchanged
+CATALOG_ROUTES = frozenset(("breeds", "breeds_search", "categories"))
+
+# A single byte range of a Range header: first-last, first- or -suffix
+RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# Image files are served by thecatapi's CDN, which needs no api key
+FILE_ROUTE = "file"
+
+
+class MockCatApiServer():
+    """An in-process stand-in for thecatapi.com built on :mod:`aiohttp.web`.
+
+    Every endpoint used by :class:`catapi.CatApi` is served from seeded,
+    deterministic data so that the client can be tested and benchmarked
+    without network access or an api key.
+
+    .. code:: python
+
+        async with MockCatApiServer(latency=0.01) as server:
+            async with CatApi(api_key="test", base_url=server.url) as api:
+                images = await api.search_images(limit=100)
+
+    Keyword Arguments
+    -----------------
+
+    api_key: :class:`string` | [:class:`string`]
+        If set, requests without this x-api-key header, or one of these
+        keys, are rejected with 401
+
+    breed_count: :class:`int`
+        How many breeds to seed. Defaults to all 67 known breed names
+
+    error_rate: :class:`float`
+        Probability (0-1) that a request is answered with a 500 or 503
+
+    host: :class:`string`
+        Interface to bind to. Defaults to 127.0.0.1
+
+    image_count: :class:`int`
+        How many searchable images to seed. Defaults to 500
+
+    jitter: :class:`float`
+        Maximum random seconds added on top of latency
+
+    latency: :class:`float`
+        Seconds every response is delayed by
+
+    port: :class:`int`
+        Port to bind to. Defaults to 0, which picks a free port
+
+    quota: :class:`int`
+        Requests allowed per quota_window for each api key. Responses carry
+        X-RateLimit-* headers and requests over the quota get a 429.
+        Defaults to None
+
+    quota_window: :class:`float`
+        Length of a quota window in seconds. Defaults to 60
+
+    rate_limit_rate: :class:`float`
+        Probability (0-1) that a request is answered with a 429
+
+    retry_after: :class:`int`
+        Value of the Retry-After header sent with injected 429s
+
+    seed: :class:`int`
+        Seed used for generating data and injecting faults
+
+    tail_latency: :class:`float`
+        Extra seconds taken by the slow requests picked by tail_rate
+
+    tail_rate: :class:`float`
+        Probability (0-1) that a request takes tail_latency longer, to give
+        response times a long tail
+
+    size_scale: :class:`int`
+        Multiplier for the size of breed descriptions, used to grow response
+        bodies without changing their shape
+
+    truncate_rate: :class:`float`
+        Probability (0-1) that an image file transfer is cut off half way
+
+    Image files are served at :meth:`file_url`, with support for Range
+    requests. Their content is made up from the image id, except for
+    uploads, which are served back as they were sent.
+
+    Like on thecatapi, uploads, favourites and votes belong to the api key
+    that made them, and can not be seen or deleted with another key.
+
+    Attributes
+    ----------
+
+    hits: :class:`collections.Counter`
+        Number of requests received, keyed by route name
+
+    last_modified: :class:`datetime.datetime`
+        Last-Modified time (naive, in UTC) of the breed and category
+        catalogs. Catalog responses carry an ETag, and are answered with 304
+        Not Modified when the client already holds them.
+
+    files: :class:`dict`
+        Content of uploaded files, keyed by image id
+
+    owners: :class:`dict`
+        Api key that made each upload, favourite and vote, keyed by its id
+    """
+
+    __slots__ = ("api_key", "error_rate", "host", "jitter", "latency", "port",
+                 "quota", "quota_window", "rate_limit_rate", "retry_after",
+                 "seed", "size_scale", "tail_latency", "tail_rate",
+                 "truncate_rate", "hits", "breeds",
+                 "categories", "images", "uploads", "files", "favourites",
+                 "votes", "owners", "last_modified",
+                 "_random",
+                 "_ids", "_runner", "_windows")
+
+    def __init__(self, **kwargs):
+        self.api_key = kwargs.pop("api_key", None)
+        self.error_rate = kwargs.pop("error_rate", 0.0)
+        self.host = kwargs.pop("host", "127.0.0.1")
+        self.jitter = kwargs.pop("jitter", 0.0)
+        self.latency = kwargs.pop("latency", 0.0)
+        self.port = kwargs.pop("port", 0)
+        self.quota = kwargs.pop("quota", None)
+        self.quota_window = kwargs.pop("quota_window", 60)
+        self.rate_limit_rate = kwargs.pop("rate_limit_rate", 0.0)
+        self.retry_after = kwargs.pop("retry_after", 1)
+        self.seed = kwargs.pop("seed", 0)
+        self.size_scale = kwargs.pop("size_scale", 1)
+        self.tail_latency = kwargs.pop("tail_latency", 1.0)
+        self.tail_rate = kwargs.pop("tail_rate", 0.0)
+        self.truncate_rate = kwargs.pop("truncate_rate", 0.0)
+        breed_count = kwargs.pop("breed_count", len(BREED_NAMES))
+        image_count = kwargs.pop("image_count", 500)
+
+        self.hits = Counter()
+        self._random = random.Random(self.seed)
+        self._ids = 0
+        self._runner = None
+        self._windows = {}
+
+        self.categories = [{"id": id, "name": name}
+                           for id, name in CATEGORIES]
+        self.breeds = []
+        for name in BREED_NAMES[:breed_count]:
+            self.breeds.append(self._make_breed(name))
+        self.images = {}
+        for _ in range(image_count):
+            image = self._make_image()
+            self.images[image["id"]] = image
+
+        self.uploads = {}
+        self.files = {}
+        self.favourites = {}
+        self.votes = {}
+        self.owners = {}
+        self.last_modified = EPOCH
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    @property
+    def url(self):
+        """Base url to hand to :class:`catapi.CatApi` as base_url"""
+
+        return f"http://{self.host}:{self.port}/v1"
+
+    def file_url(self, image_id):
+        """Url the file of the image with image_id is served at, standing in
+        for its url on thecatapi's CDN.
+        """
+
+        image = self.images.get(image_id) or self.uploads.get(image_id)
+        name = image["url"].rsplit("/", 1)[-1] if image else image_id
+        return f"http://{self.host}:{self.port}/files/{name}"
+
+    def file_content(self, image_id):
+        """Returns the bytes served for the image with image_id"""
+
+        if image_id in self.files:
+            return self.files[image_id]
+
+        image = self.images.get(image_id) or self.uploads[image_id]
+        size = max(1024, image["width"] * image["height"] // 40)
+        return hashlib.shake_256(image_id.encode()).digest(size)
+
+    async def start(self):
+        """Starts listening and returns the base url of the server"""
+
+        app = web.Application(middlewares=[self._faults])
+        app.add_routes([
+            web.get("/v1/breeds", self.get_breeds, name="breeds"),
+            web.get("/v1/breeds/search", self.search_breeds,
+                    name="breeds_search"),
+            web.get("/v1/categories", self.get_categories,
+                    name="categories"),
+            web.get("/v1/images/search", self.search_images,
+                    name="images_search"),
+            web.get("/v1/images/", self.get_uploads, name="uploads"),
+            web.post("/v1/images/upload", self.upload, name="upload"),
+            web.get("/v1/images/{id}/analysis", self.get_analysis,
+                    name="analysis"),
+            web.get("/v1/images/{id}", self.get_image, name="image"),
+            web.delete("/v1/images/{id}", self.delete_image,
+                       name="image_delete"),
+            web.get("/v1/favourites", self.get_favourites,
+                    name="favourites"),
+            web.post("/v1/favourites", self.favourite, name="favourite"),
+            web.get("/v1/favourites/{id}", self.get_favourite,
+                    name="favourite_get"),
+            web.delete("/v1/favourites/{id}", self.delete_favourite,
+                       name="favourite_delete"),
+            web.get("/v1/votes", self.get_votes, name="votes"),
+            web.post("/v1/votes", self.vote, name="vote"),
+            web.get("/v1/votes/{id}", self.get_vote, name="vote_get"),
+            web.delete("/v1/votes/{id}", self.delete_vote,
+                       name="vote_delete"),
+            web.get("/files/{name}", self.get_file, name=FILE_ROUTE),
+        ])
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def close(self):
+        """Stops the server"""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self._windows.clear()
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        """Applies latency, authentication and injected failures before
+        handing the request to its route.
+        """
+
+        name = request.match_info.route.name
+        self.hits[name] += 1
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if self.tail_rate and self._random.random() < self.tail_rate:
+            delay += self.tail_latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        if name == FILE_ROUTE:
+            return await handler(request)
+
+        api_key = request.headers.get("x-api-key")
+        if self.api_key and api_key != self.api_key and \
+                (isinstance(self.api_key, str) or api_key not in self.api_key):
+            return web.json_response({"message": "AUTHENTICATION_ERROR"},
+                                     status=401)
+
+        quota_headers = self._spend_quota(api_key)
+        if quota_headers and quota_headers["X-RateLimit-Remaining"] == "-1":
+            quota_headers["X-RateLimit-Remaining"] = "0"
+            quota_headers["Retry-After"] = quota_headers["X-RateLimit-Reset"]
+            return web.json_response({"message": "TOO_MANY_REQUESTS"},
+                                     status=429, headers=quota_headers)
+
+        if self._random.random() < self.rate_limit_rate:
+            return web.json_response(
+                {"message": "TOO_MANY_REQUESTS"}, status=429,
+                headers={"Retry-After": str(self.retry_after)})
+
+        if self._random.random() < self.error_rate:
+            status = self._random.choice((500, 503))
+            return web.json_response({"message": "SERVER_ERROR"},
+                                     status=status)
+
+        response = await handler(request)
+        response.headers.update(quota_headers)
+        if name in CATALOG_ROUTES and response.status == 200:
+            response = self._conditional(request, response)
+
+        return response
+
+    def _conditional(self, request, response):
+        """Adds validators to a catalog response, swapping it for a 304 Not
+        Modified if the request shows the client already has it.
+        """
+
+        etag = '"' + hashlib.md5(response.body).hexdigest() + '"'
+        last_modified = self.last_modified.strftime(
+            "%a, %d %b %Y %H:%M:%S GMT")
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = last_modified
+
+        not_modified = False
+        if "If-None-Match" in request.headers:
+            not_modified = etag in request.headers["If-None-Match"]
+        elif "If-Modified-Since" in request.headers:
+            try:
+                since = parsedate_to_datetime(
+                    request.headers["If-Modified-Since"])
+                not_modified = since.replace(tzinfo=None) \
+                    >= self.last_modified
+            except (TypeError, ValueError):
+                pass
+
+        if not not_modified:
+            return response
+
+        headers = {name: value for name, value in response.headers.items()
+                   if name not in ("Content-Type", "Content-Length")}
+        return web.Response(status=304, headers=headers)
+
+    def _spend_quota(self, api_key):
+        """Counts a request against the quota of api_key and returns the
+        rate limit headers to send. Remaining is -1 once the quota is
+        exceeded.
+        """
+
+        if not self.quota:
+            return {}
+
+        now = time.monotonic()
+        window = self._windows.get(api_key)
+        if window is None or now >= window[0]:
+            window = self._windows[api_key] = [now + self.quota_window, 0]
+
+        window[1] += 1
+        remaining = max(self.quota - window[1], -1)
+        return {
+            "X-RateLimit-Limit": str(self.quota),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": f"{window[0] - now:.3f}",
+        }
+
+    def _next_id(self, length=9):
+        self._ids += 1
+        chars = string.ascii_letters + string.digits
+        suffix = "".join(self._random.choice(chars)
+                         for _ in range(length - 3))
+        return f"{self._ids:03d}{suffix}"[:length]
+
+    def _timestamp(self):
+        moment = EPOCH + timedelta(seconds=self._ids * 3600)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    def _make_breed(self, name):
+        taken = {breed["id"] for breed in self.breeds}
+        words = name.lower().replace("-", " ").split()
+        breed_id = "".join(words)[:4]
+        if breed_id in taken:
+            breed_id = (words[0][0] + words[-1])[:4]
+        while breed_id in taken:
+            breed_id = breed_id[:3] + str(self._random.randint(0, 9))
+
+        origin, country_code = self._random.choice(ORIGINS)
+        temperament = self._random.sample(TEMPERAMENTS, 5)
+        low = self._random.randint(2, 5)
+        description = (f"The {name} is a {temperament[0].lower()} cat "
+                       f"originating in {origin}. ") * 4 * self.size_scale
+
+        breed = {
+            "id": breed_id,
+            "name": name,
+            "alt_names": "",
+            "origin": origin,
+            "country_code": country_code,
+            "country_codes": country_code,
+            "temperament": ", ".join(temperament),
+            "description": description,
+            "life_span": f"{low + 10} - {low + 15}",
+            "weight": {"imperial": f"{low * 2} - {low * 2 + 5}",
+                       "metric": f"{low} - {low + 3}"},
+            "wikipedia_url": "https://en.wikipedia.org/wiki/"
+                             + name.replace(" ", "_"),
+        }
+        if self._random.random() < 0.3:
+            breed["alt_names"] = f"{words[-1].title()} Cat"
+
+        for trait in RATING_TRAITS:
+            breed[trait] = self._random.randint(1, 5)
+        for trait in FLAG_TRAITS:
+            breed[trait] = int(self._random.random() < 0.2)
+
+        return breed
+
+    def _make_image(self, **overrides):
+        image_id = self._next_id()
+        extension = self._random.choice(("jpg", "jpg", "jpg", "png", "gif"))
+        image = {
+            "id": image_id,
+            "url": f"https://cdn2.thecatapi.com/images/{image_id}.{extension}",
+            "width": self._random.randint(200, 2000),
+            "height": self._random.randint(200, 2000),
+            "breeds": [],
+        }
+        if self.breeds and self._random.random() < 0.6:
+            image["breeds"] = [self._random.choice(self.breeds)]
+        if self._random.random() < 0.2:
+            id, name = self._random.choice(CATEGORIES)
+            image["categories"] = [{"id": id, "name": name}]
+
+        image.update(overrides)
+        return image
+
+    def _paginate(self, request, items, default_limit, max_limit=None,
+                  first_page=0):
+        """Returns a json response containing a single page of items along
+        with thecatapi's pagination headers. first_page is the number of the
+        page holding the first items.
+        """
+
+        try:
+            limit = int(request.query.get("limit") or default_limit)
+            page = int(request.query.get("page") or first_page)
+        except ValueError:
+            return web.json_response({"message": "INVALID_PARAMETERS"},
+                                     status=400)
+
+        if max_limit:
+            limit = min(limit, max_limit)
+        limit = max(limit, 1)
+        page = max(page, first_page)
+
+        headers = {
+            "Pagination-Count": str(len(items)),
+            "Pagination-Page": str(page),
+            "Pagination-Limit": str(limit),
+        }
+        start = (page - first_page) * limit
+        return web.json_response(items[start:start + limit], headers=headers)
+
+    def _not_found(self):
+        return web.json_response({"message": "NOT_FOUND"}, status=404)
+
+    async def get_breeds(self, request):
+        return self._paginate(request, self.breeds, len(self.breeds))
+
+    async def search_breeds(self, request):
+        query = request.query.get("q", "").lower()
+        breeds = [breed for breed in self.breeds
+                  if query in breed["name"].lower()]
+        return web.json_response(breeds)
+
+    async def get_categories(self, request):
+        return self._paginate(request, self.categories, len(self.categories))
+
+    async def search_images(self, request):
+        query = request.query
+        images = list(self.images.values())
+
+        breed_ids = set(filter(None, query.get("breed_id", "").split(",")))
+        if breed_ids:
+            images = [image for image in images
+                      if image["breeds"]
+                      and image["breeds"][0]["id"] in breed_ids]
+
+        category_ids = set(filter(None,
+                                  query.get("category_ids", "").split(",")))
+        if category_ids:
+            images = [image for image in images
+                      if {str(category["id"]) for category
+                          in image.get("categories", [])} & category_ids]
+
+        mime_types = set(filter(None, query.get("mime_types", "").split(",")))
+        if mime_types:
+            images = [image for image in images
+                      if image["url"].rsplit(".", 1)[-1] in mime_types]
+
+        order = query.get("order", "RANDOM").upper()
+        if order == "DESC":
+            images.reverse()
+        elif order == "RANDOM":
+            images = random.Random(self.seed + sum(self.hits.values())) \
+                .sample(images, len(images))
+
+        return self._paginate(request, images, 1, max_limit=100)
+
+    async def get_uploads(self, request):
+        uploads = [image for image in self.uploads.values()
+                   if self._visible(request, image["id"])]
+        if request.query.get("order", "DESC").upper() == "DESC":
+            uploads.reverse()
+
+        sub_id = request.query.get("sub_id")
+        if sub_id:
+            uploads = [image for image in uploads
+                       if image["sub_id"] == sub_id]
+
+        return self._paginate(request, uploads, 1, max_limit=100,
+                              first_page=1)
+
+    async def upload(self, request):
+        form = await request.post()
+        upload = form.get("file")
+        if not isinstance(upload, web.FileField):
+            return web.json_response({"message": "NO_FILE"}, status=400)
+
+        content = upload.file.read()
+        image = self._make_image(
+            sub_id=request.query.get("sub_id") or None,
+            created_at=self._timestamp(),
+            original_filename=upload.filename,
+            breeds=[],
+        )
+        image.pop("categories", None)
+        self.uploads[image["id"]] = image
+        self.files[image["id"]] = content
+        self.owners[image["id"]] = request.headers.get("x-api-key")
+
+        response = dict(image, pending=0, approved=1, size=len(content))
+        del response["breeds"]
+        return web.json_response(response, status=201)
+
+    async def get_analysis(self, request):
+        image_id = request.match_info["id"]
+        if image_id not in self.images and image_id not in self.uploads:
+            return self._not_found()
+
+        analysis = {
+            "image_id": image_id,
+            "labels": [{"Name": "Cat", "Confidence": 99.3},
+                       {"Name": "Pet", "Confidence": 99.3},
+                       {"Name": "Mammal", "Confidence": 98.1}],
+            "moderation_labels": [],
+            "vendor": "AWS Rekognition",
+            "approved": 1,
+            "rejected": 0,
+            "created_at": "2020-01-01T00:00:00.000Z",
+        }
+        return web.json_response([analysis])
+
+    async def get_image(self, request):
+        image_id = request.match_info["id"]
+        image = self.images.get(image_id) or self.uploads.get(image_id)
+        if image is None:
+            return self._not_found()
+
+        return web.json_response(image)
+
+    async def get_file(self, request):
+        image_id = request.match_info["name"].rsplit(".", 1)[0]
+        if image_id not in self.images and image_id not in self.uploads:
+            return web.Response(status=404)
+
+        content = self.file_content(image_id)
+        start = _range_start(request.headers.get("Range", ""), len(content))
+        if start is None:
+            return web.Response(status=416, headers={
+                "Content-Range": f"bytes */{len(content)}"})
+
+        headers = {"Accept-Ranges": "bytes", "Content-Type": "image/jpeg"}
+        if start:
+            headers["Content-Range"] = \
+                f"bytes {start}-{len(content) - 1}/{len(content)}"
+        response = web.StreamResponse(status=206 if start else 200,
+                                      headers=headers)
+        response.content_length = len(content) - start
+        await response.prepare(request)
+
+        body = content[start:]
+        if self._random.random() < self.truncate_rate:
+            await response.write(body[:len(body) // 2])
+            request.transport.close()
+            return response
+
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+    async def delete_image(self, request):
+        image_id = request.match_info["id"]
+        if not self._visible(request, image_id) or \
+                self.uploads.pop(image_id, None) is None:
+            return self._not_found()
+
+        return web.Response(status=204)
+
+    def _visible(self, request, id):
+        """Whether the resource with id belongs to the key of request"""
+
+        owner = self.owners.get(str(id))
+        return owner is None or owner == request.headers.get("x-api-key")
+
+    def _find(self, request, items):
+        """Returns the item named by the id in the path of request, or None
+        if there is none or it belongs to another key.
+        """
+
+        id = request.match_info["id"]
+        return items.get(id) if self._visible(request, id) else None
+
+    def _owned(self, request, items):
+        sub_id = request.query.get("sub_id")
+        items = [item for item in items.values()
+                 if self._visible(request, item["id"])]
+        if sub_id:
+            items = [item for item in items if item["sub_id"] == sub_id]
+
+        return items
+
+    async def get_favourites(self, request):
+        favourites = self._owned(request, self.favourites)
+        return self._paginate(request, favourites, 100, max_limit=100)
+
+    async def favourite(self, request):
+        data = await request.json()
+        if not data.get("image_id"):
+            return web.json_response({"message": "INVALID_DATA"}, status=400)
+
+        self._ids += 1
+        favourite = {
+            "id": self._ids,
+            "image_id": data["image_id"],
+            "sub_id": data.get("sub_id"),
+            "created_at": self._timestamp(),
+        }
+        self.favourites[str(favourite["id"])] = favourite
+        self.owners[str(favourite["id"])] = request.headers.get("x-api-key")
+        return web.json_response({"message": "SUCCESS",
+                                  "id": favourite["id"]})
+
+    async def get_favourite(self, request):
+        favourite = self._find(request, self.favourites)
+        if favourite is None:
+            return self._not_found()
+
+        return web.json_response(favourite)
+
+    async def delete_favourite(self, request):
+        if self._find(request, self.favourites) is None:
+            return self._not_found()
+
+        del self.favourites[request.match_info["id"]]
+
+        return web.json_response({"message": "SUCCESS"})
+
+    async def get_votes(self, request):
+        votes = self._owned(request, self.votes)
+        return self._paginate(request, votes, 100, max_limit=100)
+
+    async def vote(self, request):
+        data = await request.json()
+        if not data.get("image_id") or data.get("value") is None:
+            return web.json_response({"message": "INVALID_DATA"}, status=400)
+
+        self._ids += 1
+        vote = {
+            "id": self._ids,
+            "image_id": data["image_id"],
+            "sub_id": data.get("sub_id"),
+            "value": data["value"],
+            "country_code": "US",
+            "created_at": self._timestamp(),
+        }
+        self.votes[str(vote["id"])] = vote
+        self.owners[str(vote["id"])] = request.headers.get("x-api-key")
+        response = dict(vote, message="SUCCESS")
+        del response["created_at"]
+        return web.json_response(response, status=201)
+
+    async def get_vote(self, request):
+        vote = self._find(request, self.votes)
+        if vote is None:
+            return self._not_found()
+
+        return web.json_response(vote)
+
+    async def delete_vote(self, request):
+        if self._find(request, self.votes) is None:
+            return self._not_found()
+
+        del self.votes[request.match_info["id"]]
+
+        return web.json_response({"message": "SUCCESS"})
+
+
+def _range_start(header, size):
+    """Returns the offset a Range header asks a file of size bytes to be
+    sent from, which is 0 for a missing or malformed header, or None when
+    the range can not be satisfied. Only the start of a range is honoured.
+    """
+
+    match = RANGE.match(header.strip())
+    if match is None:
+        return 0
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+    elif last:
+        # A suffix range asks for the last bytes of the file
+        if not int(last):
+            return None
+        start = max(size - int(last), 0)
+    else:
+        return 0
+
+    return start if start < size else None
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+
+import asyncio
+import mimetypes
+import os
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+
+__all__ = ("UploadFile",)
+
+
+# Bytes read from a file object at a time
+CHUNK_SIZE = 65536
+
+
+class UploadFile():
+    """A file to upload, from a path, bytes, a file object or an async
+    iterator of bytes.
+
+    Nothing is read up front. Paths are opened and file objects read in a
+    thread pool, a chunk at a time, while the request is being sent, so
+    large files are never held in memory whole.
+
+    Parameters
+    ----------
+
+    source: :class:`string` | :class:`bytes` | file | async iterator
+        What to upload
+
+    filename: :class:`string`
+        Name sent with the file. Defaults to the name of the path or file
+        object, or "upload"
+
+    content_type: :class:`string`
+        Defaults to a guess from filename
+    """
+
+    __slots__ = ("source", "filename", "content_type", "_start", "_used")
+
+    def __init__(self, source, filename=None, content_type=None):
+        if isinstance(source, os.PathLike):
+            source = os.fspath(source)
+        self.source = source
+        self.filename = filename or self._name(source)
+        self.content_type = content_type or \
+            mimetypes.guess_type(self.filename)[0] or \
+            "application/octet-stream"
+        self._start = None
+        self._used = False
+
+    @staticmethod
+    def _name(source):
+        name = source if isinstance(source, str) \
+            else getattr(source, "name", None)
+        if isinstance(name, str):
+            return os.path.basename(name)
+        return "upload"
+
+    @property
+    def reusable(self):
+        """Whether the file can be sent again, for a retry"""
+
+        if isinstance(self.source, (str, bytes, bytearray, memoryview)):
+            return True
+        return hasattr(self.source, "read") and hasattr(self.source, "seek")
+
+    @asynccontextmanager
+    async def open(self):
+        """Yields the body to send on one try, rewinding file objects to
+        where they were first found.
+        """
+
+        loop = asyncio.get_running_loop()
+        source = self.source
+        if isinstance(source, str):
+            file = await loop.run_in_executor(None, open, source, "rb")
+            try:
+                yield file
+            finally:
+                file.close()
+            return
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            yield bytes(source)
+            return
+
+        if hasattr(source, "read"):
+            if hasattr(source, "seek"):
+                if self._start is None:
+                    self._start = await loop.run_in_executor(None,
+                                                             source.tell)
+                else:
+                    await loop.run_in_executor(None, source.seek,
+                                               self._start)
+            elif self._used:
+                raise RuntimeError("The file object can only be read once")
+
+            self._used = True
+            yield self._chunks(source)
+            return
+
+        if self._used:
+            raise RuntimeError("The async iterator can only be read once")
+        self._used = True
+        yield source
+
+    @staticmethod
+    async def _chunks(file):
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, file.read, CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def form(self, body):
+        """Returns the multipart form sending body as the file field"""
+
+        form = aiohttp.FormData()
+        form.add_field("file", body, filename=self.filename,
+                       content_type=self.content_type)
+        return form
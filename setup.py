@@ -22,6 +22,11 @@ setup(
       install_requires=[
             'aiohttp',
       ],
+      extras_require={
+            'msgpack': ['msgpack'],
+            'numpy': ['numpy'],
+            'orjson': ['orjson'],
+      },
       project_urls={
         "Docs:", "https://catapipy.readthedocs.io/",
       },
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import time
+
+from catapi import catapi
+from catapi.breaker import CircuitBreaker
+from catapi.errors import CircuitOpen, HTTPException
+from catapi.models.image import Image
+from catapi.ratelimit import RetryPolicy
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestCircuitBreaker(async_capable.AsyncTestCase):
+    def _fail(self, breaker, key, error=None, times=1):
+        for _ in range(times):
+            with self.assertRaises(type(error or HTTPException(503))):
+                with breaker.call(key):
+                    raise error or HTTPException(503)
+
+    def _succeed(self, breaker, key, times=1):
+        for _ in range(times):
+            with breaker.call(key):
+                pass
+
+    def test_error_rate(self):
+        """
+        Verifies that a circuit opens once enough of its calls fail, and
+        that other endpoints are not affected.
+        """
+
+        breaker = CircuitBreaker(window=10, min_calls=4, error_rate=0.5)
+        self._succeed(breaker, "a", 2)
+        self._fail(breaker, "a")
+        self.assertEqual(breaker.state("a"), "closed")
+        self._fail(breaker, "a")
+        self.assertEqual(breaker.state("a"), "open")
+
+        with self.assertRaises(CircuitOpen) as raised:
+            self._succeed(breaker, "a")
+        self.assertEqual(raised.exception.endpoint, "a")
+        self.assertGreater(raised.exception.retry_in, 0)
+        self._succeed(breaker, "b")
+        self.assertEqual((breaker.opened, breaker.rejected), (1, 1))
+
+    def test_answers_are_not_failures(self):
+        """
+        Verifies that client errors, rate limits and cancelled calls do not
+        open a circuit.
+        """
+
+        breaker = CircuitBreaker(window=4, min_calls=4)
+        self._fail(breaker, "a", HTTPException(404), 2)
+        self._fail(breaker, "a", HTTPException(429), 2)
+        self._fail(breaker, "a", asyncio.CancelledError(), 4)
+        self._fail(breaker, "a", asyncio.TimeoutError())
+        self.assertEqual(breaker.state("a"), "closed")
+        self.assertEqual(breaker.stats()["circuits"]["a"]["error_rate"],
+                         0.25)
+
+    def test_slow_calls(self):
+        """
+        Verifies that a circuit opens once enough calls are slow, timed from
+        the last start() of the handle.
+        """
+
+        breaker = CircuitBreaker(window=2, min_calls=2, slow_call=0.01,
+                                 slow_rate=1)
+        for _ in range(2):
+            with breaker.call("a") as call:
+                time.sleep(0.02)
+                call.start()
+        self.assertEqual(breaker.state("a"), "closed")
+
+        for _ in range(2):
+            with breaker.call("a"):
+                time.sleep(0.02)
+        self.assertEqual(breaker.state("a"), "open")
+
+    def test_half_open(self):
+        """
+        Verifies that an open circuit lets one trial call through at a time
+        once open_for has passed, reopens if a trial fails and closes after
+        enough trials succeed.
+        """
+
+        breaker = CircuitBreaker(window=2, min_calls=2, open_for=0.02,
+                                 trials=2)
+        self._fail(breaker, "a", times=2)
+        time.sleep(0.03)
+        self.assertEqual(breaker.state("a"), "half_open")
+        self._fail(breaker, "a")
+        self.assertEqual(breaker.state("a"), "open")
+
+        time.sleep(0.03)
+        with breaker.call("a"):
+            with self.assertRaises(CircuitOpen):
+                self._succeed(breaker, "a")
+        self.assertEqual(breaker.state("a"), "half_open")
+        self._succeed(breaker, "a")
+        self.assertEqual(breaker.state("a"), "closed")
+        self.assertEqual(breaker.opened, 2)
+
+    def test_stale(self):
+        """
+        Verifies that only the latest max_stale responses are kept.
+        """
+
+        breaker = CircuitBreaker(max_stale=2)
+        breaker.remember("a", [1])
+        breaker.remember("b", [2])
+        self.assertEqual(breaker.stale("a"), [1])
+        breaker.remember("c", [3])
+        self.assertIsNone(breaker.stale("b"))
+        self.assertEqual(breaker.stale("a"), [1])
+        self.assertEqual(breaker.served_stale, 2)
+
+    def test_stale_variant(self):
+        """
+        Verifies that stale variants of a model are marked and built by the
+        same code.
+        """
+
+        data = {"id": "abc", "url": "https://cdn/abc.jpg"}
+        image = Image.stale_variant().from_dict(data)
+        self.assertTrue(image.stale)
+        self.assertIsInstance(image, Image)
+        self.assertEqual(image.as_dict(), Image.from_dict(data).as_dict())
+        self.assertFalse(Image.from_dict(data).stale)
+        self.assertIs(Image.stale_variant(), type(image))
+
+
+class TestBreakerRequests(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(seed=1)
+        self.run_coro(self.server.start())
+        self.breaker = CircuitBreaker(window=4, min_calls=4, open_for=60)
+        self.api = catapi.CatApi(api_key="breaker", base_url=self.server.url,
+                                 breaker=self.breaker,
+                                 retry_policy=RetryPolicy(attempts=0))
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_fails_fast(self):
+        """
+        Verifies that requests to a failing endpoint fail at once once its
+        circuit opens, and that the other endpoints are still called.
+        """
+
+        self.server.error_rate = 1
+        for _ in range(4):
+            with self.assertRaises(HTTPException):
+                self.run_coro(self.api.search_images(limit=1))
+
+        hits = sum(self.server.hits.values())
+        with self.assertRaises(CircuitOpen):
+            self.run_coro(self.api.search_images(limit=1))
+        self.assertEqual(sum(self.server.hits.values()), hits)
+
+        self.server.error_rate = 0
+        self.run_coro(self.api.get_categories())
+        stats = self.api.stats()["breaker"]
+        self.assertEqual(stats["circuits"]["GET /v1/images/search"]["state"],
+                         "open")
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_stale_reads(self):
+        """
+        Verifies that cacheable reads return their last good response,
+        marked stale, when the api fails or the circuit is open.
+        """
+
+        image_id = next(iter(self.server.images))
+        image = self.run_coro(self.api.get_image(image_id))
+        breeds = self.run_coro(self.api.get_breeds(limit=3))
+        self.assertFalse(image.stale)
+
+        self.server.error_rate = 1
+        for _ in range(5):
+            stale = self.run_coro(self.api.get_image(image_id))
+            self.assertTrue(stale.stale)
+            self.assertEqual(stale.id, image.id)
+        self.assertEqual(self.breaker.state("GET /v1/images/{id}"), "open")
+
+        stale = self.run_coro(self.api.get_breeds(limit=3))
+        self.assertEqual([breed.name for breed in stale],
+                         [breed.name for breed in breeds])
+        self.assertTrue(all(breed.stale for breed in stale))
+
+        with self.assertRaises(HTTPException):
+            self.run_coro(self.api.get_categories())
+        self.assertEqual(self.breaker.served_stale, 6)
+
+        # Models built after a stale read are not marked
+        self.server.error_rate = 0
+        self.assertFalse(self.run_coro(self.api.get_categories())[0].stale)
+
+    def test_lazy_stale_reads(self):
+        """
+        Verifies that lazy models are marked stale too.
+        """
+
+        self.api.lazy = True
+        image_id = next(iter(self.server.images))
+        self.run_coro(self.api.get_image(image_id))
+        self.server.error_rate = 1
+        stale = self.run_coro(self.api.get_image(image_id))
+        self.assertTrue(stale.stale)
+        self.assertEqual(type(stale).__name__, "StaleLazyImage")
+
+    def test_fresh_after_stale(self):
+        """
+        Verifies that a fresh response fetched after a stale one, in the
+        same task, is not marked stale.
+        """
+
+        image_id = next(iter(self.server.images))
+        url = f"{self.server.url}/categories"
+
+        async def run():
+            await self.api.api_get_session(url, endpoint="categories")
+            self.server.error_rate = 1
+            stale = await self.api.api_get_session(url, endpoint="categories")
+            self.server.error_rate = 0
+            return stale, await self.api.get_image(image_id)
+
+        stale, image = self.run_coro(run())
+        self.assertEqual(self.breaker.served_stale, 1)
+        self.assertEqual(len(stale), 7)
+        self.assertFalse(image.stale)
+        self.assertIs(type(image), Image)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi import catapi
+from catapi.breed_index import BreedIndex, edit_distance
+from catapi.models.breed import Breed
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+BREEDS = [
+    Breed(id="mcoo", name="Maine Coon", alt_names="Coon Cat",
+          temperment="Gentle, Loyal, Playful", origin="United States"),
+    Breed(id="siam", name="Siamese", alt_names="Meezer",
+          temperment="Active, Social", origin="Thailand"),
+    Breed(id="sibe", name="Siberian", alt_names="",
+          temperment="Curious, Playful", origin="Russia"),
+    Breed(id="drex", name="Devon Rex", alt_names="Pixie cat",
+          temperment="Playful, Active", origin="United Kingdom"),
+]
+
+
+def names(breeds):
+    return [breed.name for breed in breeds]
+
+
+class TestBreedIndex(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.index = BreedIndex(BREEDS)
+
+    def test_edit_distance(self):
+        """
+        Verifies that transpositions count as a single edit.
+        """
+
+        self.assertEqual(edit_distance("siamese", "siaemse"), 1)
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+
+    def test_prefix(self):
+        """
+        Verifies that names and the words in them are found by prefix.
+        """
+
+        self.assertEqual(names(self.index.prefix("si")),
+                         ["Siamese", "Siberian"])
+        self.assertEqual(names(self.index.prefix("coo")), ["Maine Coon"])
+        self.assertEqual(names(self.index.prefix("pix")), ["Devon Rex"])
+
+    def test_ranking(self):
+        """
+        Verifies that exact and prefix matches outrank the rest.
+        """
+
+        self.assertEqual(names(self.index.search("siamese")), ["Siamese"])
+        self.assertEqual(names(self.index.search("main co"))[0],
+                         "Maine Coon")
+
+    def test_nameless_breed(self):
+        """
+        Verifies that a breed without a name can be indexed, and ranks ahead
+        of named breeds with the same score.
+        """
+
+        index = BreedIndex(BREEDS + [
+            Breed(id="anon", temperment="Playful", origin="Russia")])
+        found = index.search("playful")
+        self.assertEqual([breed.id for breed in found],
+                         ["anon", "drex", "mcoo", "sibe"])
+        self.assertEqual(names(index.prefix("sib")), ["Siberian"])
+
+    def test_typos(self):
+        """
+        Verifies that misspelled names are still found.
+        """
+
+        self.assertEqual(names(self.index.search("siamse")), ["Siamese"])
+        self.assertEqual(names(self.index.search("sibirean")), ["Siberian"])
+        self.assertEqual(names(self.index.search("meine kuon")),
+                         ["Maine Coon"])
+        self.assertEqual(self.index.search("xyzzy"), [])
+
+    def test_tokens(self):
+        """
+        Verifies that temperament and origin are searched by token.
+        """
+
+        self.assertEqual(names(self.index.search("playful")),
+                         ["Devon Rex", "Maine Coon", "Siberian"])
+        self.assertEqual(names(self.index.search("thailand")), ["Siamese"])
+        self.assertEqual(names(self.index.search("united kingdom")),
+                         ["Devon Rex", "Maine Coon"])
+
+    def test_update(self):
+        """
+        Verifies that only changed breeds are re-indexed.
+        """
+
+        renamed = Breed(id="siam", name="Thai", origin="Thailand")
+        changed = self.index.update([BREEDS[0], renamed, BREEDS[3]])
+        self.assertEqual(changed, 2)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search("siamese"), [])
+        self.assertEqual(names(self.index.search("thai")), ["Thai"])
+        self.assertNotIn("sibe", self.index)
+        self.assertEqual(self.index.prefix("sib"), [])
+
+
+class TestBreedIndexFromApi(async_capable.AsyncTestCase):
+    def test_from_api(self):
+        """
+        Verifies that the index holds the whole catalog.
+        """
+
+        async def build():
+            async with MockCatApiServer(image_count=0) as server:
+                async with catapi.CatApi(api_key="key",
+                                         base_url=server.url) as api:
+                    index = await BreedIndex.from_api(api)
+                    changed = await index.refresh(api)
+                    return index, changed
+
+        index, changed = self.run_coro(build())
+        self.assertEqual(len(index), 67)
+        self.assertEqual(changed, 0)
+        self.assertEqual(names(index.search("persain"))[0], "Persian")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import unittest
+
+from catapi.models.breed import Breed
+from tests import async_capable
+
+try:
+    from catapi.breed_table import BreedTable
+except ImportError:
+    BreedTable = None
+
+
+BREEDS = [
+    Breed(id="a", name="Alpha", energy_level=5, affection_level=2,
+          hypoallergenic=0, grooming=1),
+    Breed(id="b", name="Beta", energy_level=1, affection_level=5,
+          hypoallergenic=1, grooming=3),
+    Breed(id="c", name="Gamma", energy_level=2, affection_level=5,
+          hypoallergenic=1, grooming=1),
+    Breed(id="d", name="Delta", energy_level=4, affection_level=3,
+          hypoallergenic=0, grooming=5),
+]
+
+
+@unittest.skipIf(BreedTable is None, "numpy is not installed")
+class TestBreedTable(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.table = BreedTable(BREEDS)
+
+    def test_initialization(self):
+        """
+        Verifies that traits are packed one row per breed.
+        """
+
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.traits.shape, (4, 20))
+        self.assertEqual(list(self.table.column("energy_level")),
+                         [5, 1, 2, 4])
+        # Missing traits are stored as 0
+        self.assertEqual(list(self.table.column("adaptability")),
+                         [0, 0, 0, 0])
+
+    def test_filter(self):
+        """
+        Verifies exact, range and set conditions.
+        """
+
+        calm = self.table.filter(energy_level=(1, 2), hypoallergenic=1)
+        self.assertEqual(list(calm.ids), ["b", "c"])
+
+        groomed = self.table.filter(grooming=[3, 5])
+        self.assertEqual(list(groomed.names), ["Beta", "Delta"])
+
+    def test_rank(self):
+        """
+        Verifies that weighted scores order the breeds.
+        """
+
+        ranked = self.table.rank({"affection_level": 2, "grooming": -1}, k=2)
+        self.assertEqual(list(ranked.ids), ["c", "b"])
+
+    def test_similar(self):
+        """
+        Verifies that the nearest breeds come first and exclude the breed.
+        """
+
+        similar = self.table.similar("b", k=2)
+        self.assertEqual(list(similar.ids), ["c", "d"])
+
+        similar = self.table.similar("b", k=10, weights={"energy_level": 1})
+        self.assertEqual(list(similar.ids), ["c", "d", "a"])
+
+    def test_to_breeds(self):
+        """
+        Verifies that rows convert back to Breed objects.
+        """
+
+        subset = self.table.filter(hypoallergenic=0)
+        self.assertIs(subset[0], BREEDS[0])
+        self.assertEqual([breed.name for breed in subset.to_breeds()],
+                         ["Alpha", "Delta"])
+
+    def test_unknown_breed(self):
+        """
+        Verifies that similar() raises for an unknown id.
+        """
+
+        with self.assertRaises(KeyError):
+            self.table.similar("missing")
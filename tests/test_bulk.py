@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+
+from catapi import catapi
+from catapi.bulk import run_bulk
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestRunBulk(async_capable.AsyncTestCase):
+    def test_partial_failure(self):
+        """
+        Verifies that failures are recorded without stopping other items.
+        """
+
+        async def invert(item):
+            return 1 / item
+
+        results = self.run_coro(run_bulk(invert, [4, 0, 2]))
+        self.assertEqual(list(results), [4, 0, 2])
+        self.assertEqual(results.succeeded, {4: 0.25, 2: 0.5})
+        self.assertIsInstance(results.failed[0], ZeroDivisionError)
+        self.assertFalse(results.ok)
+
+    def test_concurrency_cap(self):
+        """
+        Verifies that no more than concurrency calls run at once.
+        """
+
+        running = []
+        peak = []
+
+        async def work(item):
+            running.append(item)
+            peak.append(len(running))
+            await asyncio.sleep(0.001)
+            running.remove(item)
+
+        results = self.run_coro(run_bulk(work, range(50), concurrency=4))
+        self.assertTrue(results.ok)
+        self.assertEqual(max(peak), 4)
+
+
+class TestBulkApi(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(image_count=20)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="key", base_url=self.server.url)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_get_images(self):
+        """
+        Verifies that many images are fetched by id.
+        """
+
+        ids = list(self.server.images)[:10]
+        images = self.run_coro(self.api.get_images(ids, concurrency=3))
+        self.assertEqual([image.id for image in images.values()], ids)
+
+    def test_favorites(self):
+        """
+        Verifies that many favorites are created and deleted.
+        """
+
+        pairs = [(image_id, "bulk") for image_id in list(self.server.images)]
+        created = self.run_coro(self.api.favorite_many(pairs))
+        self.assertTrue(created.ok)
+        self.assertEqual(len(self.server.favourites), 20)
+
+        deleted = self.run_coro(self.api.delete_favorites(created.values()))
+        self.assertEqual(len(deleted), 20)
+        self.assertEqual(self.server.favourites, {})
+
+    def test_votes(self):
+        """
+        Verifies that many votes are cast and deleted.
+        """
+
+        votes = [(image_id, 1, "bulk") for image_id in self.server.images]
+        cast = self.run_coro(self.api.vote_many(votes, concurrency=5))
+        self.assertEqual(len(self.server.votes), 20)
+
+        ids = [vote.id for vote in cast.values()]
+        self.run_coro(self.api.delete_votes(ids))
+        self.assertEqual(self.server.votes, {})
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import time
+
+from catapi import catapi
+from catapi.cache import ResponseCache
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestResponseCache(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.cache = ResponseCache(max_entries=2)
+
+    def test_key(self):
+        """
+        Verifies that equivalent parameters produce the same key.
+        """
+
+        first = self.cache.key("u", {"page": 0, "limit": 5, "q": ""})
+        second = self.cache.key("u", {"limit": "5", "page": "0"})
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.key("u", {"q": None}), "u")
+
+    def test_expiry(self):
+        """
+        Verifies that entries are dropped after their ttl.
+        """
+
+        self.cache.set("a", [1], 0.01)
+        self.assertEqual(self.cache.get("a"), [1])
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """
+        Verifies that the least recently used entry is evicted first.
+        """
+
+        self.cache.set("a", 1, 60)
+        self.cache.set("b", 2, 60)
+        self.cache.get("a")
+        self.cache.set("c", 3, 60)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_max_bytes(self):
+        """
+        Verifies that the cache stays under max_bytes.
+        """
+
+        cache = ResponseCache(max_bytes=20)
+        cache.set("a", "x" * 10, 60)
+        cache.set("b", "y" * 10, 60)
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.stats()["bytes"], 20)
+
+    def test_invalidate(self):
+        """
+        Verifies that invalidating an url also removes the urls beneath it.
+        """
+
+        self.cache.max_entries = 10
+        self.cache.set("images/ab", 1, 60)
+        self.cache.set("images/ab/analysis", 2, 60)
+        self.cache.set("images/abc", 3, 60)
+        self.assertEqual(self.cache.invalidate("images/ab"), 2)
+        self.assertEqual(self.cache.get("images/abc"), 3)
+
+
+class TestCachedApi(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(image_count=5)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="key", base_url=self.server.url,
+                                 cache=True)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_reads_are_cached(self):
+        """
+        Verifies that repeated reads only reach the server once.
+        """
+
+        for _ in range(3):
+            breeds = self.run_coro(self.api.get_breeds(limit=10))
+            self.run_coro(self.api.get_categories())
+
+        self.assertEqual(breeds[0].weight_metric,
+                         self.server.breeds[0]["weight"]["metric"])
+        self.assertEqual(self.server.hits["breeds"], 1)
+        self.assertEqual(self.server.hits["categories"], 1)
+        self.assertEqual(self.api.cache.hits, 4)
+
+    def test_writes_are_not_cached(self):
+        """
+        Verifies that listings of your own data are always fetched.
+        """
+
+        self.run_coro(self.api.get_votes())
+        self.run_coro(self.api.get_votes())
+        self.assertEqual(self.server.hits["votes"], 2)
+
+    def test_delete_image_evicts(self):
+        """
+        Verifies that deleting an image evicts it from the cache.
+        """
+
+        self.server.uploads["up"] = dict(self.server.images[
+            next(iter(self.server.images))], id="up")
+        self.run_coro(self.api.get_image("up"))
+        self.run_coro(self.api.get_analysis("up"))
+        self.run_coro(self.api.delete_image("up"))
+        self.assertEqual(len(self.api.cache), 0)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import os
+import tempfile
+
+from catapi import catapi
+from catapi.catalog import CatalogCache
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestCatalogCache(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "catalog.sqlite")
+        self.server = MockCatApiServer(image_count=0)
+        self.run_coro(self.server.start())
+
+    def tearDown(self):
+        self.run_coro(self.server.close())
+        self.directory.cleanup()
+
+    def get_breeds(self, **kwargs):
+        """
+        Fetches every breed with a fresh client, as a restarted worker would.
+        """
+
+        async def get_breeds():
+            catalog = CatalogCache(self.path, **kwargs)
+            async with catapi.CatApi(api_key="key", base_url=self.server.url,
+                                     catalog=catalog) as api:
+                breeds = await api.get_breeds(limit=100)
+            catalog.close()
+            return breeds
+
+        return self.run_coro(get_breeds())
+
+    def test_store_and_load(self):
+        """
+        Verifies that responses are stored with their validators.
+        """
+
+        catalog = CatalogCache(self.path)
+        catalog.store("k", b"[]", '"tag"')
+        entry = catalog.load("k")
+        self.assertEqual(entry.body, b"[]")
+        self.assertEqual(entry.etag, '"tag"')
+        self.assertIsNone(catalog.load("missing"))
+        catalog.close()
+
+    def test_survives_restart(self):
+        """
+        Verifies that a restarted client revalidates instead of downloading
+        the catalog again.
+        """
+
+        first = self.get_breeds()
+        second = self.get_breeds()
+        self.assertEqual([breed.id for breed in first],
+                         [breed.id for breed in second])
+        self.assertEqual(second[0].weight_metric, first[0].weight_metric)
+        self.assertEqual(self.server.hits["breeds"], 2)
+
+        entry = CatalogCache(self.path).load(
+            f"{self.server.url}/breeds?limit=100&page=0")
+        self.assertTrue(entry.etag)
+
+    def test_changed_catalog_is_downloaded(self):
+        """
+        Verifies that a changed catalog replaces the stored one.
+        """
+
+        self.get_breeds()
+        self.server.breeds[0]["name"] = "Renamed"
+        self.assertEqual(self.get_breeds()[0].name, "Renamed")
+
+    def test_max_age(self):
+        """
+        Verifies that fresh responses are used without any request.
+        """
+
+        self.get_breeds(max_age=60)
+        self.get_breeds(max_age=60)
+        self.assertEqual(self.server.hits["breeds"], 1)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+
+from catapi import catapi
+from catapi.coalesce import SingleFlight
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestSingleFlight(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    async def slow(self, value=1):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def test_shared_result(self):
+        """
+        Verifies that concurrent calls with the same key run once.
+        """
+
+        async def many():
+            return await asyncio.gather(*(self.flight.run("k", self.slow)
+                                          for _ in range(10)))
+
+        self.assertEqual(self.run_coro(many()), [1] * 10)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flight.stats(),
+                         {"executed": 1, "coalesced": 9, "in_flight": 0})
+
+    def test_shared_exception(self):
+        """
+        Verifies that every waiter receives the exception.
+        """
+
+        async def many():
+            return await asyncio.gather(
+                *(self.flight.run("k", lambda: self.slow(ValueError()))
+                  for _ in range(3)), return_exceptions=True)
+
+        results = self.run_coro(many())
+        self.assertTrue(all(isinstance(result, ValueError)
+                            for result in results))
+        self.assertEqual(self.calls, 1)
+
+    def test_sequential_calls_are_not_shared(self):
+        """
+        Verifies that a finished call is not reused.
+        """
+
+        self.run_coro(self.flight.run("k", self.slow))
+        self.run_coro(self.flight.run("k", self.slow))
+        self.assertEqual(self.calls, 2)
+
+    def test_cancelled_waiter(self):
+        """
+        Verifies that cancelling the first caller leaves the call running
+        for the others.
+        """
+
+        async def cancel_first():
+            first = asyncio.ensure_future(self.flight.run("k", self.slow))
+            second = asyncio.ensure_future(self.flight.run("k", self.slow))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(self.run_coro(cancel_first()), 1)
+
+
+class TestCoalescedApi(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(image_count=5, latency=0.02)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="key", base_url=self.server.url)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_identical_gets_are_coalesced(self):
+        """
+        Verifies that concurrent lookups of one image make one request.
+        """
+
+        image_id = next(iter(self.server.images))
+
+        async def many():
+            return await asyncio.gather(*(self.api.get_image(image_id)
+                                          for _ in range(50)))
+
+        images = self.run_coro(many())
+        self.assertEqual({image.id for image in images}, {image_id})
+        self.assertEqual(self.server.hits["image"], 1)
+        self.assertEqual(self.api.coalescer.coalesced, 49)
+
+    def test_different_params_are_not_coalesced(self):
+        """
+        Verifies that requests for different pages are sent separately.
+        """
+
+        async def pages():
+            return await asyncio.gather(self.api.get_breeds(page=0),
+                                        self.api.get_breeds(page=1))
+
+        first, second = self.run_coro(pages())
+        self.assertNotEqual(first[0].id, second[0].id)
+        self.assertEqual(self.server.hits["breeds"], 2)
+
+    def test_random_searches_are_not_coalesced(self):
+        """
+        Verifies that concurrent random searches each make a request, while
+        ordered ones are still shared.
+        """
+
+        async def searches(**kwargs):
+            return await asyncio.gather(self.api.search_images(**kwargs),
+                                        self.api.search_images(**kwargs))
+
+        self.run_coro(searches())
+        self.assertEqual(self.server.hits["images_search"], 2)
+        self.assertEqual(self.api.coalescer.coalesced, 0)
+
+        self.run_coro(searches(order="ASC"))
+        self.assertEqual(self.server.hits["images_search"], 3)
+        self.assertEqual(self.api.coalescer.coalesced, 1)
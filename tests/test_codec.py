@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi import catapi, codec
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestCodec(async_capable.AsyncTestCase):
+    def test_round_trip(self):
+        """
+        Verifies that both codecs agree with each other.
+        """
+
+        data = {"id": "abc", "breeds": [{"name": "Siamese"}], "width": 3}
+        self.assertEqual(codec.loads(codec.stdlib_dumps(data)), data)
+        self.assertEqual(codec.stdlib_loads(codec.dumps(data)), data)
+
+    def test_client_uses_codec(self):
+        """
+        Verifies that a client decodes and encodes with the functions it
+        was given.
+        """
+
+        calls = []
+
+        def loads(data):
+            calls.append("loads")
+            return codec.stdlib_loads(data)
+
+        def dumps(obj):
+            calls.append("dumps")
+            return codec.stdlib_dumps(obj)
+
+        async def use():
+            async with MockCatApiServer(image_count=0) as server:
+                async with catapi.CatApi(api_key="key", base_url=server.url,
+                                         json_loads=loads,
+                                         json_dumps=dumps) as api:
+                    await api.get_categories()
+                    return await api.vote("abc", 1, "test")
+
+        vote = self.run_coro(use())
+        self.assertEqual(vote.image_id, "abc")
+        self.assertEqual(calls, ["loads", "dumps", "loads"])
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import os
+import tempfile
+
+from catapi import catapi
+from catapi.errors import HTTPException
+from catapi.models.image import Image
+from catapi.ratelimit import RetryPolicy
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestDownload(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def download(self, *indexes, partial=None, **kwargs):
+        """Downloads images from a mock server into the temporary directory.
+        indexes point into the server's images. partial maps an index
+        to bytes to leave in its .part file first.
+        """
+
+        calls = []
+
+        def progress(url, received, total):
+            calls.append((url, received, total))
+
+        async def run():
+            async with MockCatApiServer(**kwargs) as server:
+                ids = list(server.images)
+                images = [Image(id=ids[index],
+                                url=server.file_url(ids[index]))
+                          for index in indexes]
+                for index, content in (partial or {}).items():
+                    name = os.path.basename(images[index].url)
+                    with open(os.path.join(self.path, f"{name}.part"),
+                              "wb") as file:
+                        file.write(content(server.file_content(ids[index])))
+
+                policy = RetryPolicy(attempts=10, backoff=0)
+                async with catapi.CatApi(base_url=server.url,
+                                         retry_policy=policy) as api:
+                    if len(images) == 1:
+                        result = await api.download(images[0], self.path,
+                                                    chunk_size=1024,
+                                                    progress=progress)
+                    else:
+                        result = await api.download_many(images, self.path,
+                                                         concurrency=4)
+
+                return server, images, result
+
+        server, images, result = self.run_coro(run())
+        return server, images, result, calls
+
+    def assertDownloaded(self, server, image, path):
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), server.file_content(image.id))
+        self.assertFalse(os.path.exists(f"{path}.part"))
+
+    def test_download(self):
+        """
+        Verifies that a file is streamed to disk in chunks with progress.
+        """
+
+        server, images, path, calls = self.download(0)
+        self.assertEqual(path, os.path.join(self.path,
+                                            os.path.basename(images[0].url)))
+        self.assertDownloaded(server, images[0], path)
+
+        size = len(server.file_content(images[0].id))
+        self.assertEqual(len(calls), -(-size // 1024))
+        self.assertEqual(calls[-1][1:], (size, size))
+
+    def test_resume(self):
+        """
+        Verifies that a partial file is completed with a Range request.
+        """
+
+        server, images, path, calls = self.download(
+            0, partial={0: lambda content: content[:1000]})
+        self.assertDownloaded(server, images[0], path)
+        self.assertEqual(calls[0][1], 2024)
+
+    def test_resume_complete_and_corrupt(self):
+        """
+        Verifies that a complete partial file is kept without downloading
+        it again, and that an oversized one is downloaded from scratch.
+        """
+
+        server, images, path, calls = self.download(
+            0, partial={0: lambda content: content})
+        self.assertDownloaded(server, images[0], path)
+        self.assertEqual(calls, [])
+        os.remove(path)
+
+        server, images, path, calls = self.download(
+            0, partial={0: lambda content: content + b"extra"})
+        self.assertDownloaded(server, images[0], path)
+        self.assertEqual(server.hits["file"], 2)
+
+    def test_download_many(self):
+        """
+        Verifies that truncated transfers are resumed until every file is
+        complete.
+        """
+
+        server, images, result, _ = self.download(*range(12),
+                                                  truncate_rate=0.3)
+        self.assertTrue(result.ok)
+        self.assertGreater(server.hits["file"], 12)
+        for image in images:
+            self.assertDownloaded(server, image, result[image])
+
+    def test_missing_file(self):
+        """
+        Verifies that a missing file raises without being retried.
+        """
+
+        async def run():
+            async with MockCatApiServer() as server:
+                async with catapi.CatApi(base_url=server.url) as api:
+                    url = server.file_url("missing")
+                    with self.assertRaises(HTTPException) as error:
+                        await api.download(url, self.path)
+                    self.assertEqual(error.exception.status, 404)
+                    return server.hits["file"]
+
+        self.assertEqual(self.run_coro(run()), 1)
+        self.assertEqual(os.listdir(self.path), [])
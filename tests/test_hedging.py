@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import time
+
+from catapi import catapi
+from catapi.hedging import Hedger
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestHedger(async_capable.AsyncTestCase):
+    def _calls(self, *delays):
+        """Returns a func whose nth call sleeps delays[n] and returns n, and
+        the list of calls that were cancelled.
+        """
+
+        calls = []
+        cancelled = []
+
+        async def func():
+            number = len(calls)
+            calls.append(number)
+            try:
+                await asyncio.sleep(delays[number])
+            except asyncio.CancelledError:
+                cancelled.append(number)
+                raise
+            return number
+
+        return func, cancelled
+
+    def test_hedge_wins(self):
+        """
+        Verifies that a slow call is hedged, the hedge is used and the slow
+        call is cancelled.
+        """
+
+        hedger = Hedger(delay=0.01, budget=1)
+        func, cancelled = self._calls(1, 0.01)
+        started = time.monotonic()
+        self.assertEqual(self.run_coro(hedger.run("key", func)), 1)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(cancelled, [0])
+        self.assertEqual((hedger.sent, hedger.won), (1, 1))
+
+    def test_fast_call_is_not_hedged(self):
+        """
+        Verifies that a call answering before the delay is not hedged.
+        """
+
+        hedger = Hedger(delay=0.05, budget=1)
+        func, cancelled = self._calls(0, 0)
+        self.assertEqual(self.run_coro(hedger.run("key", func)), 0)
+        self.assertEqual(hedger.sent, 0)
+
+    def test_first_call_wins(self):
+        """
+        Verifies that the first call is used when it answers before its
+        hedge.
+        """
+
+        hedger = Hedger(delay=0.01, budget=1)
+        func, cancelled = self._calls(0.03, 1)
+        self.assertEqual(self.run_coro(hedger.run("key", func)), 0)
+        self.assertEqual((hedger.sent, hedger.won), (1, 0))
+        self.assertEqual(cancelled, [1])
+
+    def test_failures(self):
+        """
+        Verifies that a failed call falls back to its hedge, and that the
+        first error is raised when both fail.
+        """
+
+        hedger = Hedger(delay=0.01, budget=1)
+        errors = [KeyError("first"), None]
+
+        async def func():
+            error = errors.pop(0)
+            await asyncio.sleep(0.02)
+            if error is not None:
+                raise error
+            return "hedge"
+
+        self.assertEqual(self.run_coro(hedger.run("key", func)), "hedge")
+
+        hedger = Hedger(delay=0.01, burst=2, budget=1)
+        errors = [KeyError("first"), ValueError("second")]
+        with self.assertRaises(KeyError):
+            self.run_coro(hedger.run("key", func))
+
+    def test_budget(self):
+        """
+        Verifies that hedges are kept to their share of the calls.
+        """
+
+        hedger = Hedger(delay=0, budget=0.25, burst=1)
+
+        async def func():
+            await asyncio.sleep(0.001)
+
+        async def run():
+            for _ in range(40):
+                await hedger.run("key", func)
+
+        self.run_coro(run())
+        self.assertEqual(hedger.sent, 10)
+        self.assertEqual(hedger.throttled, 30)
+
+    def test_adaptive_delay(self):
+        """
+        Verifies that the delay follows the latency of the endpoint once
+        enough calls were seen.
+        """
+
+        hedger = Hedger(min_samples=5, max_delay=0.5)
+        self.assertEqual(hedger.delay_for("key"), 0.5)
+        for number in range(100):
+            hedger._record("key", (number + 1) / 1000)
+
+        self.assertAlmostEqual(hedger.delay_for("key"), 0.095, delta=0.004)
+        self.assertEqual(hedger.delay_for("other"), 0.5)
+        self.assertEqual(list(hedger.stats()["delays"]), ["key"])
+
+
+class TestHedgedRequests(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(latency=0.005, tail_rate=0.2,
+                                       tail_latency=0.5, seed=2)
+        self.run_coro(self.server.start())
+
+    def tearDown(self):
+        self.run_coro(self.server.close())
+
+    def _slowest(self, **kwargs):
+        api = catapi.CatApi(api_key="hedged", base_url=self.server.url,
+                            **kwargs)
+
+        async def run():
+            slowest = 0
+            for image_id in list(self.server.images)[:30]:
+                started = time.monotonic()
+                await api.get_image(image_id)
+                slowest = max(slowest, time.monotonic() - started)
+            await api.close()
+            return slowest
+
+        return api, self.run_coro(run())
+
+    def test_tail_is_cut(self):
+        """
+        Verifies that hedging keeps slow responses from reaching the caller.
+        """
+
+        api, slowest = self._slowest(hedge=Hedger(delay=0.05, budget=1))
+        self.assertLess(slowest, 0.3)
+
+        hedging = api.stats()["hedging"]
+        self.assertGreater(hedging["sent"], 0)
+        self.assertGreater(hedging["won"], 0)
+        self.assertIn("GET /v1/images/{id}", hedging["delays"])
+
+        # The calls that lost to their hedge were cancelled, not failed
+        stats = api.stats()
+        self.assertEqual(stats["errors"], 0)
+        self.assertGreater(stats["cancelled"], 0)
+        self.assertEqual(stats["requests"] + stats["cancelled"],
+                         30 + hedging["sent"])
+        latency = stats["endpoints"]["GET /v1/images/{id}"]["latency"]
+        self.assertEqual(latency["count"], stats["requests"])
+
+        _, slowest = self._slowest()
+        self.assertGreater(slowest, 0.5)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import unittest
+
+from catapi import catapi
+from catapi.models.image import Image
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+try:
+    from catapi.image_batch import ImageBatch
+except ImportError:
+    ImageBatch = None
+
+
+SIAMESE = {"id": "siam", "name": "Siamese"}
+BENGAL = {"id": "beng", "name": "Bengal"}
+
+IMAGES = [
+    {"id": "a", "url": "https://cdn2.thecatapi.com/images/a.jpg",
+     "width": 1600, "height": 900, "breeds": [SIAMESE],
+     "created_at": "2020-01-01T00:00:00.000Z"},
+    {"id": "b", "url": "https://cdn2.thecatapi.com/images/b.jpg",
+     "width": 500, "height": 500, "breeds": [],
+     "categories": [{"id": 1, "name": "hats"}, {"id": 5, "name": "boxes"}]},
+    {"id": "c", "url": "https://cdn2.thecatapi.com/images/c.png",
+     "width": 300, "height": 600, "breeds": [BENGAL],
+     "categories": [{"id": 5, "name": "boxes"}]},
+    {"id": "d", "url": "https://cdn2.thecatapi.com/images/d.gif",
+     "breeds": [SIAMESE]},
+]
+
+
+@unittest.skipIf(ImageBatch is None, "numpy is not installed")
+class TestImageBatch(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.batch = ImageBatch(IMAGES)
+
+    def test_columns(self):
+        """
+        Verifies the columns and that breeds and categories are interned.
+        """
+
+        self.assertEqual(len(self.batch), 4)
+        self.assertEqual(list(self.batch.widths), [1600, 500, 300, 0])
+        self.assertEqual(list(self.batch.breed_codes), [0, -1, 1, 0])
+        self.assertEqual([breed.id for breed in self.batch.breeds],
+                         ["siam", "beng"])
+        self.assertEqual(list(self.batch.breed_ids()),
+                         ["siam", None, "beng", "siam"])
+        self.assertEqual(list(self.batch.category_offsets), [0, 0, 2, 3, 3])
+        self.assertEqual(len(self.batch.categories), 2)
+        self.assertEqual(str(self.batch.created_at[0]),
+                         "2020-01-01T00:00:00.000")
+
+    def test_rows(self):
+        """
+        Verifies that rows are read back as equivalent images.
+        """
+
+        for data, image in zip(IMAGES, self.batch):
+            self.assertIsInstance(image, Image)
+            self.assertEqual(image.to_json(), Image.from_dict(data).to_json())
+
+        self.assertIs(self.batch[0].breed, self.batch[-1].breed)
+        self.assertRaises(IndexError, self.batch.__getitem__, 4)
+
+    def test_filter(self):
+        """
+        Verifies size, aspect ratio, breed and category conditions.
+        """
+
+        def ids(batch):
+            return list(batch.ids)
+
+        self.assertEqual(ids(self.batch.filter(min_width=500)), ["a", "b"])
+        self.assertEqual(ids(self.batch.filter(aspect=(1.5, None))), ["a"])
+        self.assertEqual(ids(self.batch.filter(aspect=(None, 1))), ["b", "c"])
+        self.assertEqual(ids(self.batch.filter(breed_id="siam")), ["a", "d"])
+        self.assertEqual(ids(self.batch.filter(breed_id=["beng", "x"])),
+                         ["c"])
+        self.assertEqual(ids(self.batch.filter(breed_id=None)), ["b"])
+        self.assertEqual(ids(self.batch.filter(category_id=5)), ["b", "c"])
+        self.assertRaises(TypeError, self.batch.filter, colour="black")
+
+        subset = self.batch.filter(category_id=5)
+        self.assertEqual([category.name for category in subset[0].categories],
+                         ["hats", "boxes"])
+        self.assertEqual(subset[1].categories[0].name, "boxes")
+
+    def test_concat(self):
+        """
+        Verifies that concatenated batches keep their rows and share
+        breeds.
+        """
+
+        combined = ImageBatch.concat([ImageBatch(IMAGES[2:]),
+                                      ImageBatch(IMAGES[:2])])
+        self.assertEqual(list(combined.ids), ["c", "d", "a", "b"])
+        self.assertEqual(list(combined.breed_ids()),
+                         ["beng", "siam", "siam", None])
+        self.assertEqual(len(combined.breeds), 2)
+        self.assertEqual([len(image.categories or ()) for image in combined],
+                         [1, 0, 0, 2])
+        self.assertEqual(len(ImageBatch.concat([])), 0)
+
+    def test_client_batch(self):
+        """
+        Verifies that search_images(batch=True) returns an ImageBatch.
+        """
+
+        async def search():
+            async with MockCatApiServer() as server:
+                async with catapi.CatApi(api_key="key",
+                                         base_url=server.url) as api:
+                    return await api.search_images(limit=50, batch=True)
+
+        batch = self.run_coro(search())
+        self.assertIsInstance(batch, ImageBatch)
+        self.assertEqual(len(batch), 50)
+        self.assertTrue((batch.widths >= 200).all())
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+
+from catapi import catapi
+from catapi.image_pool import RandomImagePool
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestRandomImagePool(async_capable.AsyncTestCase):
+    def use(self, func, **kwargs):
+        """Runs func(pool, server) against a mock server"""
+
+        async def run():
+            async with MockCatApiServer(latency=0.01) as server:
+                async with catapi.CatApi(api_key="key",
+                                         base_url=server.url) as api:
+                    async with RandomImagePool(api, **kwargs) as pool:
+                        return await func(pool, server)
+
+        return self.run_coro(run())
+
+    def test_get(self):
+        """
+        Verifies that only the first image waits for a request, and that
+        concurrent first callers share it.
+        """
+
+        async def get(pool, server):
+            first = await asyncio.gather(*(pool.get() for _ in range(5)))
+            rest = [await pool.get() for _ in range(20)]
+            return first + rest, server.hits["images_search"]
+
+        images, requests = self.use(get, batch_size=50, low_water=10)
+        self.assertEqual(len({image.id for image in images}), 25)
+        self.assertEqual(requests, 1)
+
+    def test_refill(self):
+        """
+        Verifies that crossing low_water refills the buffer in the
+        background.
+        """
+
+        async def drain(pool, server):
+            await pool.fill()
+            self.assertEqual(pool.available(), 30)
+            for _ in range(25):
+                self.assertIsNotNone(pool.get_nowait())
+            self.assertEqual(pool.stats()["refilling"], 1)
+            await asyncio.sleep(0.05)
+            return pool.available(), pool.stats()
+
+        available, stats = self.use(drain, batch_size=30, low_water=10)
+        self.assertEqual(available, 35)
+        self.assertEqual(stats["fetches"], 2)
+        self.assertEqual(stats["served"], 25)
+        self.assertEqual(stats["waited"], 0)
+
+    def test_filters(self):
+        """
+        Verifies that every set of filters has its own buffer.
+        """
+
+        async def get(pool, server):
+            breed = next(image["breeds"][0]["id"]
+                         for image in server.images.values()
+                         if image["breeds"])
+            bengals = [await pool.get(breed_id=breed) for _ in range(3)]
+            gifs = [await pool.get(mime_types=["gif"]) for _ in range(3)]
+            missing = await pool.get(breed_id="none")
+            return breed, bengals, gifs, missing
+
+        breed, bengals, gifs, missing = self.use(get)
+        self.assertTrue(all(image.breed.id == breed for image in bengals))
+        self.assertTrue(all(image.url.endswith(".gif") for image in gifs))
+        self.assertIsNone(missing)
+        self.assertRaises(TypeError, RandomImagePool.key, limit=5)
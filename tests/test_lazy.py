@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi import catapi
+from catapi.models.breed import Breed
+from catapi.models.image import Image
+from catapi.models.lazy import LazyAnalysis, LazyBreed, LazyImage
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+IMAGE = {
+    "id": "abc",
+    "url": "https://cdn2.thecatapi.com/images/abc.jpg",
+    "width": 500,
+    "breeds": [{"id": "siam", "name": "Siamese", "temperament": "Active",
+                "weight": {"imperial": "8 - 15", "metric": "4 - 7"}}],
+    "categories": [{"id": 1, "name": "hats"}],
+}
+
+
+class TestLazy(async_capable.AsyncTestCase):
+    def test_attributes_built_on_access(self):
+        """
+        Verifies that a lazy image only fills a slot once it is read, and
+        matches the eager model.
+        """
+
+        image = LazyImage(IMAGE)
+        self.assertIsInstance(image, Image)
+        self.assertRaises(AttributeError, object.__getattribute__, image,
+                          "breed")
+
+        eager = Image(**IMAGE)
+        self.assertEqual(image.url, eager.url)
+        self.assertEqual(image.width, eager.width)
+        self.assertIsNone(image.height)
+        self.assertIsInstance(image.breed, LazyBreed)
+        self.assertIs(image.breed, image.breed)
+        self.assertEqual(image.breed.weight_metric, "4 - 7")
+        self.assertEqual(image.breed.temperment, "Active")
+        self.assertEqual(image.categories[0].name, "hats")
+        self.assertRaises(AttributeError, getattr, image, "missing")
+
+    def test_to_dict(self):
+        """
+        Verifies that to_dict returns the same fields as the eager model.
+        """
+
+        breed = LazyBreed(IMAGE["breeds"][0])
+        eager = Breed.from_dict(IMAGE["breeds"][0])
+        self.assertEqual(self.run_coro(breed.to_dict()),
+                         self.run_coro(eager.to_dict()))
+
+    def test_client_returns_lazy_models(self):
+        """
+        Verifies that CatApi(lazy=True) returns lazy models.
+        """
+
+        async def use():
+            async with MockCatApiServer() as server:
+                async with catapi.CatApi(api_key="key", base_url=server.url,
+                                         lazy=True) as api:
+                    return (await api.search_images(limit=5),
+                            await api.get_breeds())
+
+        images, breeds = self.run_coro(use())
+        self.assertEqual(len(images), 5)
+        self.assertTrue(all(isinstance(image, LazyImage) for image in images))
+        self.assertTrue(images[0].url)
+        self.assertIsInstance(breeds[0], LazyBreed)
+        self.assertTrue(breeds[0].name)
+
+    def test_schema(self):
+        """
+        Verifies that lazy models follow the schema of their model, for
+        aliases, defaults and nested models.
+        """
+
+        image = LazyImage({"id": "abc", "breed": {"temperment": "Calm"}})
+        self.assertEqual(image.breed.temperment, "Calm")
+        self.assertIsInstance(image.breed, LazyBreed)
+        self.assertIsNone(image.categories)
+
+        analysis = LazyAnalysis({})
+        self.assertEqual(analysis.labels, [])
+        self.assertIsNot(analysis.labels, LazyAnalysis({}).labels)
+        self.assertEqual(analysis.vendor, "")
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import random
+
+from catapi import catapi
+from catapi.errors import HTTPException
+from catapi.metrics import LatencyHistogram, Metrics, endpoint
+from catapi.ratelimit import RetryPolicy
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestLatencyHistogram(async_capable.AsyncTestCase):
+    def test_percentiles(self):
+        """
+        Verifies that percentiles are within the precision of the buckets.
+        """
+
+        rng = random.Random(0)
+        values = [rng.lognormvariate(-4, 1.5) for _ in range(10000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for percent in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * percent / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent) / exact, 1,
+                                   delta=0.04)
+
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, values[0])
+        self.assertEqual(histogram.max, values[-1])
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values))
+
+    def test_small_values_are_exact(self):
+        """
+        Verifies that durations under 32 microseconds keep every digit.
+        """
+
+        histogram = LatencyHistogram()
+        for micros in range(1, 32):
+            histogram.record(micros / 1e6)
+        self.assertAlmostEqual(histogram.percentile(50), 16e-6)
+
+    def test_empty(self):
+        """
+        Verifies that an empty histogram has no percentiles.
+        """
+
+        summary = LatencyHistogram().summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["p99"])
+
+
+class TestEndpoint(async_capable.AsyncTestCase):
+    def test_ids_are_replaced(self):
+        """
+        Verifies that ids in paths become {id} and routes are kept.
+        """
+
+        self.assertEqual(endpoint("GET", "/v1/images/search"),
+                         "GET /v1/images/search")
+        self.assertEqual(endpoint("GET", "/v1/images/abc/analysis"),
+                         "GET /v1/images/{id}/analysis")
+        self.assertEqual(endpoint("DELETE", "/v1/favourites/12"),
+                         "DELETE /v1/favourites/{id}")
+        self.assertEqual(endpoint("GET", "/v1/images/"), "GET /v1/images/")
+
+
+class TestRequestMetrics(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(latency=0.01)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="metrics", base_url=self.server.url,
+                                 retry_policy=RetryPolicy(attempts=0))
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_endpoints(self):
+        """
+        Verifies that requests are counted and timed per endpoint, with the
+        bytes they moved.
+        """
+
+        images = self.run_coro(self.api.search_images(limit=5))
+        for image in images:
+            self.run_coro(self.api.get_image(image.id))
+
+        stats = self.api.stats()
+        self.assertEqual(stats["requests"], 6)
+        search = stats["endpoints"]["GET /v1/images/search"]
+        image = stats["endpoints"]["GET /v1/images/{id}"]
+        self.assertEqual(search["requests"], 1)
+        self.assertEqual(image["requests"], 5)
+        self.assertGreater(search["bytes_received"], 0)
+        self.assertGreaterEqual(image["latency"]["p50"], 0.01)
+        self.assertEqual(stats["models"]["Image"]["count"], 6)
+        for phase in ("queue", "first_byte", "body", "decode", "connect"):
+            self.assertIn(phase, stats["phases"])
+        # The random search is never coalesced
+        self.assertEqual(stats["coalescer"]["executed"], 5)
+
+    def test_events(self):
+        """
+        Verifies that listeners see every step of a request in order.
+        """
+
+        seen = []
+        self.api.metrics.add_listener(
+            lambda event, trace: seen.append((event, trace)))
+        self.run_coro(self.api.vote("image", 1, "me"))
+
+        events = [event for event, trace in seen]
+        self.assertEqual(events[0], "queued")
+        self.assertEqual(events[-1], "model")
+        for event in ("request_start", "headers", "body", "decoded", "end"):
+            self.assertIn(event, events)
+        self.assertLess(events.index("request_start"),
+                        events.index("headers"))
+
+        trace = seen[-2][1]
+        self.assertEqual(trace.endpoint, "POST /v1/votes")
+        self.assertEqual(trace.status, 201)
+        self.assertGreater(trace.bytes_sent, 0)
+        self.assertLessEqual(trace.durations()["first_byte"],
+                             trace.durations()["total"])
+
+    def test_errors(self):
+        """
+        Verifies that failed requests are counted as errors.
+        """
+
+        with self.assertRaises(HTTPException):
+            self.run_coro(self.api.get_vote("missing"))
+
+        stats = self.api.stats()
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["endpoints"]["GET /v1/votes/{id}"]["errors"],
+                         1)
+
+    def test_shared_and_disabled(self):
+        """
+        Verifies that clients can share metrics or keep none.
+        """
+
+        metrics = Metrics()
+        first = catapi.CatApi(api_key="a", base_url=self.server.url,
+                              metrics=metrics)
+        second = catapi.CatApi(api_key="b", base_url=self.server.url,
+                               metrics=metrics)
+        silent = catapi.CatApi(api_key="c", base_url=self.server.url,
+                               metrics=False)
+        for api in (first, second, silent):
+            self.run_coro(api.get_categories())
+            self.run_coro(api.close())
+
+        self.assertEqual(metrics.stats()["requests"], 2)
+        self.assertNotIn("endpoints", silent.stats())
+
+        metrics.reset()
+        self.assertEqual(metrics.stats()["requests"], 0)
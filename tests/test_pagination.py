@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+
+from catapi import catapi
+from catapi.pagination import paginate
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+async def collect(iterator, stop=None):
+    items = []
+    async for item in iterator:
+        items.append(item)
+        if stop and len(items) == stop:
+            break
+
+    return items
+
+
+class TestPaginate(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.requested = []
+        self.items = list(range(25))
+
+    async def fetch_page(self, page):
+        self.requested.append(page)
+        await asyncio.sleep(0)
+        return self.items[page * 10:(page + 1) * 10]
+
+    def test_stops_at_short_page(self):
+        """
+        Verifies that every item is yielded once and iteration stops at the
+        short page.
+        """
+
+        items = self.run_coro(collect(paginate(self.fetch_page, 0, 10)))
+        self.assertEqual(items, self.items)
+
+    def test_stops_at_empty_page(self):
+        """
+        Verifies that a final full page is followed by an empty one.
+        """
+
+        self.items = list(range(30))
+        items = self.run_coro(collect(paginate(self.fetch_page, 0, 10, 0)))
+        self.assertEqual(items, self.items)
+        self.assertEqual(self.requested, [0, 1, 2, 3])
+
+    def test_prefetch_is_bounded(self):
+        """
+        Verifies that no more than prefetch pages are requested ahead of the
+        page being consumed.
+        """
+
+        self.items = list(range(1000))
+        items = self.run_coro(collect(paginate(self.fetch_page, 0, 10, 2),
+                                      stop=5))
+        self.assertEqual(items, list(range(5)))
+        self.assertEqual(self.requested, [0, 1, 2])
+
+    def test_errors_propagate(self):
+        """
+        Verifies that a failing page is raised to the consumer.
+        """
+
+        async def fetch_page(page):
+            raise ValueError(page)
+
+        with self.assertRaises(ValueError):
+            self.run_coro(collect(paginate(fetch_page, 0, 10)))
+
+
+class TestIterators(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(image_count=120)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="key", base_url=self.server.url)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_iter_breeds(self):
+        """
+        Verifies that all breeds are returned across pages.
+        """
+
+        breeds = self.run_coro(collect(self.api.iter_breeds(limit=10)))
+        self.assertEqual([breed.id for breed in breeds],
+                         [breed["id"] for breed in self.server.breeds])
+
+    def test_iter_images(self):
+        """
+        Verifies that image search pages do not overlap.
+        """
+
+        images = self.run_coro(collect(self.api.iter_images(limit=50,
+                                                            prefetch=2)))
+        self.assertEqual(len({image.id for image in images}), 120)
+
+    def test_iter_votes(self):
+        """
+        Verifies that votes are returned across pages.
+        """
+
+        for value in range(12):
+            self.run_coro(self.api.vote("abc", value % 2, "test"))
+
+        votes = self.run_coro(collect(self.api.iter_votes(limit=5)))
+        self.assertEqual(len(votes), 12)
+
+    def test_iter_favorites(self):
+        """
+        Verifies that favorites are returned across pages.
+        """
+
+        for _ in range(7):
+            self.run_coro(self.api.favorite("abc", "test"))
+
+        favorites = self.run_coro(collect(self.api.iter_favourites(limit=3)))
+        self.assertEqual(len(favorites), 7)
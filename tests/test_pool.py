@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+from catapi.errors import HTTPException
+from catapi.pool import CatApiPool
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestCatApiPool(async_capable.AsyncTestCase):
+    def setUp(self):
+        # Buckets are shared by key for the whole process, so every test
+        # gets keys of its own
+        name = self.id().rsplit(".", 1)[-1]
+        self.keys = [f"{name}-{number}" for number in range(3)]
+        self.server = MockCatApiServer(api_key=self.keys, quota=20)
+        self.run_coro(self.server.start())
+        self.pool = CatApiPool(self.keys, base_url=self.server.url)
+
+    def tearDown(self):
+        self.run_coro(self.pool.close())
+        self.run_coro(self.server.close())
+
+    def test_spreads_calls(self):
+        """
+        Verifies that calls are spread over every key and that the quota of
+        each key is tracked from its own responses.
+        """
+
+        for _ in range(9):
+            self.run_coro(self.pool.get_categories())
+
+        stats = self.pool.stats()
+        self.assertEqual([stats[key]["calls"] for key in self.keys],
+                         [3, 3, 3])
+        for key in self.keys:
+            self.assertEqual(stats[key]["limit"], 20)
+            self.assertEqual(stats[key]["remaining"], 17)
+            self.assertEqual(stats[key]["in_flight"], 0)
+
+    def test_routes_by_budget(self):
+        """
+        Verifies that calls go to the key with the most quota left.
+        """
+
+        busy = self.pool.client(self.keys[0])
+        for _ in range(15):
+            self.run_coro(busy.get_categories())
+
+        for _ in range(10):
+            self.run_coro(self.pool.get_categories())
+
+        stats = self.pool.stats()
+        self.assertEqual(stats[self.keys[0]]["calls"], 0)
+        self.assertEqual(stats[self.keys[1]]["remaining"], 15)
+        self.assertEqual(stats[self.keys[2]]["remaining"], 15)
+
+    def test_writes_stick_to_owner(self):
+        """
+        Verifies that favorites, votes and uploads are read and deleted with
+        the key that made them.
+        """
+
+        favorite_ids = [self.run_coro(self.pool.favorite(f"image{number}",
+                                                         "user"))
+                        for number in range(4)]
+        owners = {self.pool.owner("favorite", id) for id in favorite_ids}
+        self.assertEqual(len(owners), 1)
+        owner = owners.pop()
+        self.assertEqual(self.pool.owner("sub_id", "user"), owner)
+
+        favorites = self.run_coro(self.pool.get_favorites(sub_id="user"))
+        self.assertEqual(len(favorites), 4)
+        self.assertEqual(self.run_coro(
+            self.pool.get_favourite(favorite_ids[0])).id, favorite_ids[0])
+
+        image = self.run_coro(self.pool.upload(b"cat", sub_id="other"))
+        vote = self.run_coro(self.pool.vote(image.id, 1, "voter"))
+        self.assertEqual(self.server.owners[image.id],
+                         self.pool.owner("image", image.id))
+        self.assertEqual(self.server.owners[str(vote.id)],
+                         self.pool.owner("vote", vote.id))
+
+        result = self.run_coro(self.pool.delete_favorites(favorite_ids))
+        self.assertTrue(result.ok)
+        self.assertIsNone(self.pool.owner("favorite", favorite_ids[0]))
+        self.run_coro(self.pool.delete_vote(vote.id))
+        self.run_coro(self.pool.delete_image(image.id))
+        self.assertFalse(self.server.uploads)
+
+    def test_wrong_key_is_rejected(self):
+        """
+        Verifies that another key can not see a resource, which is why the
+        pool routes by owner.
+        """
+
+        favorite_id = self.run_coro(self.pool.favorite("image", "user"))
+        owner = self.pool.owner("favorite", favorite_id)
+        other = next(key for key in self.keys if key != owner)
+
+        with self.assertRaises(HTTPException):
+            self.run_coro(self.pool.client(other).get_favorite(favorite_id))
+
+        self.pool.set_owner("favorite", favorite_id, other)
+        with self.assertRaises(HTTPException):
+            self.run_coro(self.pool.get_favorite(favorite_id))
+
+    def test_arguments(self):
+        """
+        Verifies that the pool checks its arguments.
+        """
+
+        with self.assertRaises(TypeError):
+            CatApiPool(self.keys, api_key="key")
+        with self.assertRaises(ValueError):
+            CatApiPool([])
+        with self.assertRaises(KeyError):
+            self.pool.set_owner("vote", 1, "unknown")
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import time
+
+from catapi import catapi
+from catapi.errors import HTTPException, RateLimited, parse_retry_after
+from catapi.ratelimit import RetryPolicy, TokenBucket, get_bucket
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestTokenBucket(async_capable.AsyncTestCase):
+    def test_burst_then_pace(self):
+        """
+        Verifies that a burst is free and later tokens are spaced at rate.
+        """
+
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_unlimited(self):
+        """
+        Verifies that a bucket without a rate never waits.
+        """
+
+        bucket = TokenBucket()
+        self.assertEqual([bucket.reserve() for _ in range(100)], [0] * 100)
+
+    def test_block(self):
+        """
+        Verifies that blocking delays every token.
+        """
+
+        bucket = TokenBucket()
+        bucket.block(5)
+        self.assertGreater(bucket.reserve(), 4.9)
+
+    def test_update_from_headers(self):
+        """
+        Verifies that a spent quota blocks until it resets.
+        """
+
+        bucket = TokenBucket()
+        bucket.update({"X-RateLimit-Remaining": "3",
+                       "X-RateLimit-Reset": "10"})
+        self.assertEqual(bucket.reserve(), 0)
+
+        bucket.update({"X-RateLimit-Remaining": "0",
+                       "X-RateLimit-Reset": str(time.time() + 10)})
+        self.assertGreater(bucket.reserve(), 9)
+
+    def test_budget(self):
+        """
+        Verifies that the budget follows the quota headers.
+        """
+
+        bucket = TokenBucket()
+        self.assertEqual(bucket.budget(), float("inf"))
+
+        bucket.update({"X-RateLimit-Limit": "10",
+                       "X-RateLimit-Remaining": "4",
+                       "X-RateLimit-Reset": "10"})
+        self.assertEqual((bucket.limit, bucket.remaining), (10, 4))
+        self.assertEqual(bucket.budget(), 4)
+
+        # Once the window has passed the whole quota is available again
+        bucket.update({"X-RateLimit-Limit": "10",
+                       "X-RateLimit-Remaining": "4",
+                       "X-RateLimit-Reset": "0"})
+        self.assertEqual(bucket.budget(), 10)
+
+        bucket.update({"X-RateLimit-Remaining": "0",
+                       "X-RateLimit-Reset": "10"})
+        self.assertEqual(bucket.budget(), 0)
+
+    def test_shared_per_key(self):
+        """
+        Verifies that clients with the same key share a bucket.
+        """
+
+        first = catapi.CatApi(api_key="shared", rate_limit=4)
+        second = catapi.CatApi(api_key="shared")
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+        self.assertEqual(second.rate_limiter.rate, 4)
+        self.assertIsNot(first.rate_limiter, get_bucket("other"))
+
+
+class TestRetryPolicy(async_capable.AsyncTestCase):
+    def test_should_retry(self):
+        """
+        Verifies which errors are retried.
+        """
+
+        policy = RetryPolicy(attempts=2)
+        unavailable = HTTPException(503, '{"message": "DOWN"}')
+        self.assertEqual(unavailable.message, "DOWN")
+        self.assertTrue(policy.should_retry(unavailable, 0))
+        self.assertFalse(policy.should_retry(unavailable, 2))
+        self.assertFalse(policy.should_retry(unavailable, 0, False))
+        self.assertTrue(policy.should_retry(RateLimited(429), 0, False))
+        self.assertFalse(policy.should_retry(HTTPException(404), 0))
+
+    def test_delay(self):
+        """
+        Verifies that delays are capped and honour Retry-After.
+        """
+
+        policy = RetryPolicy(backoff=1, max_backoff=4)
+        self.assertTrue(all(policy.delay(10) <= 4 for _ in range(100)))
+        self.assertGreaterEqual(policy.delay(0, retry_after=7), 7)
+
+    def test_parse_retry_after(self):
+        """
+        Verifies both forms of Retry-After are understood.
+        """
+
+        self.assertEqual(parse_retry_after({"Retry-After": "3"}), 3)
+        self.assertEqual(parse_retry_after(
+            {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}), 0)
+        self.assertIsNone(parse_retry_after({}))
+
+
+class TestRetries(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(image_count=5, seed=3)
+        self.run_coro(self.server.start())
+        policy = RetryPolicy(attempts=10, backoff=0.001)
+        self.api = catapi.CatApi(api_key="retries", base_url=self.server.url,
+                                 retry_policy=policy)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_server_errors_are_retried(self):
+        """
+        Verifies that 5xx responses are retried until they succeed.
+        """
+
+        self.server.error_rate = 0.5
+        for _ in range(5):
+            self.assertEqual(len(self.run_coro(self.api.get_categories())), 7)
+        self.assertGreater(self.server.hits["categories"], 5)
+
+    def test_errors_are_raised(self):
+        """
+        Verifies that errors which are not retried are raised.
+        """
+
+        with self.assertRaises(HTTPException) as context:
+            self.run_coro(self.api.get_image("missing"))
+
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(self.server.hits["image"], 1)
+
+    def test_rate_limited_posts_are_retried(self):
+        """
+        Verifies that a post rejected with a 429 is sent again.
+        """
+
+        self.server.rate_limit_rate = 0.5
+        self.server.retry_after = 0
+        vote = self.run_coro(self.api.vote("abc", 1, "test"))
+        self.assertEqual(vote.image_id, "abc")
+        self.assertEqual(len(self.server.votes), 1)
+
+    def test_posted_files_are_not_retried(self):
+        """
+        Verifies that a rejected post carrying a file, which is closed once
+        sent, raises instead of being sent again.
+        """
+
+        self.server.rate_limit_rate = 1.0
+        self.server.retry_after = 0
+        url = f"{self.server.url}/v1/images/upload"
+        with open("tests/cat.jpg", "rb") as file:
+            with self.assertRaises(RateLimited):
+                self.run_coro(self.api.api_post_session(url, {"file": file}))
+        self.assertEqual(sum(self.server.hits.values()), 1)
+
+    def test_quota_is_respected(self):
+        """
+        Verifies that the client waits for the quota to reset instead of
+        failing once it is spent.
+        """
+
+        self.server.quota = 3
+        self.server.quota_window = 0.2
+
+        async def burst():
+            return await asyncio.gather(*(self.api.get_categories(limit=1,
+                                                                  page=page)
+                                          for page in range(7)))
+
+        start = time.monotonic()
+        self.assertEqual(len(self.run_coro(burst())), 7)
+        self.assertGreater(time.monotonic() - start, 0.2)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import time
+
+from catapi import catapi
+from catapi.pool import CatApiPool
+from catapi.scheduler import Scheduler, current_priority, priority
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestScheduler(async_capable.AsyncTestCase):
+    async def _order(self, scheduler, names):
+        """Queues a request for every name behind one holding the only
+        slot, and returns the order they were let through in.
+        """
+
+        order = []
+
+        async def request(name):
+            async with scheduler.slot(name):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async with scheduler.slot("normal"):
+            tasks = [asyncio.ensure_future(request(name)) for name in names]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    def test_interactive_goes_first(self):
+        """
+        Verifies that interactive requests overtake a bulk backlog.
+        """
+
+        scheduler = Scheduler(concurrency=1, reserved=0)
+        names = ["bulk"] * 6 + ["interactive"] * 2
+        order = self.run_coro(self._order(scheduler, names))
+        self.assertEqual(order[:2], ["interactive", "interactive"])
+        self.assertEqual(order[2:], ["bulk"] * 6)
+
+    def test_weighted_shares(self):
+        """
+        Verifies that busy classes share slots in proportion to weight.
+        """
+
+        scheduler = Scheduler(concurrency=1, reserved=0,
+                              weights={"normal": 3, "bulk": 1})
+        order = self.run_coro(self._order(scheduler,
+                                          ["bulk"] * 8 + ["normal"] * 8))
+        self.assertEqual(order[:8].count("normal"), 6)
+        self.assertEqual(order[8:], ["normal"] * 2 + ["bulk"] * 6)
+
+    def test_reserved_slot(self):
+        """
+        Verifies that only the most urgent class may use reserved slots.
+        """
+
+        scheduler = Scheduler(concurrency=2, reserved=1)
+
+        async def run():
+            async with scheduler.slot("bulk"):
+                waiting = asyncio.ensure_future(self._hold(scheduler,
+                                                           "bulk"))
+                await asyncio.sleep(0)
+                self.assertFalse(waiting.done())
+
+                async with scheduler.slot("interactive"):
+                    self.assertEqual(scheduler.stats()["active"], 2)
+            await waiting
+
+        self.run_coro(run())
+        self.assertEqual(scheduler.stats()["active"], 0)
+
+    @staticmethod
+    async def _hold(scheduler, name):
+        async with scheduler.slot(name):
+            pass
+
+    def test_cancelled_waiter(self):
+        """
+        Verifies that a request cancelled while waiting gives up its place
+        without keeping a slot.
+        """
+
+        scheduler = Scheduler(concurrency=1, reserved=0)
+
+        async def run():
+            async with scheduler.slot():
+                waiting = asyncio.ensure_future(self._hold(scheduler,
+                                                           "bulk"))
+                await asyncio.sleep(0)
+                waiting.cancel()
+                await asyncio.gather(waiting, return_exceptions=True)
+            await self._hold(scheduler, "bulk")
+
+        self.run_coro(run())
+        self.assertEqual(scheduler.stats()["active"], 0)
+        self.assertEqual(scheduler.stats()["classes"]["bulk"]["waiting"], 0)
+
+    def test_priority_context(self):
+        """
+        Verifies that priority() blocks nest, and that unknown classes are
+        refused.
+        """
+
+        self.assertIsNone(current_priority())
+        with priority("bulk"):
+            with priority("interactive"):
+                self.assertEqual(current_priority(), "interactive")
+            self.assertEqual(current_priority(), "bulk")
+        self.assertIsNone(current_priority())
+
+        api = catapi.CatApi(api_key="priority")
+        with self.assertRaises(ValueError):
+            api.priority("urgent")
+        with self.assertRaises(ValueError):
+            Scheduler(concurrency=1, reserved=1)
+
+
+class TestScheduledRequests(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.server = MockCatApiServer(latency=0.02)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="scheduled",
+                                 base_url=self.server.url, coalesce=False,
+                                 limit_per_host=4)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_interactive_latency(self):
+        """
+        Verifies that interactive calls are not stuck behind bulk work.
+        """
+
+        async def timed(coroutine):
+            started = time.monotonic()
+            await coroutine
+            return time.monotonic() - started
+
+        async def run():
+            with self.api.priority("bulk"):
+                bulk = [asyncio.ensure_future(self.api.get_categories())
+                        for _ in range(40)]
+            await asyncio.sleep(0.01)
+            with self.api.priority("interactive"):
+                interactive = await asyncio.gather(*(
+                    timed(self.api.search_images()) for _ in range(3)))
+            await asyncio.gather(*bulk)
+            return interactive
+
+        interactive = self.run_coro(run())
+        # 40 bulk requests four at a time take about 0.2 seconds
+        self.assertLess(max(interactive), 0.1)
+
+        classes = self.api.stats()["scheduler"]["classes"]
+        self.assertEqual(classes["bulk"]["wait"]["count"], 40)
+        self.assertEqual(classes["interactive"]["wait"]["count"], 3)
+
+    def test_connection_limits(self):
+        """
+        Verifies that the default scheduler follows every connection limit
+        aiohttp accepts, where 0 means no limit.
+        """
+
+        async def run(**kwargs):
+            api = catapi.CatApi(api_key="scheduled", base_url=self.server.url,
+                                **kwargs)
+            categories = await api.get_categories(limit=1)
+            await api.close()
+            return api.scheduler, categories
+
+        scheduler, categories = self.run_coro(run(limit_per_host=1))
+        self.assertEqual((scheduler.concurrency, scheduler.reserved), (1, 0))
+        self.assertEqual(len(categories), 1)
+
+        scheduler, _ = self.run_coro(run(limit_per_host=0, limit=30))
+        self.assertEqual((scheduler.concurrency, scheduler.reserved), (30, 1))
+
+        scheduler, _ = self.run_coro(run(limit_per_host=0, limit=0))
+        self.assertIsNone(scheduler)
+
+        pool = CatApiPool(["a", "b"], limit_per_host=1)
+        self.assertEqual(pool.clients[0].scheduler.concurrency, 1)
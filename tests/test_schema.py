@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import json
+
+from catapi.models.analysis import Analysis
+from catapi.models.breed import Breed
+from catapi.models.category import Category
+from catapi.models.image import Image
+from catapi.models.schema import Field
+from catapi.models.vote import Vote
+from tests import async_capable
+
+
+BREED = {"id": "siam", "name": "Siamese", "temperament": "Active",
+         "weight": {"imperial": "8 - 15", "metric": "4 - 7"},
+         "energy_level": 5}
+
+IMAGE = {"id": "abc", "url": "https://cdn2.thecatapi.com/images/abc.jpg",
+         "breeds": [BREED], "categories": [{"id": 1, "name": "hats"}]}
+
+
+class TestSchema(async_capable.AsyncTestCase):
+    def test_breed_from_dict(self):
+        """
+        Verifies aliases and flattened weights, and that the input is left
+        untouched.
+        """
+
+        data = json.loads(json.dumps(BREED))
+        breed = Breed.from_dict(data)
+        self.assertEqual(data, BREED)
+        self.assertEqual(breed.temperment, "Active")
+        self.assertEqual(breed.weight_imperial, "8 - 15")
+        self.assertEqual(breed.weight_metric, "4 - 7")
+        self.assertEqual(breed.energy_level, 5)
+        self.assertIsNone(breed.adaptability)
+
+        flat = Breed(id="siam", weight_metric="4 - 7", weight="bad")
+        self.assertEqual(flat.weight_metric, "4 - 7")
+        self.assertIsNone(flat.weight_imperial)
+
+    def test_nested_models(self):
+        """
+        Verifies that an image builds its breed and categories, from either
+        keyword arguments or from_dict.
+        """
+
+        for image in (Image(**IMAGE), Image.from_dict(IMAGE)):
+            self.assertIsInstance(image.breed, Breed)
+            self.assertEqual(image.breed.weight_metric, "4 - 7")
+            self.assertIsInstance(image.categories[0], Category)
+            self.assertIsNone(image.width)
+
+        image = Image(breed=Breed(id="siam"), categories=[])
+        self.assertEqual(image.breed.id, "siam")
+
+    def test_defaults(self):
+        """
+        Verifies literal defaults and that list defaults are not shared.
+        """
+
+        first, second = Analysis(), Analysis()
+        self.assertEqual(first.approved, 0)
+        self.assertEqual(first.labels, [])
+        self.assertIsNot(first.labels, second.labels)
+        self.assertEqual(Vote().image_id, "")
+        self.assertIsNone(Vote(image_id=None).image_id)
+
+    def test_to_dict_and_json(self):
+        """
+        Verifies that to_dict skips missing values and that to_json output
+        builds an equal model.
+        """
+
+        image = Image.from_dict(IMAGE)
+        attributes = self.run_coro(image.to_dict())
+        self.assertIs(attributes["breed"], image.breed)
+        self.assertNotIn("width", attributes)
+
+        encoded = json.loads(image.to_json())
+        self.assertEqual(encoded["breed"]["weight_metric"], "4 - 7")
+        self.assertEqual(encoded["categories"], [{"id": 1, "name": "hats"}])
+
+        again = Image.from_dict(encoded)
+        self.assertEqual(again.to_json(), image.to_json())
+        self.assertEqual(json.loads(image.to_json(dumps=json.dumps)),
+                         encoded)
+
+    def test_subclasses(self):
+        """
+        Verifies that subclasses keep the fields, aliases and schema of the
+        models they extend, and their own __init__.
+        """
+
+        class MyBreed(Breed):
+            pass
+
+        class TaggedBreed(Breed):
+            __slots__ = ("tag",)
+
+            schema = {"tag": Field(default="none")}
+
+        class NamedBreed(Breed):
+            __slots__ = ()
+
+            def __init__(self, name):
+                self.name = name
+
+        breed = MyBreed.from_dict(BREED)
+        self.assertEqual(breed.temperment, "Active")
+        self.assertEqual(breed.weight_metric, "4 - 7")
+
+        tagged = TaggedBreed.from_dict({"name": "x"})
+        self.assertEqual((tagged.name, tagged.tag), ("x", "none"))
+        self.assertEqual(TaggedBreed(**BREED).weight_imperial, "8 - 15")
+        self.assertEqual(tagged.as_dict(), {"name": "x", "tag": "none"})
+
+        self.assertEqual(NamedBreed("Siamese").name, "Siamese")
+        self.assertEqual(NamedBreed.from_dict(BREED).temperment, "Active")
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import io
+import json
+import unittest
+
+from catapi import codec, serialization
+from catapi.models.image import Image
+from catapi.models.lazy import LazyImage
+from catapi.models.vote import Vote
+from tests import async_capable
+
+
+IMAGES = [
+    {"id": str(number), "url": f"https://cdn2.thecatapi.com/{number}.jpg",
+     "width": number, "breeds": [{"id": "siam", "name": "Siamese",
+                                  "weight": {"imperial": "8", "metric": "4"}}],
+     "categories": [{"id": 1, "name": "hats"}] if number % 2 else None}
+    for number in range(1, 2500)
+]
+
+
+class TestSerialization(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.images = [Image.from_dict(image) for image in IMAGES]
+        self.expected = [image.to_json() for image in self.images]
+
+    def test_as_dict(self):
+        """
+        Verifies that as_dict is synchronous and nests models as dicts.
+        """
+
+        data = self.images[0].as_dict()
+        self.assertEqual(data["breed"]["weight_metric"], "4")
+        self.assertEqual(data["categories"], [{"id": 1, "name": "hats"}])
+        self.assertEqual(Image.from_dict(data).as_dict(), data)
+        self.assertEqual(LazyImage(IMAGES[0]).as_dict(), data)
+        self.assertEqual(Vote(value=1).as_dict(),
+                         {"image_id": "", "value": 1, "sub_id": "",
+                          "created_at": "", "id": "", "country_code": ""})
+
+    def test_ndjson(self):
+        """
+        Verifies that models written as ndjson, with either codec, are read
+        back unchanged.
+        """
+
+        for dumps in (None, codec.stdlib_dumps, json.dumps):
+            file = io.BytesIO()
+            count = serialization.write_ndjson(iter(self.images), file, dumps)
+            self.assertEqual(count, len(self.images))
+
+            lines = file.getvalue().splitlines()
+            self.assertEqual(len(lines), len(self.images))
+            self.assertEqual(json.loads(lines[0]), self.images[0].as_dict())
+
+            file.seek(0)
+            images = serialization.read_ndjson(file, Image,
+                                               codec.stdlib_loads)
+            self.assertEqual([image.to_json() for image in images],
+                             self.expected)
+
+        text = io.StringIO('{"id": "a"}\n\n{"id": "b"}\n')
+        self.assertEqual([image.id for image in
+                          serialization.read_ndjson(text, Image)], ["a", "b"])
+
+    @unittest.skipIf(serialization.msgpack is None,
+                     "msgpack is not installed")
+    def test_msgpack(self):
+        """
+        Verifies that models written as msgpack are read back unchanged.
+        """
+
+        file = io.BytesIO()
+        self.assertEqual(serialization.write_msgpack(self.images, file),
+                         len(self.images))
+
+        file.seek(0)
+        images = list(serialization.read_msgpack(file, Image))
+        self.assertEqual([image.to_json() for image in images],
+                         self.expected)
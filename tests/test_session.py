@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import threading
+
+from catapi import catapi
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+class TestSession(async_capable.AsyncTestCase):
+    def setUp(self):
+        self.api = catapi.CatApi(api_key="key", limit_per_host=4)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+
+    def test_initialization(self):
+        """
+        Verifies the session is not created until it is needed.
+        """
+
+        self.assertTrue(self.api.closed)
+
+    def test_start_reuses_session(self):
+        """
+        Verifies that starting twice hands back the same session.
+        """
+
+        session = self.run_coro(self.api.start())
+        self.assertFalse(self.api.closed)
+        self.assertIs(self.run_coro(self.api.start()), session)
+        self.assertEqual(session.connector.limit_per_host, 4)
+
+    def test_context_manager(self):
+        """
+        Verifies that the session is closed when leaving the context manager.
+        """
+
+        async def use():
+            async with self.api as api:
+                self.assertFalse(api.closed)
+            return api.closed
+
+        self.assertTrue(self.run_coro(use()))
+
+    def test_close_drains_requests(self):
+        """
+        Verifies that close() waits for in-flight requests to finish.
+        """
+
+        async def request(finished):
+            async with self.api._session_scope():
+                await asyncio.sleep(0.05)
+                finished.append(True)
+
+        async def close_during_request():
+            finished = []
+            task = asyncio.ensure_future(request(finished))
+            await asyncio.sleep(0.01)
+            await self.api.close()
+            await task
+            return finished
+
+        self.assertEqual(self.run_coro(close_during_request()), [True])
+        self.assertTrue(self.api.closed)
+
+    def test_new_event_loop(self):
+        """
+        Verifies that a client can be used from several asyncio.run() calls,
+        getting a new session on each loop.
+        """
+
+        async def categories():
+            server = MockCatApiServer(api_key="key")
+            await server.start()
+            self.api.base_url = server.url
+            try:
+                return await self.api.get_categories(limit=1)
+            finally:
+                await server.close()
+
+        results = []
+
+        def run():
+            # asyncio.run() would replace the loop of the other tests
+            for _ in range(2):
+                results.append(asyncio.run(categories()))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0].name, results[1][0].name)
+
+        # The session of the last loop is dropped on this one
+        self.run_coro(self.api.start())
+        self.assertFalse(self.api.closed)
+
+    def test_closed_refuses_requests(self):
+        """
+        Verifies that requests made after close() are refused until start()
+        is called again.
+        """
+
+        self.run_coro(self.api.start())
+        self.run_coro(self.api.close())
+        with self.assertRaises(RuntimeError):
+            self.run_coro(self.api.get_categories())
+        self.assertTrue(self.api.closed)
+
+        self.run_coro(self.api.start())
+        self.assertFalse(self.api.closed)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from catapi.models.image import Image
+from catapi.sync import SyncCatApi
+from catapi.testing import MockCatApiServer
+
+
+class TestSyncCatApi(unittest.TestCase):
+    def setUp(self):
+        # The mock server gets a loop of its own, like a remote server
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.server = MockCatApiServer(latency=0.01)
+        asyncio.run_coroutine_threadsafe(self.server.start(),
+                                         self.loop).result()
+        self.api = SyncCatApi(api_key="key", base_url=self.server.url)
+
+    def tearDown(self):
+        self.api.close()
+        asyncio.run_coroutine_threadsafe(self.server.close(),
+                                         self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def test_methods(self):
+        """
+        Verifies that coroutine methods block and return their results, and
+        that other attributes come from the wrapped client.
+        """
+
+        images = self.api.search_images(limit=3)
+        self.assertEqual(len(images), 3)
+        self.assertIsInstance(images[0], Image)
+        self.assertEqual(self.api.get_image(images[0].id).id, images[0].id)
+        self.assertEqual(self.api.base_url, self.server.url)
+        self.assertIn("image_id", SyncCatApi.get_image.__doc__)
+
+    def test_iterators(self):
+        """
+        Verifies that iter_ methods become plain iterators, and that
+        stopping early is fine.
+        """
+
+        breeds = list(self.api.iter_breeds(limit=10))
+        self.assertEqual(len(breeds), len(self.server.breeds))
+
+        for count, _ in enumerate(self.api.iter_images(limit=5, prefetch=0),
+                                  1):
+            if count == 7:
+                break
+        self.assertEqual(self.server.hits["images_search"], 2)
+
+    def test_threads(self):
+        """
+        Verifies that many threads share the background loop and session,
+        with their requests running at the same time.
+        """
+
+        sessions = set()
+
+        def search(page):
+            images = self.api.search_images(limit=5, page=page, order="ASC")
+            sessions.add(id(self.api.api._session))
+            return images
+
+        with ThreadPoolExecutor(16) as pool:
+            pages = list(pool.map(search, range(32)))
+
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(len({image.id for page in pages for image in page}),
+                         160)
+
+    def test_priority(self):
+        """
+        Verifies that a priority set in the calling thread applies on the
+        background loop.
+        """
+
+        with self.api.priority("bulk"):
+            self.api.get_categories()
+        self.api.get_breeds()
+
+        classes = self.api.scheduler.stats()["classes"]
+        self.assertEqual(classes["bulk"]["wait"]["count"], 1)
+        self.assertEqual(classes["normal"]["wait"]["count"], 1)
+
+    def test_close(self):
+        """
+        Verifies that a closed client refuses calls.
+        """
+
+        self.api.close()
+        self.assertTrue(self.api.closed)
+        self.assertRaises(RuntimeError, self.api.get_breeds)
+        self.api.close()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import os
+
+from catapi import catapi
+from catapi.testing import MockCatApiServer
+from tests import async_capable
+
+
+CAT_JPG = os.path.join(os.path.dirname(__file__), "cat.jpg")
+
+
+class TestMockCatApiServer(async_capable.AsyncTestCase):
+    """
+    Runs the CatApi client against the local stand-in server.
+    """
+
+    def setUp(self):
+        self.server = MockCatApiServer(api_key="key", image_count=150)
+        self.run_coro(self.server.start())
+        self.api = catapi.CatApi(api_key="key", base_url=self.server.url)
+
+    def tearDown(self):
+        self.run_coro(self.api.close())
+        self.run_coro(self.server.close())
+
+    def test_seeded_data(self):
+        """
+        Verifies that two servers with the same seed hold the same data.
+        """
+
+        other = MockCatApiServer(image_count=150)
+        self.assertEqual(other.breeds, self.server.breeds)
+        self.assertEqual(list(other.images), list(self.server.images))
+
+    def test_get_breeds(self):
+        """
+        Verifies that breeds are paginated.
+        """
+
+        breeds = self.run_coro(self.api.get_breeds())
+        self.assertEqual(len(breeds), 5)
+        self.assertEqual(breeds[0].name, "Abyssinian")
+        self.assertTrue(breeds[0].weight_metric)
+        self.assertTrue(breeds[0].temperment)
+
+        breeds = self.run_coro(self.api.get_breeds(page=13, limit=5))
+        self.assertEqual(len(breeds), 2)
+
+    def test_search_breeds(self):
+        """
+        Verifies that breeds are searched by name.
+        """
+
+        breeds = self.run_coro(self.api.search_breeds("siamese"))
+        self.assertEqual([breed.name for breed in breeds], ["Siamese"])
+
+    def test_get_categories(self):
+        """
+        Verifies that all seven categories are returned.
+        """
+
+        categories = self.run_coro(self.api.get_categories())
+        self.assertEqual(len(categories), 7)
+
+    def test_images(self):
+        """
+        Verifies image search, lookup and analysis.
+        """
+
+        images = self.run_coro(self.api.search_images(limit=100))
+        self.assertEqual(len(images), 100)
+
+        breed_id = self.server.breeds[0]["id"]
+        images = self.run_coro(self.api.search_images(breed_id=breed_id,
+                                                      limit=100))
+        self.assertTrue(all(image.breed.id == breed_id for image in images))
+
+        image = self.run_coro(self.api.get_image(images[0].id))
+        self.assertEqual(image.url, images[0].url)
+
+        analysis = self.run_coro(self.api.get_analysis(image.id))
+        self.assertEqual(analysis.image_id, image.id)
+        self.assertTrue(analysis.labels)
+
+    def test_uploads(self):
+        """
+        Verifies that uploaded images are listed and deleted.
+        """
+
+        self.run_coro(self.api.upload(CAT_JPG, sub_id="test"))
+        uploads = self.run_coro(self.api.get_uploads(limit=10))
+        self.assertEqual(len(uploads), 1)
+        self.assertEqual(uploads[0].original_filename, "cat.jpg")
+
+        self.run_coro(self.api.delete_image(uploads[0].id))
+        self.assertEqual(self.run_coro(self.api.get_uploads()), [])
+
+    def test_favorites(self):
+        """
+        Verifies favoriting, listing and deleting favorites.
+        """
+
+        favorite_id = self.run_coro(self.api.favorite("abc", "test"))
+        favorite = self.run_coro(self.api.get_favorite(favorite_id))
+        self.assertEqual(favorite.image_id, "abc")
+        self.assertEqual(len(self.run_coro(self.api.get_favorites())), 1)
+        favourites = self.run_coro(self.api.get_favourites())
+        self.assertEqual([item.id for item in favourites], [favorite.id])
+
+        self.run_coro(self.api.delete_favorite(favorite_id))
+        self.assertEqual(self.run_coro(self.api.get_favorites()), [])
+
+    def test_votes(self):
+        """
+        Verifies voting, listing and deleting votes.
+        """
+
+        vote = self.run_coro(self.api.vote("abc", 1, "test"))
+        self.assertEqual(vote.value, 1)
+        self.assertEqual(self.run_coro(self.api.get_vote(vote.id)).id, vote.id)
+        self.assertEqual(len(self.run_coro(self.api.get_votes())), 1)
+
+        self.run_coro(self.api.delete_vote(vote.id))
+        self.assertEqual(self.run_coro(self.api.get_votes()), [])
+
+    def test_fault_injection(self):
+        """
+        Verifies that injected 429s carry a Retry-After header.
+        """
+
+        self.server.rate_limit_rate = 1.0
+        self.server.retry_after = 7
+
+        async def raw_get():
+            session = await self.api.start()
+            async with session.get(f"{self.server.url}/categories",
+                                   headers={"x-api-key": "key"}) as response:
+                return response.status, response.headers["Retry-After"]
+
+        self.assertEqual(self.run_coro(raw_get()), (429, "7"))
+
+    def test_ranges(self):
+        """
+        Verifies that file ranges are honoured, that malformed ones are
+        ignored and that ranges past the end are answered with 416.
+        """
+
+        image_id = next(iter(self.server.images))
+        size = len(self.server.file_content(image_id))
+
+        async def get(range_header):
+            session = await self.api.start()
+            headers = {"Range": range_header}
+            async with session.get(self.server.file_url(image_id),
+                                   headers=headers) as response:
+                return response.status, len(await response.read())
+
+        self.assertEqual(self.run_coro(get("bytes=10-")), (206, size - 10))
+        self.assertEqual(self.run_coro(get("bytes=-5")), (206, 5))
+        self.assertEqual(self.run_coro(get("bytes=abc-")), (200, size))
+        self.assertEqual(self.run_coro(get("bytes=1-2,5-")), (200, size))
+        self.assertEqual(self.run_coro(get(f"bytes={size}-"))[0], 416)
+        self.assertEqual(self.run_coro(get("bytes=-0"))[0], 416)
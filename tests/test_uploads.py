@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copyright (c) 2020 Ephreal under the MIT License.
+To view the license and requirements when distributing this software, please
+view the license at https://github.com/ephreal/catapi/LICENSE.
+"""
+
+import io
+import os
+
+from catapi import catapi
+from catapi.errors import HTTPException
+from catapi.models.image import Image
+from catapi.ratelimit import RetryPolicy
+from catapi.testing import MockCatApiServer
+from catapi.uploads import UploadFile
+from tests import async_capable
+
+
+CAT_JPG = os.path.join(os.path.dirname(__file__), "cat.jpg")
+
+with open(CAT_JPG, "rb") as cat:
+    CAT = cat.read()
+
+
+async def chunks(data, size=4096):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestUploads(async_capable.AsyncTestCase):
+    def use(self, func, **kwargs):
+        """Runs func(api, server) against a mock server"""
+
+        async def run():
+            async with MockCatApiServer(**kwargs) as server:
+                policy = RetryPolicy(attempts=10, backoff=0)
+                async with catapi.CatApi(api_key="key", base_url=server.url,
+                                         retry_policy=policy) as api:
+                    return await func(api, server)
+
+        return self.run_coro(run())
+
+    def test_sources(self):
+        """
+        Verifies that paths, bytes, file objects and async iterators are
+        uploaded whole and return images.
+        """
+
+        async def upload(api, server):
+            images = [
+                await api.upload(CAT_JPG, sub_id="path"),
+                await api.upload(CAT, filename="cat.jpg"),
+                await api.upload(io.BytesIO(CAT)),
+                await api.upload(chunks(CAT), filename="stream.jpg"),
+            ]
+            return images, [server.files[image.id] for image in images], \
+                [server.uploads[image.id] for image in images]
+
+        images, contents, uploads = self.use(upload)
+        self.assertTrue(all(isinstance(image, Image) for image in images))
+        self.assertEqual(images[0].sub_id, "path")
+        self.assertEqual(contents, [CAT] * 4)
+        self.assertEqual([upload["original_filename"] for upload in uploads],
+                         ["cat.jpg", "cat.jpg", "upload", "stream.jpg"])
+
+    def test_upload_file(self):
+        """
+        Verifies filenames, content types and which sources can be retried.
+        """
+
+        self.assertEqual(UploadFile(CAT_JPG).content_type, "image/jpeg")
+        self.assertEqual(UploadFile(b"", "a.png").content_type, "image/png")
+        self.assertEqual(UploadFile(b"").content_type,
+                         "application/octet-stream")
+        self.assertTrue(UploadFile(io.BytesIO()).reusable)
+        self.assertFalse(UploadFile(chunks(b"")).reusable)
+
+    def test_retries(self):
+        """
+        Verifies that failed uploads of file objects are sent again from
+        the start, and that async iterators are not retried.
+        """
+
+        async def upload(api, server):
+            file = io.BytesIO(b"header" + CAT)
+            file.seek(len(b"header"))
+            image = await api.upload(file, filename="cat.jpg")
+            retried = server.hits["upload"]
+
+            server.error_rate = 1.0
+            before = server.hits["upload"]
+            with self.assertRaises(HTTPException):
+                await api.upload(chunks(CAT))
+            return server.files[image.id], retried, \
+                server.hits["upload"] - before
+
+        content, retried, attempts = self.use(upload, error_rate=0.5, seed=1)
+        self.assertEqual(content, CAT)
+        self.assertGreater(retried, 1)
+        self.assertEqual(attempts, 1)
+
+    def test_upload_many(self):
+        """
+        Verifies that every file is uploaded and reported on its own.
+        """
+
+        async def upload(api, server):
+            files = [CAT_JPG, CAT, UploadFile(io.BytesIO(CAT), "b.gif"),
+                     os.path.join(os.path.dirname(CAT_JPG), "missing.jpg")]
+            return files, await api.upload_many(files, concurrency=2)
+
+        files, result = self.use(upload)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.succeeded), 3)
+        self.assertIsInstance(result[files[3]], FileNotFoundError)
+        self.assertEqual(len({image.id for image
+                              in result.succeeded.values()}), 3)